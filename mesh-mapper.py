@@ -2,6 +2,7 @@ import os
 import time
 import json
 import csv
+import io
 import logging
 from logging.handlers import RotatingFileHandler
 import colorsys
@@ -11,24 +12,41 @@ import urllib3
 import serial
 import serial.tools.list_ports
 import signal
+import atexit
 import sys
 import argparse
 import socket
 import subprocess
 import math
+import random
+import re
+import hashlib
+import queue
+import bisect
 import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape as xml_escape
 import sqlite3
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from flask import Flask, request, jsonify, redirect, url_for, render_template, render_template_string, send_file, send_from_directory, Response
-from flask_socketio import SocketIO, emit
-from functools import wraps
+from flask import Flask, request, jsonify, redirect, url_for, render_template, send_file, send_from_directory, Response
+from flask_socketio import SocketIO, emit, join_room, leave_room
+from functools import wraps, lru_cache
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import websocket
 import ssl
+try:
+    import orjson  # Optional: faster parse/serialize for zones and settings files
+except ImportError:
+    orjson = None
+try:
+    import ijson  # Optional: stream very large zones.json files instead of loading them whole
+except ImportError:
+    ijson = None
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # ----------------------
@@ -73,13 +91,19 @@ HEADLESS_MODE = False
 AUTO_START_ENABLED = True
 PORT_MONITOR_INTERVAL = 10  # seconds
 SHUTDOWN_EVENT = threading.Event()
+# API keys supplied through the environment, resolved once at startup.
+# An environment key always takes precedence over the value in a *_config.json file.
+_ENV_AIS = os.environ.get('AISSTREAM_API_KEY') or os.environ.get('AIS_API_KEY') or ''
+_ENV_APRS = os.environ.get('APRS_API_KEY') or ''
+_ENV_WINDY = os.environ.get('WINDY_API_KEY') or ''
+_ENV_WEBCAMS = os.environ.get('WINDY_WEBCAMS_API_KEY') or ''
 LIGHTNING_DETECTION_ENABLED = True  # Lightning detection enabled by default
 LIGHTNING_WS_CONNECTION = None  # Track WebSocket connection for cleanup
 AIS_DETECTION_ENABLED = True  # Maritime AIS detection enabled by default
 AIS_VESSELS = {}  # Store current AIS vessel data: {mmsi: vessel_data}
 AIS_UPDATE_INTERVAL = 60  # Update AIS data every 60 seconds
 AIS_WS_CONNECTION = None  # Track WebSocket connection for AIS data
-AIS_API_KEY = os.environ.get('AIS_API_KEY', '')  # Optional API key for AIS services
+AIS_API_KEY = _ENV_AIS  # Optional API key for AIS services
 AIS_USE_GRID_SEARCH = os.environ.get('AIS_USE_GRID_SEARCH', 'false').lower() == 'true'  # Use grid search for comprehensive coverage
 PORT_DATA_ENABLED = True  # Port data enabled by default
 PORTS = {}  # Store current port data: {port_id: port_data}
@@ -87,7 +111,7 @@ PORT_UPDATE_INTERVAL = 3600  # Update port data every hour (ports don't change f
 APRS_DETECTION_ENABLED = True  # APRS station detection enabled by default
 APRS_STATIONS = {}  # Store current APRS station data: {callsign: station_data}
 APRS_UPDATE_INTERVAL = 120  # Update APRS data every 120 seconds
-APRS_API_KEY = os.environ.get('APRS_API_KEY', '')  # API key from aprs.fi
+APRS_API_KEY = _ENV_APRS  # API key from aprs.fi
 ADSB_DETECTION_ENABLED = True  # ADSB aircraft detection enabled by default
 ADSB_AIRCRAFT = {}  # Store current ADSB aircraft data: {hex: aircraft_data}
 ADSB_UPDATE_INTERVAL = 30  # Update ADSB data every 30 seconds (was 5s, reduced to avoid 429 rate limiting)
@@ -97,12 +121,12 @@ ADSB_RADIUS_KM = 1000  # Search radius in kilometers (maximum coverage - covers
 WEATHER_ENABLED = True  # Weather data enabled by default
 WEATHER_DATA = {}  # Store current weather data: {location_key: weather_data}
 WEATHER_UPDATE_INTERVAL = 300  # Update weather data every 5 minutes
-WEATHER_API_KEY = os.environ.get('WINDY_API_KEY', '')  # API key from Windy.com
+WEATHER_API_KEY = _ENV_WINDY  # API key from Windy.com
 WEATHER_LOCATIONS = []  # List of locations to fetch weather for: [{"lat": float, "lon": float, "name": str}]
 WEBCAMS_ENABLED = True  # Webcams enabled by default
 WEBCAMS_DATA = {}  # Store current webcam data: {webcam_id: webcam_data}
 WEBCAMS_UPDATE_INTERVAL = 600  # Update webcams every 10 minutes
-WEBCAMS_API_KEY = os.environ.get('WINDY_WEBCAMS_API_KEY', '')  # API key from Windy.com for webcams
+WEBCAMS_API_KEY = _ENV_WEBCAMS  # API key from Windy.com for webcams
 METOFFICE_WARNINGS_ENABLED = True  # Met Office weather warnings enabled by default
 METOFFICE_WARNINGS = {}  # Store current weather warnings: {warning_id: warning_data}
 METOFFICE_UPDATE_INTERVAL = 1800  # Update weather warnings every 30 minutes
@@ -422,8 +446,7 @@ APRS_STALE_SECONDS = 3600   # 60 minutes
 MAX_DETECTION_HISTORY = 1000  # Limit detection history size
 MAX_FAA_CACHE_SIZE = 500      # Limit FAA cache size
 KML_GENERATION_INTERVAL = 30  # Only regenerate KML every 30 seconds
-last_kml_generation = 0
-last_cumulative_kml_generation = 0
+KML_SIMPLIFY_EPS = 0.00001    # Douglas-Peucker tolerance for KML paths in degrees (~1 m); 0 disables
 
 def cleanup_old_detections():
     """Mark stale detections as inactive instead of removing them to preserve session persistence.
@@ -431,6 +454,7 @@ def cleanup_old_detections():
     global ADSB_AIRCRAFT, AIS_VESSELS, APRS_STATIONS
     current_time = time.time()
 
+    transmitting = set()
     for mac, detection in tracked_pairs.items():
         last_update = detection.get('last_update', 0)
         # Instead of deleting, mark as inactive for very old detections (30+ minutes)
@@ -438,12 +462,16 @@ def cleanup_old_detections():
             detection['status'] = 'inactive_old'  # Mark as very old but keep in session
         elif current_time - last_update > staleThreshold * 3:  # 3x stale threshold (3 minutes)
             detection['status'] = 'inactive'  # Mark as inactive but keep in session
+        elif current_time - last_update <= staleThreshold:
+            transmitting.add(mac)
+
+    # Re-arm the one-shot no-GPS webhook alert for drones that stopped
+    # transmitting, as one set operation instead of a check per detection
+    backend_alerted_no_gps.intersection_update(transmitting)
 
     # Only clean up FAA cache, but keep drone detections for session persistence
     if len(FAA_CACHE) > MAX_FAA_CACHE_SIZE:
-        keys_to_remove = list(FAA_CACHE.keys())[:100]
-        for key in keys_to_remove:
-            del FAA_CACHE[key]
+        trim_faa_cache(100)
 
     # Prune stale ADSB aircraft (not seen in 5 minutes)
     with ADSB_AIRCRAFT_LOCK:
@@ -890,14 +918,15 @@ def start_ais_websocket():
     def ais_websocket_thread():
         global AIS_WS_CONNECTION, AIS_API_KEY
         # Get API key from environment variable or config file
-        api_key = os.environ.get('AISSTREAM_API_KEY') or os.environ.get('AIS_API_KEY') or AIS_API_KEY
+        api_key = _ENV_AIS or AIS_API_KEY
 
         if not api_key:
             logger.info("AIS API key not configured, skipping WebSocket feed. Set AISSTREAM_API_KEY environment variable or configure in ais_config.json")
             return
 
         ws_url = f"wss://stream.aisstream.io/v0/stream"
-        reconnect_delay = 5
+        base_reconnect_delay = 1  # restored after every successful connect
+        reconnect_delay = base_reconnect_delay
         max_reconnect_delay = 60
 
         while not SHUTDOWN_EVENT.is_set():
@@ -947,6 +976,8 @@ def start_ais_websocket():
                         logger.warning("AIS WebSocket closed, will reconnect...")
 
                 def on_open(ws):
+                    nonlocal reconnect_delay
+                    reconnect_delay = base_reconnect_delay
                     logger.info("Connected to AISStream.io WebSocket feed")
                     # Subscribe to UK waters bounding box
                     subscribe_msg = {
@@ -975,8 +1006,8 @@ def start_ais_websocket():
                 logger.error(f"AIS WebSocket connection error: {e}")
 
             if not SHUTDOWN_EVENT.is_set():
-                delay = min(reconnect_delay, max_reconnect_delay)
-                logger.info(f"Reconnecting to AISStream.io in {delay} seconds...")
+                delay = reconnect_delay * random.uniform(0.8, 1.2)
+                logger.info(f"Reconnecting to AISStream.io in {delay:.1f} seconds...")
                 time.sleep(delay)
                 reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
 
@@ -1716,13 +1747,13 @@ def update_aprs_data():
 
         # Get callsigns from config file or use empty list
         callsigns = []
-        if os.path.exists(APRS_CONFIG_FILE):
-            try:
-                with open(APRS_CONFIG_FILE, "r") as f:
-                    config = json.load(f)
-                    callsigns = config.get("callsigns", [])
-            except Exception as e:
-                logger.error(f"Error reading APRS config for callsigns: {e}")
+        try:
+            config = cached_json_load(APRS_CONFIG_FILE)
+            callsigns = config.get("callsigns", [])
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error reading APRS config for callsigns: {e}")
 
         if not callsigns:
             logger.debug("No APRS callsigns configured, skipping update")
@@ -2107,12 +2138,13 @@ def fetch_weather_data(lat, lon, model="gfs", parameters=None, levels=None):
 
     if not WEATHER_API_KEY:
         # Try to get from environment or config file
-        WEATHER_API_KEY = os.environ.get('WINDY_API_KEY', '')
-        if not WEATHER_API_KEY and os.path.exists(WEATHER_CONFIG_FILE):
+        WEATHER_API_KEY = _ENV_WINDY
+        if not WEATHER_API_KEY:
             try:
-                with open(WEATHER_CONFIG_FILE, "r") as f:
-                    config = json.load(f)
-                    WEATHER_API_KEY = config.get("windy_api_key", "")
+                config = cached_json_load(WEATHER_CONFIG_FILE)
+                WEATHER_API_KEY = config.get("windy_api_key", "")
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 logger.debug(f"Error reading weather config: {e}")
 
@@ -2177,13 +2209,13 @@ def update_weather_data():
 
         if not locations:
             # Try to load from config file
-            if os.path.exists(WEATHER_CONFIG_FILE):
-                try:
-                    with open(WEATHER_CONFIG_FILE, "r") as f:
-                        config = json.load(f)
-                        locations = config.get("locations", [])
-                except Exception as e:
-                    logger.error(f"Error reading weather config for locations: {e}")
+            try:
+                config = cached_json_load(WEATHER_CONFIG_FILE)
+                locations = list(config.get("locations", []))  # appended to below
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.error(f"Error reading weather config for locations: {e}")
 
         # Also fetch weather for active drone detections
         current_time = time.time()
@@ -2220,6 +2252,7 @@ def update_weather_data():
             return
 
         new_weather_data = {}
+        db_records = []
 
         for location in locations:
             lat = location.get("lat")
@@ -2242,19 +2275,13 @@ def update_weather_data():
                 }
                 weather["last_update"] = time.time()
                 new_weather_data[location_key] = weather
+                db_records.append((location_key, name, lat, lon, location.get("source", "manual"), weather))
 
-                # Save to database
-                try:
-                    save_weather_to_db(
-                        location_key,
-                        name,
-                        lat,
-                        lon,
-                        location.get("source", "manual"),
-                        weather
-                    )
-                except Exception as e:
-                    logger.debug(f"Error saving weather to database: {e}")
+        # Save to database in one transaction
+        try:
+            save_weather_bulk(db_records)
+        except Exception as e:
+            logger.debug(f"Error saving weather to database: {e}")
 
         WEATHER_DATA = new_weather_data
 
@@ -2315,12 +2342,13 @@ def fetch_webcams(bounds=None, limit=50):
 
     if not WEBCAMS_API_KEY:
         # Try to get from environment or config file
-        WEBCAMS_API_KEY = os.environ.get('WINDY_WEBCAMS_API_KEY', '')
-        if not WEBCAMS_API_KEY and os.path.exists(WEBCAMS_CONFIG_FILE):
+        WEBCAMS_API_KEY = _ENV_WEBCAMS
+        if not WEBCAMS_API_KEY:
             try:
-                with open(WEBCAMS_CONFIG_FILE, "r") as f:
-                    config = json.load(f)
-                    WEBCAMS_API_KEY = config.get("windy_webcams_api_key", "")
+                config = cached_json_load(WEBCAMS_CONFIG_FILE)
+                WEBCAMS_API_KEY = config.get("windy_webcams_api_key", "")
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 logger.debug(f"Error reading webcams config: {e}")
 
@@ -2497,7 +2525,8 @@ def start_lightning_detection():
             "wss://ws.lightningmaps.org/",
         ]
         ws_url = ws_urls[0]  # Start with the documented endpoint
-        reconnect_delay = 5  # seconds
+        base_reconnect_delay = 1  # seconds; restored after every successful connect
+        reconnect_delay = base_reconnect_delay
         max_reconnect_delay = 60  # max delay between reconnects
 
         while not SHUTDOWN_EVENT.is_set():
@@ -2528,6 +2557,8 @@ def start_lightning_detection():
                         logger.warning("Lightning WebSocket closed, will reconnect...")
 
                 def on_open(ws):
+                    nonlocal reconnect_delay
+                    reconnect_delay = base_reconnect_delay
                     logger.info("Connected to LightningMaps.org WebSocket feed")
 
                 # Create WebSocket connection (disable SSL verification for LightningMaps.org)
@@ -2548,10 +2579,10 @@ def start_lightning_detection():
             except Exception as e:
                 logger.error(f"Lightning WebSocket connection error: {e}")
 
-            # Reconnect with exponential backoff
+            # Reconnect with exponential backoff (+/-20% jitter to avoid reconnect storms)
             if not SHUTDOWN_EVENT.is_set():
-                delay = min(reconnect_delay, max_reconnect_delay)
-                logger.info(f"Reconnecting to LightningMaps.org in {delay} seconds...")
+                delay = reconnect_delay * random.uniform(0.8, 1.2)
+                logger.info(f"Reconnecting to LightningMaps.org in {delay:.1f} seconds...")
                 time.sleep(delay)
                 reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
 
@@ -2663,17 +2694,13 @@ def process_lightning_strike(strike_data):
 # Signal Handlers for Graceful Shutdown
 # ----------------------
 def signal_handler(signum, frame):
-    """Handle shutdown signals gracefully"""
+    """Handle shutdown signals: flag shutdown and exit; cleanup runs via atexit."""
     logger.info(f"Received signal {signum}, initiating graceful shutdown...")
     SHUTDOWN_EVENT.set()
+    sys.exit(0)
 
-    # Disconnect MQTT publisher
-    try:
-        mqtt_publisher.disconnect()
-    except Exception as e:
-        logger.error(f"Error disconnecting MQTT publisher: {e}")
-
-    # Close all serial connections
+def _close_all_serial():
+    """Close all open serial connections."""
     with serial_objs_lock:
         for port, ser in serial_objs.items():
             try:
@@ -2683,8 +2710,33 @@ def signal_handler(signum, frame):
             except Exception as e:
                 logger.error(f"Error closing serial port {port}: {e}")
 
+def _shutdown_cleanup():
+    """Release resources at interpreter exit (kept out of the signal frame, where
+    a serial close blocked on kernel buffers could stall SIGTERM handling)."""
+    SHUTDOWN_EVENT.set()
+
+    # Persist any settings still waiting on the debounce timer
+    try:
+        flush_debounced_saves()
+    except Exception as e:
+        logger.error(f"Error flushing pending settings: {e}")
+
+    # Disconnect MQTT publisher
+    try:
+        mqtt_publisher.disconnect()
+    except Exception as e:
+        logger.error(f"Error disconnecting MQTT publisher: {e}")
+
+    # Write out buffered detection and FAA log CSV rows
+    try:
+        flush_detection_logs()
+    except Exception as e:
+        logger.error(f"Error flushing detection logs: {e}")
+
+    _close_all_serial()
     logger.info("Shutdown complete")
-    sys.exit(0)
+
+atexit.register(_shutdown_cleanup)
 
 # Register signal handlers
 signal.signal(signal.SIGINT, signal_handler)
@@ -2702,10 +2754,18 @@ def get_color_for_mac(mac: str) -> str:
 
 # Server-side webhook URL (set via API)
 WEBHOOK_URL = None
+# Whether WEBHOOK_URL is usable; recomputed only when the URL changes so the
+# per-detection path can skip all webhook work with one global read
+_WEBHOOK_ENABLED = False
+
+def _refresh_webhook_enabled():
+    global _WEBHOOK_ENABLED
+    _WEBHOOK_ENABLED = bool(WEBHOOK_URL) and WEBHOOK_URL.startswith("http")
 
 def set_server_webhook_url(url: str):
     global WEBHOOK_URL
     WEBHOOK_URL = url
+    _refresh_webhook_enabled()
     save_webhook_url()  # Save to disk whenever URL is updated
 
 app = Flask(__name__, static_folder='static')
@@ -2739,15 +2799,15 @@ def requires_auth(f):
     return decorated
 
 # Exempt paths that don't need auth
-AUTH_EXEMPT_PATHS = {'/health', '/api/health', '/api/mmip/status'}
+AUTH_EXEMPT_PATHS = frozenset({'/health', '/api/health', '/api/mmip/status'})
+# Path prefixes that skip auth (socketio polling/websocket is handled by SocketIO namespace)
+_AUTH_SKIP_PREFIXES = ('/socket.io/',)
 
 @app.before_request
 def before_request_auth():
     """Apply authentication to all routes except health endpoints and SocketIO."""
-    if request.path in AUTH_EXEMPT_PATHS:
-        return None
-    # Skip auth for socketio polling/websocket (handled by SocketIO namespace)
-    if request.path.startswith('/socket.io'):
+    path = request.path
+    if path in AUTH_EXEMPT_PATHS or path.startswith(_AUTH_SKIP_PREFIXES):
         return None
     auth = request.authorization
     if not auth or not check_auth(auth.username, auth.password):
@@ -2773,54 +2833,44 @@ def api_mmip_status():
 # Define emit_serial_status early to avoid NameError in threads
 def emit_serial_status():
     try:
-        socketio.emit('serial_status', serial_connected_status, )
+        socketio.emit('serial_status', serial_connected_status, room='serial_status')
     except Exception as e:
         logger.debug(f"Error emitting serial status: {e}")
         pass  # Ignore if no clients connected or serialization error
 
 def emit_aliases():
     try:
-        socketio.emit('aliases', ALIASES, )
+        socketio.emit('aliases', ALIASES, room='aliases')
     except Exception as e:
         logger.debug(f"Error emitting aliases: {e}")
 
 def emit_detections():
     try:
-        # Convert tracked_pairs to a JSON-serializable format
-        serializable_pairs = {}
-        for key, value in tracked_pairs.items():
-            # Ensure key is a string
-            str_key = str(key)
-            # Ensure value is JSON-serializable
-            if isinstance(value, dict):
-                serializable_pairs[str_key] = value
-            else:
-                serializable_pairs[str_key] = str(value)
-        socketio.emit('detections', serializable_pairs, )
+        # tracked_pairs is only ever written as {mac_str: detection_dict} (update_detection,
+        # api_query_faa), so no per-entry coercion is needed. A shallow copy keeps the
+        # serializer safe from concurrent inserts by the serial threads.
+        socketio.emit('detections', dict(tracked_pairs), room='detections')
     except Exception as e:
         logger.debug(f"Error emitting detections: {e}")
 
 def emit_paths():
     try:
-        socketio.emit('paths', get_paths_for_emit(), )
+        socketio.emit('paths', get_paths_for_emit(), room='paths')
     except Exception as e:
         logger.debug(f"Error emitting paths: {e}")
 
 def emit_cumulative_log():
     try:
-        socketio.emit('cumulative_log', get_cumulative_log_for_emit(), )
+        seq, rows = get_cumulative_log_delta()
+        if rows:
+            socketio.emit('cumulative_log_delta', {'seq': seq, 'entries': rows}, room='cumulative_log')
     except Exception as e:
         logger.debug(f"Error emitting cumulative log: {e}")
 
 def emit_faa_cache():
     try:
-        # Convert FAA_CACHE to JSON-serializable format
-        serializable_cache = {}
-        for key, value in FAA_CACHE.items():
-            # Convert tuple keys to strings
-            str_key = str(key) if isinstance(key, tuple) else key
-            serializable_cache[str_key] = value
-        socketio.emit('faa_cache', serializable_cache, )
+        # FAA_CACHE keys are already "mac|remote_id" strings, so it serializes as-is
+        socketio.emit('faa_cache', FAA_CACHE, room='faa_cache')
     except Exception as e:
         logger.debug(f"Error emitting FAA cache: {e}")
 
@@ -2832,162 +2882,186 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_FILE = os.path.join(BASE_DIR, "mesh_mapper.db")
 DB_LOCK = threading.Lock()
 
+# Bump SCHEMA_VERSION whenever SCHEMA_SQL changes so existing databases pick it up.
+SCHEMA_VERSION = 1
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS detections (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mac TEXT NOT NULL,
+    alias TEXT,
+    timestamp REAL NOT NULL,
+    rssi INTEGER,
+    drone_lat REAL,
+    drone_lon REAL,
+    drone_altitude REAL,
+    pilot_lat REAL,
+    pilot_lon REAL,
+    basic_id TEXT,
+    faa_data TEXT,
+    status TEXT DEFAULT 'active',
+    last_update REAL,
+    created_at REAL DEFAULT (strftime('%s', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_mac ON detections(mac);
+CREATE INDEX IF NOT EXISTS idx_timestamp ON detections(timestamp);
+CREATE INDEX IF NOT EXISTS idx_status ON detections(status);
+CREATE INDEX IF NOT EXISTS idx_last_update ON detections(last_update);
+
+CREATE TABLE IF NOT EXISTS ais_vessels (
+    mmsi TEXT PRIMARY KEY,
+    name TEXT,
+    vessel_type TEXT,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    course REAL,
+    speed REAL,
+    heading INTEGER,
+    length REAL,
+    width REAL,
+    timestamp REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_timestamp_ais ON ais_vessels(timestamp);
+CREATE INDEX IF NOT EXISTS idx_last_seen_ais ON ais_vessels(last_seen);
+
+CREATE TABLE IF NOT EXISTS weather_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    location_key TEXT NOT NULL UNIQUE,
+    location_name TEXT,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    source TEXT,
+    weather_json TEXT,
+    last_update REAL NOT NULL,
+    created_at REAL DEFAULT (strftime('%s', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_last_update_weather ON weather_data(last_update);
+CREATE INDEX IF NOT EXISTS idx_location_weather ON weather_data(lat, lon);
+
+CREATE TABLE IF NOT EXISTS webcams (
+    webcam_id TEXT PRIMARY KEY,
+    title TEXT,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    status TEXT,
+    image_url TEXT,
+    player_url TEXT,
+    webcam_json TEXT,
+    last_update REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_last_update_webcams ON webcams(last_update);
+CREATE INDEX IF NOT EXISTS idx_location_webcams ON webcams(lat, lon);
+
+CREATE TABLE IF NOT EXISTS aprs_stations (
+    callsign TEXT PRIMARY KEY,
+    name TEXT,
+    type TEXT,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    altitude REAL,
+    course REAL,
+    speed REAL,
+    symbol TEXT,
+    comment TEXT,
+    status TEXT,
+    timestamp INTEGER,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_last_seen_aprs ON aprs_stations(last_seen);
+CREATE INDEX IF NOT EXISTS idx_location_aprs ON aprs_stations(lat, lon);
+
+CREATE TABLE IF NOT EXISTS adsb_aircraft (
+    hex TEXT PRIMARY KEY,
+    callsign TEXT,
+    registration TEXT,
+    aircraft_type TEXT,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    altitude_ft REAL,
+    altitude_baro REAL,
+    altitude_geom REAL,
+    speed_kts REAL,
+    track REAL,
+    vertical_rate INTEGER,
+    squawk TEXT,
+    category TEXT,
+    timestamp REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_last_seen_adsb ON adsb_aircraft(last_seen);
+CREATE INDEX IF NOT EXISTS idx_location_adsb ON adsb_aircraft(lat, lon);
+
+CREATE TABLE IF NOT EXISTS faa_cache (
+    mac TEXT NOT NULL,
+    remote_id TEXT NOT NULL,
+    faa_response TEXT,
+    cached_at REAL DEFAULT (strftime('%s', 'now')),
+    PRIMARY KEY (mac, remote_id)
+);
+CREATE INDEX IF NOT EXISTS idx_mac_faa ON faa_cache(mac);
+CREATE INDEX IF NOT EXISTS idx_remote_id_faa ON faa_cache(remote_id);
+
+CREATE TABLE IF NOT EXISTS aliases (
+    mac TEXT PRIMARY KEY,
+    alias TEXT NOT NULL,
+    updated_at REAL DEFAULT (strftime('%s', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS zones (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    zone_type TEXT,
+    coordinates TEXT,
+    lower_altitude_ft REAL,
+    upper_altitude_ft REAL,
+    enabled INTEGER DEFAULT 1,
+    source TEXT,
+    created_at REAL DEFAULT (strftime('%s', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_enabled_zones ON zones(enabled);
+
+CREATE TABLE IF NOT EXISTS incidents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    incident_type TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    mac TEXT,
+    alias TEXT,
+    zone_id TEXT,
+    drone_lat REAL,
+    drone_lon REAL,
+    drone_altitude REAL,
+    pilot_lat REAL,
+    pilot_lon REAL,
+    basic_id TEXT,
+    rssi INTEGER,
+    faa_data TEXT,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_timestamp_incidents ON incidents(timestamp);
+CREATE INDEX IF NOT EXISTS idx_type_incidents ON incidents(incident_type);
+CREATE INDEX IF NOT EXISTS idx_mac_incidents ON incidents(mac);
+"""
+
 def init_database():
-    """Initialize SQLite database with schema"""
+    """Initialize SQLite database with schema
+
+    The schema is only executed when PRAGMA user_version is behind SCHEMA_VERSION,
+    so routine restarts skip the multi-statement parse entirely.
+    """
     conn = sqlite3.connect(DB_FILE, check_same_thread=False)
-    conn.row_factory = sqlite3.Row  # Return rows as dict-like objects
     cursor = conn.cursor()
 
     try:
-        # Read and execute schema
-        schema_file = os.path.join(BASE_DIR, "database_schema.sql")
-        if os.path.exists(schema_file):
-            with open(schema_file, 'r') as f:
-                schema = f.read()
-                # Use executescript for multi-statement execution
-                cursor.executescript(schema)
-                logger.info("Database schema loaded from file")
-        else:
-            # Create schema inline if file doesn't exist
-            logger.info("Schema file not found, using inline schema")
-            cursor.executescript("""
-        CREATE TABLE IF NOT EXISTS detections (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            mac TEXT NOT NULL,
-            alias TEXT,
-            timestamp REAL NOT NULL,
-            rssi INTEGER,
-            drone_lat REAL,
-            drone_lon REAL,
-            drone_altitude REAL,
-            pilot_lat REAL,
-            pilot_lon REAL,
-            basic_id TEXT,
-            faa_data TEXT,
-            status TEXT DEFAULT 'active',
-            last_update REAL,
-            created_at REAL DEFAULT (strftime('%s', 'now'))
-        );
-        CREATE INDEX IF NOT EXISTS idx_mac ON detections(mac);
-        CREATE INDEX IF NOT EXISTS idx_timestamp ON detections(timestamp);
-        CREATE INDEX IF NOT EXISTS idx_status ON detections(status);
-        CREATE INDEX IF NOT EXISTS idx_last_update ON detections(last_update);
-
-        CREATE TABLE IF NOT EXISTS ais_vessels (
-            mmsi TEXT PRIMARY KEY,
-            name TEXT,
-            vessel_type TEXT,
-            lat REAL NOT NULL,
-            lon REAL NOT NULL,
-            course REAL,
-            speed REAL,
-            heading INTEGER,
-            length REAL,
-            width REAL,
-            timestamp REAL NOT NULL,
-            last_seen REAL NOT NULL
-        );
-        CREATE INDEX IF NOT EXISTS idx_timestamp_ais ON ais_vessels(timestamp);
-        CREATE INDEX IF NOT EXISTS idx_last_seen_ais ON ais_vessels(last_seen);
-
-        CREATE TABLE IF NOT EXISTS weather_data (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            location_key TEXT NOT NULL UNIQUE,
-            location_name TEXT,
-            lat REAL NOT NULL,
-            lon REAL NOT NULL,
-            source TEXT,
-            weather_json TEXT,
-            last_update REAL NOT NULL,
-            created_at REAL DEFAULT (strftime('%s', 'now'))
-        );
-        CREATE INDEX IF NOT EXISTS idx_last_update_weather ON weather_data(last_update);
-        CREATE INDEX IF NOT EXISTS idx_location_weather ON weather_data(lat, lon);
-
-        CREATE TABLE IF NOT EXISTS webcams (
-            webcam_id TEXT PRIMARY KEY,
-            title TEXT,
-            lat REAL NOT NULL,
-            lon REAL NOT NULL,
-            status TEXT,
-            image_url TEXT,
-            player_url TEXT,
-            webcam_json TEXT,
-            last_update REAL NOT NULL
-        );
-        CREATE INDEX IF NOT EXISTS idx_last_update_webcams ON webcams(last_update);
-        CREATE INDEX IF NOT EXISTS idx_location_webcams ON webcams(lat, lon);
-
-        CREATE TABLE IF NOT EXISTS aprs_stations (
-            callsign TEXT PRIMARY KEY,
-            name TEXT,
-            type TEXT,
-            lat REAL NOT NULL,
-            lon REAL NOT NULL,
-            altitude REAL,
-            course REAL,
-            speed REAL,
-            symbol TEXT,
-            comment TEXT,
-            status TEXT,
-            timestamp INTEGER,
-            last_seen REAL NOT NULL
-        );
-        CREATE INDEX IF NOT EXISTS idx_last_seen_aprs ON aprs_stations(last_seen);
-        CREATE INDEX IF NOT EXISTS idx_location_aprs ON aprs_stations(lat, lon);
-
-        CREATE TABLE IF NOT EXISTS faa_cache (
-            mac TEXT NOT NULL,
-            remote_id TEXT NOT NULL,
-            faa_response TEXT,
-            cached_at REAL DEFAULT (strftime('%s', 'now')),
-            PRIMARY KEY (mac, remote_id)
-        );
-        CREATE INDEX IF NOT EXISTS idx_mac_faa ON faa_cache(mac);
-        CREATE INDEX IF NOT EXISTS idx_remote_id_faa ON faa_cache(remote_id);
-
-        CREATE TABLE IF NOT EXISTS aliases (
-            mac TEXT PRIMARY KEY,
-            alias TEXT NOT NULL,
-            updated_at REAL DEFAULT (strftime('%s', 'now'))
-        );
-
-        CREATE TABLE IF NOT EXISTS zones (
-            id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            zone_type TEXT,
-            coordinates TEXT,
-            lower_altitude_ft REAL,
-            upper_altitude_ft REAL,
-            enabled INTEGER DEFAULT 1,
-            source TEXT,
-            created_at REAL DEFAULT (strftime('%s', 'now'))
-        );
-        CREATE INDEX IF NOT EXISTS idx_enabled_zones ON zones(enabled);
-
-        CREATE TABLE IF NOT EXISTS incidents (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            incident_type TEXT NOT NULL,
-            timestamp REAL NOT NULL,
-            mac TEXT,
-            alias TEXT,
-            zone_id TEXT,
-            drone_lat REAL,
-            drone_lon REAL,
-            drone_altitude REAL,
-            pilot_lat REAL,
-            pilot_lon REAL,
-            basic_id TEXT,
-            rssi INTEGER,
-            faa_data TEXT,
-            details TEXT
-        );
-        CREATE INDEX IF NOT EXISTS idx_timestamp_incidents ON incidents(timestamp);
-        CREATE INDEX IF NOT EXISTS idx_type_incidents ON incidents(incident_type);
-        CREATE INDEX IF NOT EXISTS idx_mac_incidents ON incidents(mac);
-        """)
-
-        conn.commit()
+        current_version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        if current_version < SCHEMA_VERSION:
+            cursor.executescript(SCHEMA_SQL)
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+            logger.info(f"Database schema upgraded from version {current_version} to {SCHEMA_VERSION}")
+        # WAL lets the FAA cache writes from the serial threads append without
+        # blocking readers; the mode is stored in the file, so this is a no-op
+        # after the first start
+        cursor.execute("PRAGMA journal_mode=WAL")
         logger.info("Database initialized successfully")
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
@@ -2995,12 +3069,30 @@ def init_database():
     finally:
         conn.close()
 
-def get_db_connection():
-    """Get a database connection (thread-safe)"""
+def get_db_connection(row_factory=sqlite3.Row):
+    """Get a database connection (thread-safe)
+
+    Pass row_factory=None to get plain tuples back; the get_recent_* readers
+    use that with the column tuples below to avoid sqlite3.Row.keys() per row.
+    """
     conn = sqlite3.connect(DB_FILE, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
+    conn.row_factory = row_factory
     return conn
 
+# Column order for the tuple fast-path in the get_recent_* readers.
+# Each reader SELECTs these columns explicitly so zip() lines up with the row.
+_DET_COLS = ('id', 'mac', 'alias', 'timestamp', 'rssi', 'drone_lat', 'drone_lon',
+             'drone_altitude', 'pilot_lat', 'pilot_lon', 'basic_id', 'faa_data',
+             'status', 'last_update', 'created_at')
+_AIS_COLS = ('mmsi', 'name', 'vessel_type', 'lat', 'lon', 'course', 'speed', 'heading',
+             'length', 'width', 'timestamp', 'last_seen')
+_WEATHER_COLS = ('id', 'location_key', 'location_name', 'lat', 'lon', 'source',
+                 'weather_json', 'last_update', 'created_at')
+_WEBCAM_COLS = ('webcam_id', 'title', 'lat', 'lon', 'status', 'image_url', 'player_url',
+                'webcam_json', 'last_update')
+_APRS_COLS = ('callsign', 'name', 'type', 'lat', 'lon', 'altitude', 'course', 'speed',
+              'symbol', 'comment', 'status', 'timestamp', 'last_seen')
+
 # ----------------------
 # Database Helper Functions
 # ----------------------
@@ -3039,25 +3131,24 @@ def save_detection_to_db(detection: Dict[str, Any]):
 def get_recent_detections_from_db(minutes=5):
     """Get recent detections from database"""
     with DB_LOCK:
-        conn = get_db_connection()
+        conn = get_db_connection(row_factory=None)
         cursor = conn.cursor()
         try:
             cutoff = time.time() - (minutes * 60)
-            cursor.execute("""
-                SELECT * FROM detections
+            cursor.execute(f"""
+                SELECT {', '.join(_DET_COLS)} FROM detections
                 WHERE last_update > ?
                 ORDER BY last_update DESC
             """, (cutoff,))
             rows = cursor.fetchall()
-            detections = []
-            for row in rows:
-                det = dict(row)
-                if det.get('faa_data'):
+            detections = [dict(zip(_DET_COLS, row)) for row in rows]
+            # Only rows carrying FAA JSON need rehydration
+            for det in detections:
+                if det['faa_data']:
                     try:
                         det['faa_data'] = json.loads(det['faa_data'])
                     except:
                         det['faa_data'] = {}
-                detections.append(det)
             return detections
         except Exception as e:
             logger.error(f"Error getting recent detections: {e}")
@@ -3099,17 +3190,17 @@ def save_ais_vessel_to_db(vessel: Dict[str, Any]):
 def get_recent_ais_vessels_from_db(minutes=10):
     """Get recent AIS vessels from database"""
     with DB_LOCK:
-        conn = get_db_connection()
+        conn = get_db_connection(row_factory=None)
         cursor = conn.cursor()
         try:
             cutoff = time.time() - (minutes * 60)
-            cursor.execute("""
-                SELECT * FROM ais_vessels
+            cursor.execute(f"""
+                SELECT {', '.join(_AIS_COLS)} FROM ais_vessels
                 WHERE last_seen > ?
                 ORDER BY last_seen DESC
             """, (cutoff,))
             rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            return [dict(zip(_AIS_COLS, row)) for row in rows]
         except Exception as e:
             logger.error(f"Error getting recent AIS vessels: {e}")
             return []
@@ -3119,23 +3210,29 @@ def get_recent_ais_vessels_from_db(minutes=10):
 def save_weather_to_db(location_key: str, location_name: str, lat: float, lon: float,
                        source: str, weather_data: Dict[str, Any]):
     """Save or update weather data in the database"""
+    save_weather_bulk([(location_key, location_name, lat, lon, source, weather_data)])
+
+def save_weather_bulk(records: List[tuple]):
+    """Save or update many weather locations with a single executemany + commit
+
+    records: iterable of (location_key, location_name, lat, lon, source, weather_data)
+    """
+    if not records:
+        return
+    now = time.time()
+    rows = [
+        (location_key, location_name, lat, lon, source, json.dumps(weather_data), now)
+        for location_key, location_name, lat, lon, source, weather_data in records
+    ]
     with DB_LOCK:
         conn = get_db_connection()
         cursor = conn.cursor()
         try:
-            cursor.execute("""
+            cursor.executemany("""
                 INSERT OR REPLACE INTO weather_data
                 (location_key, location_name, lat, lon, source, weather_json, last_update)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                location_key,
-                location_name,
-                lat,
-                lon,
-                source,
-                json.dumps(weather_data),
-                time.time()
-            ))
+            """, rows)
             conn.commit()
         except Exception as e:
             logger.error(f"Error saving weather to database: {e}")
@@ -3145,20 +3242,20 @@ def save_weather_to_db(location_key: str, location_name: str, lat: float, lon: f
 def get_recent_weather_from_db(minutes=10):
     """Get recent weather data from database"""
     with DB_LOCK:
-        conn = get_db_connection()
+        conn = get_db_connection(row_factory=None)
         cursor = conn.cursor()
         try:
             cutoff = time.time() - (minutes * 60)
-            cursor.execute("""
-                SELECT * FROM weather_data
+            cursor.execute(f"""
+                SELECT {', '.join(_WEATHER_COLS)} FROM weather_data
                 WHERE last_update > ?
                 ORDER BY last_update DESC
             """, (cutoff,))
             rows = cursor.fetchall()
             weather_list = []
             for row in rows:
-                w = dict(row)
-                if w.get('weather_json'):
+                w = dict(zip(_WEATHER_COLS, row))
+                if w['weather_json']:
                     try:
                         w['weather'] = json.loads(w['weather_json'])
                         w['weather']['location'] = {
@@ -3207,20 +3304,20 @@ def save_webcam_to_db(webcam: Dict[str, Any]):
 def get_recent_webcams_from_db(minutes=60):
     """Get recent webcams from database"""
     with DB_LOCK:
-        conn = get_db_connection()
+        conn = get_db_connection(row_factory=None)
         cursor = conn.cursor()
         try:
             cutoff = time.time() - (minutes * 60)
-            cursor.execute("""
-                SELECT * FROM webcams
+            cursor.execute(f"""
+                SELECT {', '.join(_WEBCAM_COLS)} FROM webcams
                 WHERE status = 'active' AND last_update > ?
                 ORDER BY last_update DESC
             """, (cutoff,))
             rows = cursor.fetchall()
             webcams = []
             for row in rows:
-                w = dict(row)
-                if w.get('webcam_json'):
+                w = dict(zip(_WEBCAM_COLS, row))
+                if w['webcam_json']:
                     try:
                         w.update(json.loads(w['webcam_json']))
                     except:
@@ -3268,17 +3365,17 @@ def save_aprs_station_to_db(station: Dict[str, Any]):
 def get_recent_aprs_stations_from_db(minutes=10):
     """Get recent APRS stations from database"""
     with DB_LOCK:
-        conn = get_db_connection()
+        conn = get_db_connection(row_factory=None)
         cursor = conn.cursor()
         try:
             cutoff = time.time() - (minutes * 60)
-            cursor.execute("""
-                SELECT * FROM aprs_stations
+            cursor.execute(f"""
+                SELECT {', '.join(_APRS_COLS)} FROM aprs_stations
                 WHERE last_seen > ?
                 ORDER BY last_seen DESC
             """, (cutoff,))
             rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            return [dict(zip(_APRS_COLS, row)) for row in rows]
         except Exception as e:
             logger.error(f"Error getting recent APRS stations: {e}")
             return []
@@ -3304,51 +3401,239 @@ WEBCAMS_SETTINGS_FILE = os.path.join(BASE_DIR, "webcams_settings.json")
 METOFFICE_SETTINGS_FILE = os.path.join(BASE_DIR, "metoffice_settings.json")  # Met Office alert settings
 BLE_CONFIG_FILE = os.path.join(BASE_DIR, "ble_config.json")  # BLE Radar configuration file
 
-def load_lightning_settings():
-    """Load lightning detection settings from disk"""
-    global LIGHTNING_DETECTION_ENABLED
-    if os.path.exists(LIGHTNING_SETTINGS_FILE):
+# ----------------------
+# JSON Config Cache
+# ----------------------
+# Settings/config loaders run several times during startup and the periodic
+# fetchers re-read their config on every cycle; re-parse a file only when its
+# mtime or size has changed.
+_json_cache = {}  # path -> (st_mtime_ns, st_size, parsed)
+_json_cache_lock = threading.Lock()
+
+def read_json_file(path):
+    """Parse a JSON file, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r") as f:
+        return json.load(f)
+
+def dumps_json(data):
+    """Serialize data to a compact JSON string, using orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(data)
+
+def dumps_json_bytes(data):
+    """Serialize data to compact UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            pass
+    return json.dumps(data).encode('utf-8')
+
+def loads_json(text):
+    """Parse a JSON string or bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+# Second-resolution ISO timestamp, formatted at most once per second
+_now_iso_cache = (0, '')  # (epoch second, isoformat text)
+
+def now_iso():
+    """datetime.now().isoformat() truncated to whole seconds, cached per second"""
+    global _now_iso_cache
+    second = int(time.time())
+    cached = _now_iso_cache
+    if cached[0] != second:
+        cached = _now_iso_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return cached[1]
+
+def write_json_file(path, data, indent=None):
+    """Atomically serialize data to a JSON file, using orjson when it is installed.
+
+    The JSON is written to a temporary file, fsynced, then renamed over path,
+    so a crash or power loss mid-write never leaves a truncated file behind.
+    orjson only pretty-prints with two spaces, so any indent maps to that.
+    Falls back to the json module for values orjson rejects (e.g. non-str keys).
+    """
+    payload = None
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            payload = None
+    if payload is None:
+        payload = json.dumps(data, indent=indent).encode("utf-8")
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def cached_json_load(path):
+    """Return the parsed JSON content of path, re-reading only when it changed.
+
+    Raises FileNotFoundError like open() so callers can keep their EAFP
+    fallbacks. The returned object is shared; callers must not mutate it.
+    """
+    st = os.stat(path)
+    with _json_cache_lock:
+        entry = _json_cache.get(path)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2]
+    data = read_json_file(path)
+    with _json_cache_lock:
+        _json_cache[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+# ----------------------
+# Debounced Settings Writes
+# ----------------------
+SETTINGS_SAVE_DEBOUNCE = 0.5  # seconds; only the last write in a burst hits disk
+_pending_saves = {}  # path -> (timer, data, indent)
+_pending_saves_lock = threading.Lock()
+
+def _write_settings_file(path, data, indent=None):
+    _json_cache.pop(path, None)
+    try:
+        write_json_file(path, data, indent)
+        logger.debug(f"Settings saved to {path}")
+    except Exception as e:
+        logger.error(f"Error saving settings to {path}: {e}")
+
+def _flush_debounced_save(path, timer):
+    with _pending_saves_lock:
+        pending = _pending_saves.get(path)
+        if not pending or pending[0] is not timer:
+            return  # Superseded by a newer write
+        del _pending_saves[path]
+    _write_settings_file(path, pending[1], pending[2])
+
+def _debounced_save(path, data, delay=SETTINGS_SAVE_DEBOUNCE, indent=None):
+    """Schedule a JSON write of data to path, coalescing bursts per path"""
+    # Shallow copy so later in-place edits by the caller can't race the serializer
+    snapshot = list(data) if isinstance(data, list) else dict(data)
+    with _pending_saves_lock:
+        pending = _pending_saves.get(path)
+        if pending:
+            pending[0].cancel()
+        timer = threading.Timer(delay, lambda: _flush_debounced_save(path, timer))
+        timer.daemon = True
+        _pending_saves[path] = (timer, snapshot, indent)
+        timer.start()
+
+def flush_debounced_saves():
+    """Write any pending debounced settings immediately (used on shutdown)"""
+    with _pending_saves_lock:
+        pending = list(_pending_saves.items())
+        _pending_saves.clear()
+    for path, (timer, data, indent) in pending:
+        timer.cancel()
+        _write_settings_file(path, data, indent)
+
+# ----------------------
+# Unified Settings Store
+# ----------------------
+# Feature toggles and Met Office alert preferences live in one settings.json
+# ({"lightning": {...}, "ais": {...}, ...}) instead of one file per feature.
+# Legacy per-feature files are read once to seed missing sections. API keys
+# stay in their own *_config.json files.
+SETTINGS_FILE = os.path.join(BASE_DIR, "settings.json")
+_LEGACY_SETTINGS_FILES = {
+    "lightning": LIGHTNING_SETTINGS_FILE,
+    "ais": AIS_SETTINGS_FILE,
+    "aprs": APRS_SETTINGS_FILE,
+    "weather": WEATHER_SETTINGS_FILE,
+    "webcams": WEBCAMS_SETTINGS_FILE,
+    "metoffice": METOFFICE_SETTINGS_FILE,
+}
+_SETTINGS = None  # section -> dict, loaded on first use
+_settings_lock = threading.Lock()
+
+def _settings_store():
+    """Return the settings dict, loading (and migrating) it on first use"""
+    global _SETTINGS
+    if _SETTINGS is not None:
+        return _SETTINGS
+    try:
+        settings = dict(cached_json_load(SETTINGS_FILE))
+    except FileNotFoundError:
+        settings = {}
+    except Exception as e:
+        logger.error(f"Error loading settings from {SETTINGS_FILE}: {e}")
+        settings = {}
+    for section, path in _LEGACY_SETTINGS_FILES.items():
+        if section in settings:
+            continue
         try:
-            with open(LIGHTNING_SETTINGS_FILE, "r") as f:
-                data = json.load(f)
-                LIGHTNING_DETECTION_ENABLED = data.get("enabled", True)
-                logger.info(f"Loaded lightning detection setting: {'enabled' if LIGHTNING_DETECTION_ENABLED else 'disabled'}")
+            settings[section] = dict(cached_json_load(path))
+            logger.info(f"Migrated {os.path.basename(path)} into {os.path.basename(SETTINGS_FILE)}")
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            logger.error(f"Error loading lightning settings: {e}")
-            LIGHTNING_DETECTION_ENABLED = True
+            logger.error(f"Error reading legacy settings file {path}: {e}")
+    _SETTINGS = settings
+    return _SETTINGS
+
+def get_settings_section(section):
+    """Return the stored dict for a settings section, or None if never saved"""
+    with _settings_lock:
+        return _settings_store().get(section)
+
+def set_settings_section(section, values):
+    """Replace a settings section and schedule a single write of settings.json"""
+    with _settings_lock:
+        settings = _settings_store()
+        settings[section] = dict(values)
+        _debounced_save(SETTINGS_FILE, settings, indent=2)
 
-def save_lightning_settings():
-    """Save lightning detection settings to disk"""
+def load_lightning_settings():
+    """Load lightning detection settings from disk"""
     global LIGHTNING_DETECTION_ENABLED
+    data = get_settings_section("lightning")
+    if data is None:
+        return
     try:
-        with open(LIGHTNING_SETTINGS_FILE, "w") as f:
-            json.dump({"enabled": LIGHTNING_DETECTION_ENABLED}, f)
-        logger.debug(f"Lightning settings saved to {LIGHTNING_SETTINGS_FILE}")
+        LIGHTNING_DETECTION_ENABLED = data.get("enabled", True)
+        logger.info(f"Loaded lightning detection setting: {'enabled' if LIGHTNING_DETECTION_ENABLED else 'disabled'}")
     except Exception as e:
-        logger.error(f"Error saving lightning settings: {e}")
+        logger.error(f"Error loading lightning settings: {e}")
+        LIGHTNING_DETECTION_ENABLED = True
+
+def save_lightning_settings():
+    """Save lightning detection settings to disk (debounced)"""
+    set_settings_section("lightning", {"enabled": LIGHTNING_DETECTION_ENABLED})
 
 def load_ais_settings():
     """Load AIS detection settings from disk"""
     global AIS_DETECTION_ENABLED
-    if os.path.exists(AIS_SETTINGS_FILE):
-        try:
-            with open(AIS_SETTINGS_FILE, "r") as f:
-                data = json.load(f)
-                AIS_DETECTION_ENABLED = data.get("enabled", True)
-                logger.info(f"Loaded AIS detection setting: {'enabled' if AIS_DETECTION_ENABLED else 'disabled'}")
-        except Exception as e:
-            logger.error(f"Error loading AIS settings: {e}")
-            AIS_DETECTION_ENABLED = True
-
-def save_ais_settings():
-    """Save AIS detection settings to disk"""
-    global AIS_DETECTION_ENABLED
+    data = get_settings_section("ais")
+    if data is None:
+        return
     try:
-        with open(AIS_SETTINGS_FILE, "w") as f:
-            json.dump({"enabled": AIS_DETECTION_ENABLED}, f)
-        logger.debug(f"AIS settings saved to {AIS_SETTINGS_FILE}")
+        AIS_DETECTION_ENABLED = data.get("enabled", True)
+        logger.info(f"Loaded AIS detection setting: {'enabled' if AIS_DETECTION_ENABLED else 'disabled'}")
     except Exception as e:
-        logger.error(f"Error saving AIS settings: {e}")
+        logger.error(f"Error loading AIS settings: {e}")
+        AIS_DETECTION_ENABLED = True
+
+def save_ais_settings():
+    """Save AIS detection settings to disk (debounced)"""
+    set_settings_section("ais", {"enabled": AIS_DETECTION_ENABLED})
 
 # Met Office Weather Warnings Settings
 METOFFICE_ALERT_SETTINGS = {
@@ -3363,68 +3648,82 @@ METOFFICE_ALERT_SETTINGS = {
 def load_metoffice_settings():
     """Load Met Office alert settings from disk"""
     global METOFFICE_ALERT_SETTINGS, METOFFICE_UPDATE_INTERVAL
-    if os.path.exists(METOFFICE_SETTINGS_FILE):
-        try:
-            with open(METOFFICE_SETTINGS_FILE, "r") as f:
-                data = json.load(f)
-                METOFFICE_ALERT_SETTINGS.update(data)
-                # Update update interval if changed
-                if "update_frequency" in data:
-                    METOFFICE_UPDATE_INTERVAL = data["update_frequency"]
-                logger.info(f"Loaded Met Office alert settings")
-        except Exception as e:
-            logger.error(f"Error loading Met Office settings: {e}")
+    data = get_settings_section("metoffice")
+    if data is None:
+        return
+    try:
+        METOFFICE_ALERT_SETTINGS.update(data)
+        # Update update interval if changed
+        if "update_frequency" in data:
+            METOFFICE_UPDATE_INTERVAL = data["update_frequency"]
+        logger.info(f"Loaded Met Office alert settings")
+    except Exception as e:
+        logger.error(f"Error loading Met Office settings: {e}")
 
 def save_metoffice_settings():
-    """Save Met Office alert settings to disk"""
+    """Save Met Office alert settings to disk (debounced)"""
     global METOFFICE_ALERT_SETTINGS, METOFFICE_UPDATE_INTERVAL
-    try:
-        METOFFICE_ALERT_SETTINGS["update_frequency"] = METOFFICE_UPDATE_INTERVAL
-        with open(METOFFICE_SETTINGS_FILE, "w") as f:
-            json.dump(METOFFICE_ALERT_SETTINGS, f, indent=2)
-        logger.debug(f"Met Office settings saved to {METOFFICE_SETTINGS_FILE}")
-    except Exception as e:
-        logger.error(f"Error saving Met Office settings: {e}")
+    METOFFICE_ALERT_SETTINGS["update_frequency"] = METOFFICE_UPDATE_INTERVAL
+    set_settings_section("metoffice", METOFFICE_ALERT_SETTINGS)
 
-def load_ais_config():
-    """Load AIS API keys from config file"""
-    global AIS_API_KEY
-    if os.path.exists(AIS_CONFIG_FILE):
-        try:
-            with open(AIS_CONFIG_FILE, "r") as f:
-                data = json.load(f)
-                # Check environment variables first, then config file
-                AIS_API_KEY = os.environ.get('AISSTREAM_API_KEY') or os.environ.get('AIS_API_KEY') or data.get('aisstream_api_key', '')
-                logger.info("Loaded AIS configuration from file")
-        except Exception as e:
-            logger.error(f"Error loading AIS config: {e}")
-            AIS_API_KEY = os.environ.get('AISSTREAM_API_KEY') or os.environ.get('AIS_API_KEY', '')
-    else:
-        # Try environment variables
-        AIS_API_KEY = os.environ.get('AISSTREAM_API_KEY') or os.environ.get('AIS_API_KEY', '')
+# ----------------------
+# API Key Config Files
+# ----------------------
+# The AIS, APRS, weather and webcams *_config.json files share one shape: an
+# API key (overridden by the environment, see _ENV_*) plus optional extras.
+# name -> (label, config file, JSON key, global variable, environment key)
+_API_KEY_CONFIGS = {
+    "ais": ("AIS", AIS_CONFIG_FILE, "aisstream_api_key", "AIS_API_KEY", _ENV_AIS),
+    "aprs": ("APRS", APRS_CONFIG_FILE, "aprs_api_key", "APRS_API_KEY", _ENV_APRS),
+    "weather": ("weather", WEATHER_CONFIG_FILE, "windy_api_key", "WEATHER_API_KEY", _ENV_WINDY),
+    "webcams": ("webcams", WEBCAMS_CONFIG_FILE, "windy_webcams_api_key", "WEBCAMS_API_KEY", _ENV_WEBCAMS),
+}
 
-def save_ais_config():
-    """Save AIS API keys to config file"""
-    global AIS_API_KEY
+def _load_api_key_config(name):
+    """Set the API key global for a config file and return the file's data ({} if unreadable)"""
+    label, path, json_key, var_name, env_key = _API_KEY_CONFIGS[name]
+    data = {}
+    try:
+        data = cached_json_load(path)
+        logger.info(f"Loaded {label} configuration from file")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error(f"Error loading {label} config: {e}")
+    # Environment variables take precedence over the config file
+    globals()[var_name] = env_key or data.get(json_key, '')
+    return data
+
+def _save_api_key_config(name, extra=None):
+    """Merge the API key global (unless it came from the environment) and extra fields into a config file"""
+    label, path, json_key, var_name, env_key = _API_KEY_CONFIGS[name]
     try:
         # Read existing config if it exists
         config = {}
-        if os.path.exists(AIS_CONFIG_FILE):
-            try:
-                with open(AIS_CONFIG_FILE, "r") as f:
-                    config = json.load(f)
-            except:
-                pass
+        try:
+            config = dict(cached_json_load(path))
+        except Exception:
+            pass
 
         # Update with current API key (only if not from environment)
-        if not os.environ.get('AISSTREAM_API_KEY') and not os.environ.get('AIS_API_KEY'):
-            config['aisstream_api_key'] = AIS_API_KEY
-
-        with open(AIS_CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=2)
-        logger.debug(f"AIS config saved to {AIS_CONFIG_FILE}")
+        if not env_key:
+            config[json_key] = globals()[var_name]
+        if extra:
+            config.update(extra)
+
+        _json_cache.pop(path, None)
+        write_json_file(path, config, indent=2)
+        logger.debug(f"{label} config saved to {path}")
     except Exception as e:
-        logger.error(f"Error saving AIS config: {e}")
+        logger.error(f"Error saving {label} config: {e}")
+
+def load_ais_config():
+    """Load AIS API keys from config file"""
+    _load_api_key_config("ais")
+
+def save_ais_config():
+    """Save AIS API keys to config file"""
+    _save_api_key_config("ais")
 
 # ----------------------
 # APRS Configuration Functions
@@ -3432,65 +3731,27 @@ def save_ais_config():
 def load_aprs_settings():
     """Load APRS detection settings from disk"""
     global APRS_DETECTION_ENABLED
-    if os.path.exists(APRS_SETTINGS_FILE):
-        try:
-            with open(APRS_SETTINGS_FILE, "r") as f:
-                data = json.load(f)
-                APRS_DETECTION_ENABLED = data.get("enabled", True)
-                logger.info(f"Loaded APRS detection setting: {'enabled' if APRS_DETECTION_ENABLED else 'disabled'}")
-        except Exception as e:
-            logger.error(f"Error loading APRS settings: {e}")
-            APRS_DETECTION_ENABLED = True
-
-def save_aprs_settings():
-    """Save APRS detection settings to disk"""
-    global APRS_DETECTION_ENABLED
+    data = get_settings_section("aprs")
+    if data is None:
+        return
     try:
-        with open(APRS_SETTINGS_FILE, "w") as f:
-            json.dump({"enabled": APRS_DETECTION_ENABLED}, f)
-        logger.debug(f"APRS settings saved to {APRS_SETTINGS_FILE}")
+        APRS_DETECTION_ENABLED = data.get("enabled", True)
+        logger.info(f"Loaded APRS detection setting: {'enabled' if APRS_DETECTION_ENABLED else 'disabled'}")
     except Exception as e:
-        logger.error(f"Error saving APRS settings: {e}")
+        logger.error(f"Error loading APRS settings: {e}")
+        APRS_DETECTION_ENABLED = True
+
+def save_aprs_settings():
+    """Save APRS detection settings to disk (debounced)"""
+    set_settings_section("aprs", {"enabled": APRS_DETECTION_ENABLED})
 
 def load_aprs_config():
     """Load APRS API keys and callsigns from config file"""
-    global APRS_API_KEY
-    if os.path.exists(APRS_CONFIG_FILE):
-        try:
-            with open(APRS_CONFIG_FILE, "r") as f:
-                data = json.load(f)
-                # Check environment variables first, then config file
-                APRS_API_KEY = os.environ.get('APRS_API_KEY') or data.get('aprs_api_key', '')
-                logger.info("Loaded APRS configuration from file")
-        except Exception as e:
-            logger.error(f"Error loading APRS config: {e}")
-            APRS_API_KEY = os.environ.get('APRS_API_KEY', '')
-    else:
-        # Try environment variables
-        APRS_API_KEY = os.environ.get('APRS_API_KEY', '')
+    _load_api_key_config("aprs")
 
 def save_aprs_config():
     """Save APRS API keys and callsigns to config file"""
-    global APRS_API_KEY
-    try:
-        # Read existing config if it exists
-        config = {}
-        if os.path.exists(APRS_CONFIG_FILE):
-            try:
-                with open(APRS_CONFIG_FILE, "r") as f:
-                    config = json.load(f)
-            except:
-                pass
-
-        # Update with current API key (only if not from environment)
-        if not os.environ.get('APRS_API_KEY'):
-            config['aprs_api_key'] = APRS_API_KEY
-
-        with open(APRS_CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=2)
-        logger.debug(f"APRS config saved to {APRS_CONFIG_FILE}")
-    except Exception as e:
-        logger.error(f"Error saving APRS config: {e}")
+    _save_api_key_config("aprs")
 
 # ----------------------
 # Weather Configuration Functions
@@ -3498,71 +3759,29 @@ def save_aprs_config():
 def load_weather_settings():
     """Load weather detection settings from disk"""
     global WEATHER_ENABLED
-    if os.path.exists(WEATHER_SETTINGS_FILE):
-        try:
-            with open(WEATHER_SETTINGS_FILE, "r") as f:
-                data = json.load(f)
-                WEATHER_ENABLED = data.get("enabled", True)
-                logger.info(f"Loaded weather setting: {'enabled' if WEATHER_ENABLED else 'disabled'}")
-        except Exception as e:
-            logger.error(f"Error loading weather settings: {e}")
-            WEATHER_ENABLED = True
-
-def save_weather_settings():
-    """Save weather detection settings to disk"""
-    global WEATHER_ENABLED
+    data = get_settings_section("weather")
+    if data is None:
+        return
     try:
-        with open(WEATHER_SETTINGS_FILE, "w") as f:
-            json.dump({"enabled": WEATHER_ENABLED}, f)
-        logger.debug(f"Weather settings saved to {WEATHER_SETTINGS_FILE}")
+        WEATHER_ENABLED = data.get("enabled", True)
+        logger.info(f"Loaded weather setting: {'enabled' if WEATHER_ENABLED else 'disabled'}")
     except Exception as e:
-        logger.error(f"Error saving weather settings: {e}")
+        logger.error(f"Error loading weather settings: {e}")
+        WEATHER_ENABLED = True
+
+def save_weather_settings():
+    """Save weather detection settings to disk (debounced)"""
+    set_settings_section("weather", {"enabled": WEATHER_ENABLED})
 
 def load_weather_config():
     """Load weather API keys and locations from config file"""
-    global WEATHER_API_KEY, WEATHER_LOCATIONS
-    if os.path.exists(WEATHER_CONFIG_FILE):
-        try:
-            with open(WEATHER_CONFIG_FILE, "r") as f:
-                data = json.load(f)
-                # Check environment variables first, then config file
-                WEATHER_API_KEY = os.environ.get('WINDY_API_KEY') or data.get('windy_api_key', '')
-                WEATHER_LOCATIONS = data.get('locations', [])
-                logger.info("Loaded weather configuration from file")
-        except Exception as e:
-            logger.error(f"Error loading weather config: {e}")
-            WEATHER_API_KEY = os.environ.get('WINDY_API_KEY', '')
-            WEATHER_LOCATIONS = []
-    else:
-        # Try environment variables
-        WEATHER_API_KEY = os.environ.get('WINDY_API_KEY', '')
-        WEATHER_LOCATIONS = []
+    global WEATHER_LOCATIONS
+    data = _load_api_key_config("weather")
+    WEATHER_LOCATIONS = list(data.get('locations', []))
 
 def save_weather_config():
     """Save weather API keys and locations to config file"""
-    global WEATHER_API_KEY, WEATHER_LOCATIONS
-    try:
-        # Read existing config if it exists
-        config = {}
-        if os.path.exists(WEATHER_CONFIG_FILE):
-            try:
-                with open(WEATHER_CONFIG_FILE, "r") as f:
-                    config = json.load(f)
-            except:
-                pass
-
-        # Update with current API key (only if not from environment)
-        if not os.environ.get('WINDY_API_KEY'):
-            config['windy_api_key'] = WEATHER_API_KEY
-
-        # Update locations
-        config['locations'] = WEATHER_LOCATIONS
-
-        with open(WEATHER_CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=2)
-        logger.debug(f"Weather config saved to {WEATHER_CONFIG_FILE}")
-    except Exception as e:
-        logger.error(f"Error saving weather config: {e}")
+    _save_api_key_config("weather", {'locations': WEATHER_LOCATIONS})
 
 # ----------------------
 # Webcams Configuration Functions
@@ -3570,65 +3789,27 @@ def save_weather_config():
 def load_webcams_settings():
     """Load webcams detection settings from disk"""
     global WEBCAMS_ENABLED
-    if os.path.exists(WEBCAMS_SETTINGS_FILE):
-        try:
-            with open(WEBCAMS_SETTINGS_FILE, "r") as f:
-                data = json.load(f)
-                WEBCAMS_ENABLED = data.get("enabled", True)
-                logger.info(f"Loaded webcams setting: {'enabled' if WEBCAMS_ENABLED else 'disabled'}")
-        except Exception as e:
-            logger.error(f"Error loading webcams settings: {e}")
-            WEBCAMS_ENABLED = True
-
-def save_webcams_settings():
-    """Save webcams detection settings to disk"""
-    global WEBCAMS_ENABLED
+    data = get_settings_section("webcams")
+    if data is None:
+        return
     try:
-        with open(WEBCAMS_SETTINGS_FILE, "w") as f:
-            json.dump({"enabled": WEBCAMS_ENABLED}, f)
-        logger.debug(f"Webcams settings saved to {WEBCAMS_SETTINGS_FILE}")
+        WEBCAMS_ENABLED = data.get("enabled", True)
+        logger.info(f"Loaded webcams setting: {'enabled' if WEBCAMS_ENABLED else 'disabled'}")
     except Exception as e:
-        logger.error(f"Error saving webcams settings: {e}")
+        logger.error(f"Error loading webcams settings: {e}")
+        WEBCAMS_ENABLED = True
+
+def save_webcams_settings():
+    """Save webcams detection settings to disk (debounced)"""
+    set_settings_section("webcams", {"enabled": WEBCAMS_ENABLED})
 
 def load_webcams_config():
     """Load webcams API keys from config file"""
-    global WEBCAMS_API_KEY
-    if os.path.exists(WEBCAMS_CONFIG_FILE):
-        try:
-            with open(WEBCAMS_CONFIG_FILE, "r") as f:
-                data = json.load(f)
-                # Check environment variables first, then config file
-                WEBCAMS_API_KEY = os.environ.get('WINDY_WEBCAMS_API_KEY') or data.get('windy_webcams_api_key', '')
-                logger.info("Loaded webcams configuration from file")
-        except Exception as e:
-            logger.error(f"Error loading webcams config: {e}")
-            WEBCAMS_API_KEY = os.environ.get('WINDY_WEBCAMS_API_KEY', '')
-    else:
-        # Try environment variables
-        WEBCAMS_API_KEY = os.environ.get('WINDY_WEBCAMS_API_KEY', '')
+    _load_api_key_config("webcams")
 
 def save_webcams_config():
     """Save webcams API keys to config file"""
-    global WEBCAMS_API_KEY
-    try:
-        # Read existing config if it exists
-        config = {}
-        if os.path.exists(WEBCAMS_CONFIG_FILE):
-            try:
-                with open(WEBCAMS_CONFIG_FILE, "r") as f:
-                    config = json.load(f)
-            except:
-                pass
-
-        # Update with current API key (only if not from environment)
-        if not os.environ.get('WINDY_WEBCAMS_API_KEY'):
-            config['windy_webcams_api_key'] = WEBCAMS_API_KEY
-
-        with open(WEBCAMS_CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=2)
-        logger.debug(f"Webcams config saved to {WEBCAMS_CONFIG_FILE}")
-    except Exception as e:
-        logger.error(f"Error saving webcams config: {e}")
+    _save_api_key_config("webcams")
 
 # ----------------------
 # Webhook URL Persistence (must be early in file)
@@ -3639,8 +3820,8 @@ def save_webhook_url():
     """Save the current webhook URL to disk"""
     global WEBHOOK_URL
     try:
-        with open(WEBHOOK_URL_FILE, "w") as f:
-            json.dump({"webhook_url": WEBHOOK_URL}, f)
+        _json_cache.pop(WEBHOOK_URL_FILE, None)
+        write_json_file(WEBHOOK_URL_FILE, {"webhook_url": WEBHOOK_URL})
         logger.debug(f"Webhook URL saved to {WEBHOOK_URL_FILE}")
     except Exception as e:
         logger.error(f"Error saving webhook URL: {e}")
@@ -3648,27 +3829,79 @@ def save_webhook_url():
 def load_webhook_url():
     """Load the webhook URL from disk on startup"""
     global WEBHOOK_URL
-    if os.path.exists(WEBHOOK_URL_FILE):
-        try:
-            with open(WEBHOOK_URL_FILE, "r") as f:
-                data = json.load(f)
-                WEBHOOK_URL = data.get("webhook_url", None)
-                if WEBHOOK_URL:
-                    logger.info(f"Loaded saved webhook URL: {WEBHOOK_URL}")
-                else:
-                    logger.info("No webhook URL found in saved file")
-        except Exception as e:
-            logger.error(f"Error loading webhook URL: {e}")
-            WEBHOOK_URL = None
-    else:
+    try:
+        data = cached_json_load(WEBHOOK_URL_FILE)
+        WEBHOOK_URL = data.get("webhook_url", None)
+        if WEBHOOK_URL:
+            logger.info(f"Loaded saved webhook URL: {WEBHOOK_URL}")
+        else:
+            logger.info("No webhook URL found in saved file")
+    except FileNotFoundError:
         logger.info("No saved webhook URL file found")
         WEBHOOK_URL = None
+    except Exception as e:
+        logger.error(f"Error loading webhook URL: {e}")
+        WEBHOOK_URL = None
+    _refresh_webhook_enabled()
 
 # ----------------------
 # Global Variables & Files
 # ----------------------
 tracked_pairs = {}
 detection_history = deque(maxlen=MAX_DETECTION_HISTORY)  # Limit size to prevent memory growth
+# The same entries split into one deque per MAC, kept in step with appends and
+# evictions: the distinct-MAC set and each MAC's contiguous run of detections
+# are available without scanning or sorting the whole history
+detection_history_by_mac = {}
+# The same MACs in sorted order, maintained with bisect so KML generation
+# never has to re-sort them
+detection_history_macs_sorted = []
+# MACs whose history changed since the session KML last rendered them
+_kml_dirty_macs = set()
+_detection_history_lock = threading.Lock()
+
+def append_detection_history(detection):
+    """Append to detection_history, keeping detection_history_by_mac in step
+
+    Entries stay full detection dict snapshots (callers pass a copy, since the
+    live dict in tracked_pairs keeps changing): /api/detections_history serves
+    each one as its 'details', so they can't be cut down to the KML fields.
+    """
+    with _detection_history_lock:
+        if len(detection_history) == detection_history.maxlen:
+            evicted_mac = detection_history[0].get('mac')
+            if evicted_mac:
+                # The oldest entry overall is also the oldest of its MAC
+                evicted_run = detection_history_by_mac[evicted_mac]
+                evicted_run.popleft()
+                _kml_dirty_macs.add(evicted_mac)
+                if not evicted_run:
+                    del detection_history_by_mac[evicted_mac]
+                    index = bisect.bisect_left(detection_history_macs_sorted, evicted_mac)
+                    if index < len(detection_history_macs_sorted) and detection_history_macs_sorted[index] == evicted_mac:
+                        del detection_history_macs_sorted[index]
+        detection_history.append(detection)
+        mac = detection.get('mac')
+        if mac:
+            run = detection_history_by_mac.get(mac)
+            if run is None:
+                run = detection_history_by_mac[mac] = deque()
+                bisect.insort(detection_history_macs_sorted, mac)
+            run.append(detection)
+            _kml_dirty_macs.add(mac)
+
+def detection_history_snapshot():
+    """List copy of detection_history; iterating the deque itself while a serial
+    thread appends raises RuntimeError"""
+    with _detection_history_lock:
+        return list(detection_history)
+
+def clear_detection_history():
+    with _detection_history_lock:
+        detection_history.clear()
+        detection_history_by_mac.clear()
+        detection_history_macs_sorted.clear()
+        _kml_dirty_macs.clear()
 
 # Changed: Instead of one selected port, we allow up to three.
 SELECTED_PORTS = {}  # key will be 'port1', 'port2', 'port3'
@@ -3691,47 +3924,120 @@ FAA_LOG_FILENAME = os.path.join(BASE_DIR, "faa_log.csv")  # FAA log CSV remains
 
 # Cumulative KML file for all detections
 CUMULATIVE_KML_FILENAME = os.path.join(BASE_DIR, "cumulative.kml")
-# Initialize cumulative KML on first run
-if not os.path.exists(CUMULATIVE_KML_FILENAME):
-    with open(CUMULATIVE_KML_FILENAME, "w") as f:
+# Initialize cumulative KML on first run (exclusive create: no stat-then-open race)
+try:
+    with open(CUMULATIVE_KML_FILENAME, "x") as f:
         f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
         f.write('<kml xmlns="http://www.opengis.net/kml/2.2" xmlns:gx="http://www.google.com/kml/ext/2.2">\n')
         f.write('<Document>\n')
         f.write(f'<name>Cumulative Detections</name>\n')
         f.write('</Document>\n</kml>')
+except FileExistsError:
+    pass
+
+DETECTION_CSV_FIELDS = [
+    'timestamp', 'alias', 'mac', 'rssi', 'drone_lat', 'drone_long',
+    'drone_altitude', 'pilot_lat', 'pilot_long', 'basic_id', 'faa_data'
+]
 
 # Write CSV header for detections.
 with open(CSV_FILENAME, mode='w', newline='') as csvfile:
-    fieldnames = [
-        'timestamp', 'alias', 'mac', 'rssi', 'drone_lat', 'drone_long',
-        'drone_altitude', 'pilot_lat', 'pilot_long', 'basic_id', 'faa_data'
-    ]
-    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+    writer = csv.DictWriter(csvfile, fieldnames=DETECTION_CSV_FIELDS)
     writer.writeheader()
 
 # Cumulative CSV file for all detections
 CUMULATIVE_CSV_FILENAME = os.path.join(BASE_DIR, f"cumulative_detections.csv")
 # Initialize cumulative CSV on first run
-if not os.path.exists(CUMULATIVE_CSV_FILENAME):
-    with open(CUMULATIVE_CSV_FILENAME, mode='w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=[
-            'timestamp', 'alias', 'mac', 'rssi', 'drone_lat', 'drone_long',
-            'drone_altitude', 'pilot_lat', 'pilot_long', 'basic_id', 'faa_data'
-        ])
+try:
+    with open(CUMULATIVE_CSV_FILENAME, mode='x', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=DETECTION_CSV_FIELDS)
         writer.writeheader()
+except FileExistsError:
+    pass
+
+# ----------------------
+# Buffered Detection CSV Logging
+# ----------------------
+# The session and cumulative CSVs are kept open with a large userspace buffer
+# instead of being reopened for every detection row. Each row is CSV-encoded
+# once with a positional csv.writer and the same line written to both files.
+# Buffers are flushed a couple of seconds after the first unflushed row,
+# before anything reads the files back (KML generation, log emits, downloads)
+# and at shutdown.
+DETECTION_LOG_BUFFER_SIZE = 64 * 1024
+DETECTION_LOG_FLUSH_INTERVAL = 2.0  # seconds
+_detection_log_lock = threading.Lock()
+_detection_logs = {}  # path -> file object
+_detection_log_line = io.StringIO()
+_detection_log_encoder = csv.writer(_detection_log_line)
+_detection_log_flush_timer = None
+
+def _detection_log_file(path):
+    fp = _detection_logs.get(path)
+    if fp is None:
+        fp = _detection_logs[path] = open(path, mode='a', newline='', buffering=DETECTION_LOG_BUFFER_SIZE)
+    return fp
+
+def _encode_log_row(row):
+    """CSV-encode one row; caller holds _detection_log_lock"""
+    _detection_log_line.seek(0)
+    _detection_log_line.truncate()
+    _detection_log_encoder.writerow(row)
+    return _detection_log_line.getvalue()
+
+def _schedule_log_flush():
+    """Arm the one-shot flush timer; caller holds _detection_log_lock"""
+    global _detection_log_flush_timer
+    if _detection_log_flush_timer is None:
+        timer = threading.Timer(DETECTION_LOG_FLUSH_INTERVAL, flush_detection_logs)
+        timer.daemon = True
+        _detection_log_flush_timer = timer
+        timer.start()
+
+def log_detection_row(row):
+    """Append a detection row (values in DETECTION_CSV_FIELDS order) to the
+    session and cumulative CSVs (buffered)"""
+    with _detection_log_lock:
+        line = _encode_log_row(row)
+        _detection_log_file(CSV_FILENAME).write(line)
+        _detection_log_file(CUMULATIVE_CSV_FILENAME).write(line)
+        _schedule_log_flush()
+
+def log_faa_row(row):
+    """Append a (timestamp, mac, remote_id, faa_response) row to the FAA log
+    CSV (buffered, flushed with the detection logs)"""
+    with _detection_log_lock:
+        _detection_log_file(FAA_LOG_FILENAME).write(_encode_log_row(row))
+        _schedule_log_flush()
+
+def flush_detection_logs():
+    """Write buffered detection rows through to disk"""
+    global _detection_log_flush_timer
+    with _detection_log_lock:
+        if _detection_log_flush_timer is not None:
+            _detection_log_flush_timer.cancel()
+            _detection_log_flush_timer = None
+        for path, fp in _detection_logs.items():
+            try:
+                fp.flush()
+            except Exception as e:
+                logger.error(f"Error flushing detection log {path}: {e}")
 
 # Create FAA log CSV with header if not exists.
-if not os.path.exists(FAA_LOG_FILENAME):
-    with open(FAA_LOG_FILENAME, mode='w', newline='') as csvfile:
+try:
+    with open(FAA_LOG_FILENAME, mode='x', newline='') as csvfile:
         fieldnames = ['timestamp', 'mac', 'remote_id', 'faa_response']
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()
+except FileExistsError:
+    pass
 
 # --- Alias Persistence ---
 ALIASES_FILE = os.path.join(BASE_DIR, "aliases.json")
 PORTS_FILE = os.path.join(BASE_DIR, "selected_ports.json")
 ZONES_FILE = os.path.join(BASE_DIR, "zones.json")
-INCIDENT_LOG_FILE = os.path.join(BASE_DIR, "incident_log.json")
+INCIDENT_LOG_FILE = os.path.join(BASE_DIR, "incident_log.jsonl")  # One JSON incident per line
+LEGACY_INCIDENT_LOG_FILE = os.path.join(BASE_DIR, "incident_log.json")  # Pre-JSONL array format
 ALIASES = {}
 if os.path.exists(ALIASES_FILE):
     try:
@@ -3741,48 +4047,84 @@ if os.path.exists(ALIASES_FILE):
         print("Error loading aliases:", e)
 
 def save_aliases():
-    global ALIASES
-    try:
-        with open(ALIASES_FILE, "w") as f:
-            json.dump(ALIASES, f)
-    except Exception as e:
-        print("Error saving aliases:", e)
+    """Save aliases to disk (debounced)"""
+    _debounced_save(ALIASES_FILE, ALIASES)
 
 # --- Port Persistence ---
 def save_selected_ports():
     global SELECTED_PORTS
     try:
-        with open(PORTS_FILE, "w") as f:
-            json.dump(SELECTED_PORTS, f)
+        _json_cache.pop(PORTS_FILE, None)
+        write_json_file(PORTS_FILE, SELECTED_PORTS)
     except Exception as e:
         print("Error saving selected ports:", e)
 
 def load_selected_ports():
     global SELECTED_PORTS
-    if os.path.exists(PORTS_FILE):
-        try:
-            with open(PORTS_FILE, "r") as f:
-                SELECTED_PORTS = json.load(f)
-        except Exception as e:
-            print("Error loading selected ports:", e)
+    try:
+        # Copy: SELECTED_PORTS is mutated in place by the port selection routes
+        SELECTED_PORTS = dict(cached_json_load(PORTS_FILE))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print("Error loading selected ports:", e)
 
 # ----------------------
 # Geofencing & Zones
 # ----------------------
 ZONES = []
-drone_zones = {}  # mac -> set of zone IDs currently in
+drone_zones = {}  # mac -> set of zone IDs currently in (only drones inside at least one zone)
+_NO_ZONES = frozenset()
+
+ZONES_STREAM_THRESHOLD = 8 * 1024 * 1024  # bytes; larger zones.json files are streamed when ijson is installed
 
 def load_zones():
+    """Load zones from disk, dropping expired NOTAM zones in the same pass"""
     global ZONES
-    if os.path.exists(ZONES_FILE):
-        try:
-            with open(ZONES_FILE, "r") as f:
-                ZONES = json.load(f)
-            # Filter out expired NOTAM zones
-            filter_expired_notam_zones()
-        except Exception as e:
-            logger.warning(f"Error loading zones: {e}")
-            ZONES = []
+    current_time = datetime.now()
+    removed_count = 0
+    zones = []
+    try:
+        if ijson is not None and os.path.getsize(ZONES_FILE) > ZONES_STREAM_THRESHOLD:
+            # Stream zone objects so the raw file text is never held in memory
+            with open(ZONES_FILE, "rb") as f:
+                loaded = ijson.items(f, "item", use_float=True)
+                for zone in loaded:
+                    if is_notam_expired(zone, current_time):
+                        removed_count += 1
+                    else:
+                        zones.append(zone)
+        else:
+            for zone in read_json_file(ZONES_FILE):
+                if is_notam_expired(zone, current_time):
+                    removed_count += 1
+                else:
+                    zones.append(zone)
+    except FileNotFoundError:
+        return
+    except Exception as e:
+        logger.warning(f"Error loading zones: {e}")
+        ZONES = []
+        return
+
+    ZONES = zones
+    if removed_count > 0:
+        logger.info(f"Removed {removed_count} expired NOTAM zones")
+        save_zones()
+
+def replace_source_zones(source, new_zones):
+    """Replace every zone from `source` ('openair', 'notam') with new_zones
+
+    The new list is built aside and ZONES is rebound in one assignment, so
+    detection threads iterating the old list in check_zone_events keep a
+    consistent view instead of skipping or revisiting zones mid-update, and
+    never see the window where the old source is gone but the new one is
+    not yet added.
+    """
+    global ZONES
+    zones = [zone for zone in ZONES if zone.get('source') != source]
+    zones.extend(new_zones)
+    ZONES = zones
 
 def filter_expired_notam_zones():
     """Remove expired NOTAM zones from the zones list"""
@@ -3797,54 +4139,96 @@ def filter_expired_notam_zones():
         logger.info(f"Removed {removed_count} expired NOTAM zones")
         save_zones()
 
+@lru_cache(maxsize=4096)
+def _parse_zone_end_date(end_date_str):
+    """Parse a zone's ISO end_date once; the same strings recur on every sweep"""
+    try:
+        # Handle different date formats
+        if 'Z' in end_date_str or '+' in end_date_str:
+            return datetime.fromisoformat(end_date_str.replace('Z', '+00:00'))
+        return datetime.fromisoformat(end_date_str)
+    except Exception as e:
+        logger.debug(f"Error parsing NOTAM end date '{end_date_str}': {e}")
+        return None
+
 def is_notam_expired(zone, current_time=None):
     """Check if a NOTAM zone has expired"""
     if zone.get('source') != 'notam':
         return False  # Not a NOTAM zone
 
-    if current_time is None:
-        current_time = datetime.now()
-
     end_date_str = zone.get('end_date')
     if not end_date_str:
         return False  # No end date, assume still active
 
-    try:
-        # Handle different date formats
-        if 'Z' in end_date_str or '+' in end_date_str:
-            end_date = datetime.fromisoformat(end_date_str.replace('Z', '+00:00'))
-        else:
-            end_date = datetime.fromisoformat(end_date_str)
+    end_date = _parse_zone_end_date(end_date_str)
+    if end_date is None:
+        return False  # Unparseable, assume still active
+
+    if current_time is None:
+        current_time = datetime.now()
 
+    try:
         return end_date < current_time
     except Exception as e:
         logger.debug(f"Error checking NOTAM expiration for zone {zone.get('id')}: {e}")
         return False  # On error, assume still active
 
 def save_zones():
-    global ZONES
-    try:
-        with open(ZONES_FILE, "w") as f:
-            json.dump(ZONES, f, indent=2)
-    except Exception as e:
-        logger.error(f"Error saving zones: {e}")
+    """Save zones to disk (debounced; imports and zone edits arrive in bursts)"""
+    _debounced_save(ZONES_FILE, ZONES, indent=2)
+
+# Per-polygon geometry, keyed by id() of the zone's coordinates list.
+# Zone edits always replace the list (JSON payloads, re-imports), so a new
+# list gets a fresh entry; the stored reference guards against id() reuse.
+_zone_geometry_cache = {}  # id(polygon) -> (polygon, bbox, edges)
+
+def _zone_geometry(polygon):
+    """Return the cached (bbox, edges) for a [lat, lon] polygon
+
+    bbox is (min_lat, max_lat, min_lon, max_lon). edges holds one
+    (lat_i, lat_j, lon_i, slope) tuple per non-horizontal edge, with slope
+    being d(lon)/d(lat); horizontal edges can never straddle a latitude, so
+    the ray cast never needs them. Tuples of ready-made floats are kept
+    rather than a packed array('d'), whose unpacking allocates four new
+    floats per edge on every ray cast.
+    """
+    entry = _zone_geometry_cache.get(id(polygon))
+    if entry is not None and entry[0] is polygon:
+        return entry[1], entry[2]
+    lats = [p[0] for p in polygon]
+    lons = [p[1] for p in polygon]
+    bbox = (min(lats), max(lats), min(lons), max(lons))
+    edges = []
+    lat_j, lon_j = polygon[-1]
+    for lat_i, lon_i in polygon:
+        if lat_i != lat_j:
+            edges.append((lat_i, lat_j, lon_i, (lon_j - lon_i) / (lat_j - lat_i)))
+        lat_j, lon_j = lat_i, lon_i
+    edges = tuple(edges)
+    if len(_zone_geometry_cache) > 2 * len(ZONES) + 64:
+        _zone_geometry_cache.clear()  # Drop entries for zones that no longer exist
+    _zone_geometry_cache[id(polygon)] = (polygon, bbox, edges)
+    return bbox, edges
+
+def zone_bbox(polygon):
+    """Return (min_lat, max_lat, min_lon, max_lon) for a [lat, lon] polygon, cached"""
+    return _zone_geometry(polygon)[0]
 
 def point_in_polygon(lat, lon, polygon):
-    """Check if a point is inside a polygon using ray casting algorithm"""
+    """Check if a point is inside a polygon using ray casting algorithm
+
+    polygon is a list of [lat, lon] vertices (the format used by every zone
+    source). A ray is cast along +lon from the point and edge crossings are
+    counted, using the per-polygon edge table from _zone_geometry.
+    """
     if not polygon or len(polygon) < 3:
         return False
 
-    n = len(polygon)
     inside = False
-    j = n - 1
-
-    for i in range(n):
-        xi, yi = polygon[i]
-        xj, yj = polygon[j]
-
-        if ((yi > lat) != (yj > lat)) and (lon < (xj - xi) * (lat - yi) / (yj - yi) + xi):
+    for lat_i, lat_j, lon_i, slope in _zone_geometry(polygon)[1]:
+        # Edge straddles the point's latitude
+        if (lat_i > lat) != (lat_j > lat) and lon < slope * (lat - lat_i) + lon_i:
             inside = not inside
-        j = i
 
     return inside
 
@@ -3862,17 +4246,26 @@ def check_zone_events(detection):
     current_zones = set()
     drone_altitude = detection.get("drone_altitude", 0)
 
+    # Local bindings for the per-zone loop, which runs for every detection
+    bbox_of = zone_bbox
+    inside_polygon = point_in_polygon
+
     # Check which zones the drone is currently in
     for zone in ZONES:
         if not zone.get("enabled", True):
             continue
 
-        polygon = zone.get("coordinates", [])
+        polygon = zone.get("coordinates")
         if not polygon or len(polygon) < 3:
             continue
 
+        # Cheap bounding-box reject before the full polygon test
+        min_lat, max_lat, min_lon, max_lon = bbox_of(polygon)
+        if not (min_lat <= drone_lat <= max_lat and min_lon <= drone_long <= max_lon):
+            continue
+
         # Check if drone is within polygon
-        if not point_in_polygon(drone_lat, drone_long, polygon):
+        if not inside_polygon(drone_lat, drone_long, polygon):
             continue
 
         # Check altitude restrictions if zone has them
@@ -3890,8 +4283,11 @@ def check_zone_events(detection):
 
         current_zones.add(zone.get("id"))
 
-    # Get previous zones for this drone
-    previous_zones = drone_zones.get(mac, set())
+    # Get previous zones for this drone; nothing to do if membership is unchanged
+    # (the common case for a drone holding position or flying outside all zones)
+    previous_zones = drone_zones.get(mac, _NO_ZONES)
+    if current_zones == previous_zones:
+        return
 
     # Check for zone entries
     entered_zones = current_zones - previous_zones
@@ -3991,14 +4387,17 @@ def check_zone_events(detection):
                     pass
 
     # Update current zones for this drone
-    drone_zones[mac] = current_zones
+    if current_zones:
+        drone_zones[mac] = current_zones
+    else:
+        drone_zones.pop(mac, None)
 
 # ----------------------
 # UK Airspace (OpenAir) Download & Parsing
 # ----------------------
 OPENAIR_URL = "https://asselect.uk/default/openair.txt"
 OPENAIR_FILE = os.path.join(BASE_DIR, "openair.txt")
-OPENAIR_CACHE_FILE = os.path.join(BASE_DIR, "openair_cache.json")
+OPENAIR_CACHE_FILE = os.path.join(BASE_DIR, "openair_cache.json")  # Parsed airspaces, see parse_openair_file
 
 # ----------------------
 # UK NOTAM Download & Parsing
@@ -4006,15 +4405,23 @@ OPENAIR_CACHE_FILE = os.path.join(BASE_DIR, "openair_cache.json")
 NOTAM_URL = "https://raw.githubusercontent.com/Jonty/uk-notam-archive/main/data/PIB.xml"
 NOTAM_FILE = os.path.join(BASE_DIR, "notam.xml")
 
+DOWNLOAD_CHUNK_SIZE = 65536
+
+def _stream_download(url, path):
+    """Stream url to path in binary chunks, replacing path only once the download completes"""
+    tmp_path = f"{path}.tmp"
+    with requests.get(url, timeout=30, stream=True) as response:
+        response.raise_for_status()
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+    os.replace(tmp_path, path)
+
 def download_openair_file():
     """Download the UK airspace OpenAir file"""
     try:
         logger.info(f"Downloading UK airspace data from {OPENAIR_URL}")
-        response = requests.get(OPENAIR_URL, timeout=30)
-        response.raise_for_status()
-
-        with open(OPENAIR_FILE, 'w', encoding='utf-8') as f:
-            f.write(response.text)
+        _stream_download(OPENAIR_URL, OPENAIR_FILE)
 
         logger.info(f"Successfully downloaded OpenAir file to {OPENAIR_FILE}")
         return True
@@ -4022,36 +4429,10 @@ def download_openair_file():
         logger.error(f"Error downloading OpenAir file: {e}")
         return False
 
-def parse_dms_to_decimal(dms_str):
-    """Parse degrees:minutes:seconds format to decimal degrees
-    Format: DD:MM:SS N/S/E/W
-    """
-    try:
-        parts = dms_str.strip().split()
-        if len(parts) < 2:
-            return None
-
-        coord_str = parts[0]
-        direction = parts[1].upper()
-
-        # Split by colon
-        dms_parts = coord_str.split(':')
-        if len(dms_parts) != 3:
-            return None
-
-        degrees = float(dms_parts[0])
-        minutes = float(dms_parts[1])
-        seconds = float(dms_parts[2])
-
-        decimal = degrees + minutes / 60.0 + seconds / 3600.0
-
-        if direction in ('S', 'W'):
-            decimal = -decimal
-
-        return decimal
-    except Exception as e:
-        logger.debug(f"Error parsing DMS '{dms_str}': {e}")
-        return None
+# One OpenAir coordinate pair: "DD:MM:SS N DDD:MM:SS W" (seconds may be fractional)
+_OPENAIR_POINT_RE = re.compile(
+    r'(\d+):(\d+):(\d+(?:\.\d*)?)\s*([NnSs])\s+(\d+):(\d+):(\d+(?:\.\d*)?)\s*([EeWw])'
+)
 
 def parse_altitude(alt_str):
     """Parse altitude string to feet
@@ -4081,149 +4462,219 @@ def parse_altitude(alt_str):
     except:
         return None
 
-def parse_openair_file():
-    """Parse OpenAir format file and extract airspace definitions"""
-    if not os.path.exists(OPENAIR_FILE):
-        logger.warning(f"OpenAir file not found: {OPENAIR_FILE}")
-        return []
+def _openair_parse_point(coord_str):
+    """Parse "DD:MM:SS N DD:MM:SS W" into [lat, lon], or None if malformed"""
+    m = _OPENAIR_POINT_RE.match(coord_str.lstrip())
+    if m is None:
+        return None
+    lat_d, lat_m, lat_s, ns, lon_d, lon_m, lon_s, ew = m.groups()
+    lat = int(lat_d) + int(lat_m) / 60.0 + float(lat_s) / 3600.0
+    lon = int(lon_d) + int(lon_m) / 60.0 + float(lon_s) / 3600.0
+    if ns in 'Ss':
+        lat = -lat
+    if ew in 'Ww':
+        lon = -lon
+    return [lat, lon]
+
+def _openair_finish(state):
+    """Store the airspace being built (if it has any points)"""
+    airspace = state['airspace']
+    if airspace and state['points']:
+        airspace['coordinates'] = state['points']
+        state['airspaces'].append(airspace)
+
+def _openair_ac(state, rest):
+    # Airspace class - starts a new definition
+    _openair_finish(state)
+    state['airspace'] = {
+        'class': rest.strip(),
+        'name': '',
+        'lower_alt': None,
+        'upper_alt': None,
+        'frequency': None,
+        'coordinates': [],
+        'arcs': []
+    }
+    state['points'] = []
+
+def _openair_an(state, rest):
+    state['airspace']['name'] = rest.strip()
+
+def _openair_af(state, rest):
+    state['airspace']['frequency'] = rest.strip()
+
+def _openair_al(state, rest):
+    state['airspace']['lower_alt'] = parse_altitude(rest.strip())
 
-    airspaces = []
-    current_airspace = None
-    current_points = []
-    current_arcs = []
+def _openair_ah(state, rest):
+    state['airspace']['upper_alt'] = parse_altitude(rest.strip())
 
+def _openair_dp(state, rest):
+    # Data point - format: "DD:MM:SS N DD:MM:SS W"
+    point = _openair_parse_point(rest)
+    if point is not None:
+        state['points'].append(point)
+
+def _openair_vx(state, rest):
+    # Circle centre - format: "V X=DD:MM:SS N DD:MM:SS W"
+    if rest.startswith('='):
+        point = _openair_parse_point(rest[1:])
+        if point is not None:
+            state['airspace']['circle_center'] = point
+
+def _openair_dc(state, rest):
+    # Circle radius in nautical miles
     try:
-        with open(OPENAIR_FILE, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-
-                # Skip comments and empty lines
-                if not line or line.startswith('*'):
-                    # End of airspace definition
-                    if line.startswith('*') and current_airspace:
-                        if current_points:
-                            current_airspace['coordinates'] = current_points
-                            airspaces.append(current_airspace)
-                        current_airspace = None
-                        current_points = []
-                        current_arcs = []
-                    continue
+        state['airspace']['circle_radius_nm'] = float(rest.strip())
+    except ValueError:
+        pass
 
-                # Airspace class
-                if line.startswith('AC '):
-                    # Save previous airspace if exists
-                    if current_airspace and current_points:
-                        current_airspace['coordinates'] = current_points
-                        airspaces.append(current_airspace)
-
-                    ac_type = line[3:].strip()
-                    current_airspace = {
-                        'class': ac_type,
-                        'name': '',
-                        'lower_alt': None,
-                        'upper_alt': None,
-                        'frequency': None,
-                        'coordinates': [],
-                        'arcs': []
-                    }
-                    current_points = []
-                    current_arcs = []
-
-                # Airspace name
-                elif line.startswith('AN ') and current_airspace:
-                    current_airspace['name'] = line[3:].strip()
-
-                # Airspace frequency
-                elif line.startswith('AF ') and current_airspace:
-                    current_airspace['frequency'] = line[3:].strip()
-
-                # Lower altitude
-                elif line.startswith('AL ') and current_airspace:
-                    alt_str = line[3:].strip()
-                    current_airspace['lower_alt'] = parse_altitude(alt_str)
-
-                # Upper altitude
-                elif line.startswith('AH ') and current_airspace:
-                    alt_str = line[3:].strip()
-                    current_airspace['upper_alt'] = parse_altitude(alt_str)
-
-                # Data point (coordinate)
-                elif line.startswith('DP ') and current_airspace:
-                    coord_str = line[3:].strip()
-                    # Format: "DD:MM:SS N DD:MM:SS W" or "DD:MM:SS N DD:MM:SS E"
-                    parts = coord_str.split()
-                    if len(parts) >= 4:
-                        lat_str = f"{parts[0]} {parts[1]}"
-                        lon_str = f"{parts[2]} {parts[3]}"
-
-                        lat = parse_dms_to_decimal(lat_str)
-                        lon = parse_dms_to_decimal(lon_str)
-
-                        if lat is not None and lon is not None:
-                            current_points.append([lat, lon])
-
-                # Circle definition (for circular airspaces like glider fields)
-                elif line.startswith('V X=') and current_airspace:
-                    # Center point - format: "V X=DD:MM:SS N DD:MM:SS W"
-                    coord_str = line[4:].strip()  # Skip "V X="
-                    parts = coord_str.split()
-                    if len(parts) >= 4:
-                        lat_str = f"{parts[0]} {parts[1]}"
-                        lon_str = f"{parts[2]} {parts[3]}"
-
-                        lat = parse_dms_to_decimal(lat_str)
-                        lon = parse_dms_to_decimal(lon_str)
-
-                        if lat is not None and lon is not None:
-                            current_airspace['circle_center'] = [lat, lon]
-
-                # Circle radius
-                elif line.startswith('DC ') and current_airspace:
-                    try:
-                        radius_nm = float(line[3:].strip())
-                        current_airspace['circle_radius_nm'] = radius_nm
-                    except:
-                        pass
+def _openair_vd(state, rest):
+    # Arc direction for curved boundaries
+    if rest.startswith('='):
+        state['airspace']['arc_direction'] = rest.strip()
+
+# Record handlers keyed on the first three characters of a line. DB (arc
+# between two points) is intentionally absent: arcs are approximated by the
+# straight lines between the surrounding DP points.
+_OPENAIR_HANDLERS = {
+    'AC ': _openair_ac,
+    'AN ': _openair_an,
+    'AF ': _openair_af,
+    'AL ': _openair_al,
+    'AH ': _openair_ah,
+    'DP ': _openair_dp,
+    'V X': _openair_vx,
+    'DC ': _openair_dc,
+    'V D': _openair_vd,
+}
 
-                # Variable arc (for curved boundaries)
-                elif line.startswith('V D=') and current_airspace:
-                    # Arc direction
-                    direction = line[3:].strip()
-                    current_airspace['arc_direction'] = direction
+# Parsed airspaces are cached in OPENAIR_CACHE_FILE, keyed by a digest of the
+# source bytes, so refreshes that download an unchanged file skip the parse.
+_OPENAIR_PARSER_VERSION = 1  # Bump when parser output changes to invalidate caches
 
-                # Database arc (connects points with arc)
-                elif line.startswith('DB ') and current_airspace:
-                    # Arc between two points - we'll approximate with straight line for now
-                    # Full arc parsing is complex, so we skip the arc and use straight lines
-                    pass
+def _parse_openair_lines(lines):
+    """Run the OpenAir record handlers over an iterable of lines"""
+    state = {'airspaces': [], 'airspace': None, 'points': []}
+    handlers = _OPENAIR_HANDLERS
 
-        # Save last airspace if exists
-        if current_airspace and current_points:
-            current_airspace['coordinates'] = current_points
-            airspaces.append(current_airspace)
+    for line in lines:
+        line = line.strip()
 
-        logger.info(f"Parsed {len(airspaces)} airspace definitions from OpenAir file")
-        return airspaces
+        # Skip empty lines; a comment line ends the current airspace
+        if not line:
+            continue
+        if line[0] == '*':
+            if state['airspace']:
+                _openair_finish(state)
+                state['airspace'] = None
+                state['points'] = []
+            continue
+
+        handler = handlers.get(line[:3])
+        if handler is None:
+            continue
+        if state['airspace'] is None and handler is not _openair_ac:
+            continue  # Record outside any airspace definition
+        handler(state, line[3:])
+
+    # Save last airspace if exists
+    _openair_finish(state)
+    return state['airspaces']
+
+def parse_openair_file():
+    """Parse OpenAir format file and extract airspace definitions"""
+    try:
+        with open(OPENAIR_FILE, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        logger.warning(f"OpenAir file not found: {OPENAIR_FILE}")
+        return []
+    except Exception as e:
+        logger.error(f"Error parsing OpenAir file: {e}")
+        return []
+
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    try:
+        cached = read_json_file(OPENAIR_CACHE_FILE)
+        if cached.get('hash') == digest and cached.get('version') == _OPENAIR_PARSER_VERSION:
+            airspaces = cached['airspaces']
+            logger.info(f"Loaded {len(airspaces)} airspace definitions from parsed OpenAir cache")
+            return airspaces
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable OpenAir cache: {e}")
 
+    try:
+        airspaces = _parse_openair_lines(raw.decode('utf-8', errors='replace').splitlines())
+        logger.info(f"Parsed {len(airspaces)} airspace definitions from OpenAir file")
     except Exception as e:
         logger.error(f"Error parsing OpenAir file: {e}")
         return []
 
+    try:
+        write_json_file(OPENAIR_CACHE_FILE, {
+            'hash': digest,
+            'version': _OPENAIR_PARSER_VERSION,
+            'airspaces': airspaces
+        })
+    except Exception as e:
+        logger.warning(f"Could not write parsed OpenAir cache: {e}")
+    return airspaces
+
+@lru_cache(maxsize=8)
+def _unit_circle(num_points):
+    """(sin, cos) pairs for num_points evenly spaced angles; almost always 32"""
+    return tuple(
+        (math.sin(2 * math.pi * i / num_points), math.cos(2 * math.pi * i / num_points))
+        for i in range(num_points)
+    )
+
+@lru_cache(maxsize=1024)
+def _cos_lat(lat_key):
+    """cos() of a latitude rounded to 0.1 degree; UK zones cluster in a few keys"""
+    return math.cos(math.radians(lat_key))
+
 def generate_circle_polygon(center_lat, center_lon, radius_nm, num_points=32):
     """Generate a polygon approximating a circle"""
     # Convert nautical miles to degrees (approximate)
     # 1 nm ≈ 0.0167 degrees at equator, but varies with latitude
     lat_radius = radius_nm / 60.0  # 1 degree latitude ≈ 60 nm
-    lon_radius = radius_nm / (60.0 * math.cos(math.radians(center_lat)))
+    lon_radius = radius_nm / (60.0 * _cos_lat(round(center_lat, 1)))
+
+    return [[center_lat + lat_radius * sin_a, center_lon + lon_radius * cos_a]
+            for sin_a, cos_a in _unit_circle(num_points)]
 
-    points = []
-    for i in range(num_points):
-        angle = 2 * math.pi * i / num_points
-        lat = center_lat + lat_radius * math.sin(angle)
-        lon = center_lon + lon_radius * math.cos(angle)
-        points.append([lat, lon])
+@lru_cache(maxsize=8192)
+def _shared_circle_polygon(center_lat, center_lon, radius_nm, num_points=32):
+    """Memoised generate_circle_polygon; identical circles share one list"""
+    return generate_circle_polygon(center_lat, center_lon, radius_nm, num_points)
 
-    return points
+def generate_circle_polygons(circles, num_points=32):
+    """Generate polygons for a batch of (center_lat, center_lon, radius_nm) circles
+
+    Identical circles (NOTAMs often repeat the same centre and radius, and
+    every refresh re-creates the same zones) share one polygon list. Zone
+    coordinates are only ever replaced, never edited in place, so sharing
+    is safe.
+    """
+    return [_shared_circle_polygon(center_lat, center_lon, radius_nm, num_points)
+            for center_lat, center_lon, radius_nm in circles]
+
+# Airspace classes relevant to drones
+# FRZ = Flight Restriction Zone (critical)
+# CTA = Control Area (warning)
+# TMZ = Transponder Mandatory Zone (warning)
+# A = Class A airspace (critical)
+# G = Glider airfields (warning)
+# P = Prohibited areas (critical)
+# RMZ = Radio Mandatory Zone (warning)
+DRONE_RELEVANT_CLASSES = frozenset({'FRZ', 'CTA', 'TMZ', 'A', 'G', 'P', 'RMZ', 'D'})
+CRITICAL_AIRSPACE_CLASSES = frozenset({'FRZ', 'A', 'P'})
+
+# NOTAM descriptions containing any of these are treated as critical zones
+NOTAM_CRITICAL_RE = re.compile(r'PROHIBITED|RESTRICTED|DANGER|HAZARD|SECURITY|MILITARY')
 
 def convert_airspaces_to_zones(airspaces, max_altitude_ft=400):
     """Convert airspace definitions to zones, filtering for drone-relevant airspaces
@@ -4232,22 +4683,11 @@ def convert_airspaces_to_zones(airspaces, max_altitude_ft=400):
     zones = []
     zone_id_counter = 1
 
-    # Airspace classes relevant to drones
-    # FRZ = Flight Restriction Zone (critical)
-    # CTA = Control Area (warning)
-    # TMZ = Transponder Mandatory Zone (warning)
-    # A = Class A airspace (critical)
-    # G = Glider airfields (warning)
-    # P = Prohibited areas (critical)
-    # RMZ = Radio Mandatory Zone (warning)
-
-    drone_relevant_classes = ['FRZ', 'CTA', 'TMZ', 'A', 'G', 'P', 'RMZ', 'D']
-
     for airspace in airspaces:
         ac_class = airspace.get('class', '').strip()
 
         # Only process drone-relevant airspace classes
-        if ac_class not in drone_relevant_classes:
+        if ac_class not in DRONE_RELEVANT_CLASSES:
             continue
 
         # Check if altitude range is relevant for drones
@@ -4259,7 +4699,7 @@ def convert_airspaces_to_zones(airspaces, max_altitude_ft=400):
             continue
 
         # Determine zone type based on airspace class
-        if ac_class in ['FRZ', 'A', 'P']:
+        if ac_class in CRITICAL_AIRSPACE_CLASSES:
             zone_type = 'critical'
         else:
             zone_type = 'warning'
@@ -4271,23 +4711,21 @@ def convert_airspaces_to_zones(airspaces, max_altitude_ft=400):
         if 'circle_center' in airspace and 'circle_radius_nm' in airspace:
             center = airspace['circle_center']
             radius = airspace['circle_radius_nm']
-            coordinates = generate_circle_polygon(center[0], center[1], radius)
+            coordinates = _shared_circle_polygon(center[0], center[1], radius)
         elif airspace.get('coordinates'):
             coordinates = airspace['coordinates']
 
         if not coordinates or len(coordinates) < 3:
             continue
 
-        # Create zone name
-        name = airspace.get('name', f"{ac_class} Airspace")
-        if upper_alt or lower_alt:
-            alt_info = []
-            if lower_alt:
-                alt_info.append(f"{lower_alt}ft")
-            if upper_alt:
-                alt_info.append(f"FL{int(upper_alt/100)}" if upper_alt >= 10000 else f"{upper_alt}ft")
-            if alt_info:
-                name += f" ({'-'.join(alt_info)})"
+        # Create zone name, e.g. "Name (500ft-FL105)", built in one step
+        alt_info = []
+        if lower_alt:
+            alt_info.append(f"{lower_alt}ft")
+        if upper_alt:
+            alt_info.append(f"FL{int(upper_alt/100)}" if upper_alt >= 10000 else f"{upper_alt}ft")
+        alt_suffix = f" ({'-'.join(alt_info)})" if alt_info else ""
+        name = f"{airspace.get('name', f'{ac_class} Airspace')}{alt_suffix}"
 
         # Create zone
         zone = {
@@ -4333,10 +4771,8 @@ def update_zones_from_openair(max_altitude_ft=400, merge_with_existing=True):
 
     # Merge with existing zones or replace
     if merge_with_existing:
-        # Remove old OpenAir zones
-        ZONES = [z for z in ZONES if z.get('source') != 'openair']
-        # Add new OpenAir zones
-        ZONES.extend(openair_zones)
+        # Replace old OpenAir zones with the new ones
+        replace_source_zones('openair', openair_zones)
         logger.info(f"Merged {len(openair_zones)} OpenAir zones with existing zones")
     else:
         ZONES = openair_zones
@@ -4350,10 +4786,7 @@ def update_zones_from_openair(max_altitude_ft=400, merge_with_existing=True):
         mqtt_publisher.publish_airspace_zones(ZONES)
 
     # Emit zones update to connected clients
-    try:
-        socketio.emit('zones_updated', {"zones": ZONES, "count": len(ZONES)})
-    except:
-        pass
+    emit_zones()
 
     return True
 
@@ -4361,11 +4794,7 @@ def download_notam_file():
     """Download the UK NOTAM PIB.xml file"""
     try:
         logger.info(f"Downloading UK NOTAM data from {NOTAM_URL}")
-        response = requests.get(NOTAM_URL, timeout=30)
-        response.raise_for_status()
-
-        with open(NOTAM_FILE, 'w', encoding='utf-8') as f:
-            f.write(response.text)
+        _stream_download(NOTAM_URL, NOTAM_FILE)
 
         logger.info(f"Successfully downloaded NOTAM file to {NOTAM_FILE}")
         return True
@@ -4373,6 +4802,40 @@ def download_notam_file():
         logger.error(f"Error downloading NOTAM file: {e}")
         return False
 
+# NOTAM coordinate field layouts by digit count: (degree digits, has seconds)
+_NOTAM_LAT_LAYOUTS = {4: (2, False), 5: (3, False), 6: (2, True)}     # DDMM, DDDMM, DDMMSS
+_NOTAM_LON_LAYOUTS = {5: (3, False), 6: (4, False), 7: (3, True), 8: (4, True)}  # DDDMM, DDDDMM, DDDMMSS, DDDDMMSS
+
+def _notam_dms(digits, layouts):
+    """Decode a NOTAM degrees/minutes[/seconds] field, or None if the length is unknown"""
+    layout = layouts.get(len(digits))
+    if layout is None:
+        return None
+    deg_len, has_seconds = layout
+    value = float(digits[:deg_len]) + float(digits[deg_len:deg_len + 2]) / 60.0
+    if has_seconds:
+        value += float(digits[deg_len + 2:]) / 3600.0
+    return value
+
+# Latitude digits + N/S, then longitude digits + E/W; anything trailing is ignored
+_NOTAM_COORD_RE = re.compile(r'(\d{4,6})([NS])(\d{5,8})([EW])')
+
+@lru_cache(maxsize=4096)
+def _decode_notam_coordinates(coord_str):
+    """Decode a normalised (no spaces, upper-case) NOTAM coordinate string; cached
+    because PIB files repeat the same aerodrome coordinates many times."""
+    match = _NOTAM_COORD_RE.match(coord_str)
+    if not match:
+        return None, None
+    lat_digits, lat_dir, lon_digits, lon_dir = match.groups()
+
+    # Latitude: DDMM, DDDMM or DDMMSS; longitude: DDDMM, DDDDMM, DDDMMSS or DDDDMMSS
+    lat = _notam_dms(lat_digits, _NOTAM_LAT_LAYOUTS)
+    lon = _notam_dms(lon_digits, _NOTAM_LON_LAYOUTS)
+    if lat is None or lon is None:
+        return None, None
+    return (-lat if lat_dir == 'S' else lat), (-lon if lon_dir == 'W' else lon)
+
 def parse_notam_coordinates(coord_str, radius_nm=None):
     """Parse NOTAM coordinate string to decimal degrees
     Format: "DDMMN/SDDDMME/W" or "DDMMN/S DDDMME/W"
@@ -4381,80 +4844,8 @@ def parse_notam_coordinates(coord_str, radius_nm=None):
     if not coord_str:
         return None, None
 
-    try:
-        # Remove spaces and convert to uppercase
-        coord_str = coord_str.replace(' ', '').upper()
-
-        # Find N/S and E/W positions
-        lat_end = max(coord_str.find('N'), coord_str.find('S'))
-        if lat_end == -1:
-            return None, None
-
-        lon_start = lat_end + 1
-        lon_end = max(coord_str.find('E', lon_start), coord_str.find('W', lon_start))
-        if lon_end == -1:
-            return None, None
-
-        lat_str = coord_str[:lat_end+1]
-        lon_str = coord_str[lon_start:lon_end+1]
-
-        # Parse latitude (format: DDMMN or DDDMMN)
-        lat_dir = lat_str[-1]
-        lat_deg_min = lat_str[:-1]
-
-        if len(lat_deg_min) == 4:  # DDMM
-            lat_deg = float(lat_deg_min[:2])
-            lat_min = float(lat_deg_min[2:])
-        elif len(lat_deg_min) == 5:  # DDDMM
-            lat_deg = float(lat_deg_min[:3])
-            lat_min = float(lat_deg_min[3:])
-        elif len(lat_deg_min) == 6:  # DDMMSS
-            lat_deg = float(lat_deg_min[:2])
-            lat_min = float(lat_deg_min[2:4])
-            lat_sec = float(lat_deg_min[4:])
-            lat = lat_deg + lat_min / 60.0 + lat_sec / 3600.0
-        else:
-            return None, None
-
-        if len(lat_deg_min) < 6:
-            lat = lat_deg + lat_min / 60.0
-
-        if lat_dir == 'S':
-            lat = -lat
-
-        # Parse longitude (format: DDDMME or DDDDMME)
-        lon_dir = lon_str[-1]
-        lon_deg_min = lon_str[:-1]
-
-        if len(lon_deg_min) == 5:  # DDDMM
-            lon_deg = float(lon_deg_min[:3])
-            lon_min = float(lon_deg_min[3:])
-        elif len(lon_deg_min) == 6:  # DDDDMM
-            lon_deg = float(lon_deg_min[:4])
-            lon_min = float(lon_deg_min[4:])
-        elif len(lon_deg_min) == 7:  # DDDMMSS
-            lon_deg = float(lon_deg_min[:3])
-            lon_min = float(lon_deg_min[3:5])
-            lon_sec = float(lon_deg_min[5:])
-            lon = lon_deg + lon_min / 60.0 + lon_sec / 3600.0
-        elif len(lon_deg_min) == 8:  # DDDDMMSS
-            lon_deg = float(lon_deg_min[:4])
-            lon_min = float(lon_deg_min[4:6])
-            lon_sec = float(lon_deg_min[6:])
-            lon = lon_deg + lon_min / 60.0 + lon_sec / 3600.0
-        else:
-            return None, None
-
-        if len(lon_deg_min) < 7:
-            lon = lon_deg + lon_min / 60.0
-
-        if lon_dir == 'W':
-            lon = -lon
-
-        return lat, lon
-    except Exception as e:
-        logger.debug(f"Error parsing NOTAM coordinate '{coord_str}': {e}")
-        return None, None
+    # Remove spaces and convert to uppercase
+    return _decode_notam_coordinates(coord_str.replace(' ', '').upper())
 
 def parse_notam_date(date_str):
     """Parse NOTAM date string to datetime
@@ -4474,140 +4865,167 @@ def parse_notam_date(date_str):
         logger.debug(f"Error parsing NOTAM date '{date_str}': {e}")
         return None
 
-def parse_notam_file():
-    """Parse UK NOTAM PIB.xml file and extract NOTAMs"""
-    if not os.path.exists(NOTAM_FILE):
-        logger.warning(f"NOTAM file not found: {NOTAM_FILE}")
-        return []
+NOTAM_SECTIONS = ('Aerodrome', 'En-route', 'Warnings')
 
-    notams = []
-    current_time = datetime.now()
+def _parse_notam_element(notam_elem, current_time, now_key):
+    """Extract one <Notam> element into a NOTAM dict (without section), or None to skip it
 
-    try:
-        tree = ET.parse(NOTAM_FILE)
-        root = tree.getroot()
+    now_key is current_time formatted as YYMMDDHHMM, the PIB date format.
+    """
+    # Index the direct children in one pass instead of one find() walk per
+    # field; reversed so the first child with a given tag wins, like find()
+    fields = {child.tag: child for child in reversed(notam_elem)}
+
+    # Most NOTAMs in a PIB are already expired. Fixed-width YYMMDDHHMM strings
+    # order like the dates they encode, so drop those with a string compare
+    # before any coordinate or datetime parsing.
+    end_validity_elem = fields.get('EndValidity')
+    end_text = end_validity_elem.text if end_validity_elem is not None else None
+    if end_text and end_text[:10].isdigit() and end_text[:10] < now_key:
+        return None
 
-        # Find all NOTAM elements (they can be in different sections)
-        # First, try to find all NOTAMs directly
-        all_notam_elements = root.findall('.//Notam')
+    # Extract NOTAM data
+    coordinates_elem = fields.get('Coordinates')
+    radius_elem = fields.get('Radius')
+    start_validity_elem = fields.get('StartValidity')
+    item_elem = fields.get('ItemE')  # Description
+    qline_elem = fields.get('QLine')
 
-        # Also try to find by section
-        section_notams = {}
-        for section_name in ['Aerodrome', 'En-route', 'Warnings']:
-            section_elem = root.find(f'.//{section_name}')
-            if section_elem is not None:
-                notam_list = section_elem.find('NotamList')
-                if notam_list is not None:
-                    section_notams[section_name] = notam_list.findall('Notam')
+    # Check if coordinates exist and have text
+    if coordinates_elem is None:
+        return None
+    coord_text = coordinates_elem.text
+    if not coord_text or coord_text.strip() == '':
+        return None
 
-        # Use section-specific NOTAMs if found, otherwise use all
-        if any(section_notams.values()):
-            notam_elements_by_section = section_notams
-        else:
-            # Fallback: use all NOTAMs and assign to a default section
-            notam_elements_by_section = {'All': all_notam_elements}
+    # Parse coordinates
+    lat, lon = parse_notam_coordinates(
+        coordinates_elem.text,
+        float(radius_elem.text) if radius_elem is not None and radius_elem.text else None
+    )
 
-        # Process NOTAMs by section
-        for section_name, notam_elements in notam_elements_by_section.items():
-            if not notam_elements:
-                continue
+    if lat is None or lon is None:
+        return None
 
-            for notam_elem in notam_elements:
-                try:
-                    # Extract NOTAM data
-                    coordinates_elem = notam_elem.find('Coordinates')
-                    radius_elem = notam_elem.find('Radius')
-                    start_validity_elem = notam_elem.find('StartValidity')
-                    end_validity_elem = notam_elem.find('EndValidity')
-                    item_elem = notam_elem.find('ItemE')  # Description
-                    qline_elem = notam_elem.find('QLine')
-
-                    # Check if coordinates exist and have text
-                    if coordinates_elem is None:
-                        continue
-                    coord_text = coordinates_elem.text
-                    if not coord_text or coord_text.strip() == '':
-                        continue
+    # Parse validity dates
+    start_date = None
+    end_date = None
+    if start_validity_elem is not None and start_validity_elem.text:
+        start_date = parse_notam_date(start_validity_elem.text)
+    if end_validity_elem is not None and end_validity_elem.text:
+        end_date = parse_notam_date(end_validity_elem.text)
 
-                    # Parse coordinates
-                    lat, lon = parse_notam_coordinates(
-                        coordinates_elem.text,
-                        float(radius_elem.text) if radius_elem is not None and radius_elem.text else None
-                    )
+    # Skip if NOTAM is expired
+    if end_date and end_date < current_time:
+        return None
 
-                    if lat is None or lon is None:
-                        continue
+    # Get description (keep full length for popup, truncate only for storage)
+    description = ""
+    if item_elem is not None and item_elem.text:
+        description = item_elem.text.strip()  # Keep full description
+
+    # Get NOTAM identifier
+    series_elem = fields.get('Series')
+    number_elem = fields.get('Number')
+    year_elem = fields.get('Year')
+    notam_id = ""
+    if series_elem is not None and number_elem is not None and year_elem is not None:
+        notam_id = f"{series_elem.text}{number_elem.text}/{year_elem.text}"
+
+    # Get radius
+    radius_nm = None
+    if radius_elem is not None and radius_elem.text:
+        try:
+            radius_nm = float(radius_elem.text)
+        except:
+            pass
+
+    # Get altitude limits
+    lower_alt = None
+    upper_alt = None
+    if qline_elem is not None:
+        lower_elem = qline_elem.find('Lower')
+        upper_elem = qline_elem.find('Upper')
+        if lower_elem is not None and lower_elem.text:
+            try:
+                lower_alt = int(lower_elem.text) * 100  # Convert FL to feet
+            except:
+                pass
+        if upper_elem is not None and upper_elem.text:
+            try:
+                upper_alt = int(upper_elem.text) * 100  # Convert FL to feet
+            except:
+                pass
 
-                    # Parse validity dates
-                    start_date = None
-                    end_date = None
-                    if start_validity_elem is not None and start_validity_elem.text:
-                        start_date = parse_notam_date(start_validity_elem.text)
-                    if end_validity_elem is not None and end_validity_elem.text:
-                        end_date = parse_notam_date(end_validity_elem.text)
+    notam = {
+        'id': notam_id,
+        'coordinates': [lat, lon],
+        'radius_nm': radius_nm,
+        'description': description,
+        'start_date': start_date.isoformat() if start_date else None,
+        'end_date': end_date.isoformat() if end_date else None,
+        'end_date_dt': end_date,  # Parsed form, so zone conversion need not re-parse
+        'lower_altitude_ft': lower_alt,
+        'upper_altitude_ft': upper_alt
+    }
 
-                    # Skip if NOTAM is expired
-                    if end_date and end_date < current_time:
-                        continue
+    return notam
 
-                    # Get description (keep full length for popup, truncate only for storage)
-                    description = ""
-                    if item_elem is not None and item_elem.text:
-                        description = item_elem.text.strip()  # Keep full description
-
-                    # Get NOTAM identifier
-                    series_elem = notam_elem.find('Series')
-                    number_elem = notam_elem.find('Number')
-                    year_elem = notam_elem.find('Year')
-                    notam_id = ""
-                    if series_elem is not None and number_elem is not None and year_elem is not None:
-                        notam_id = f"{series_elem.text}{number_elem.text}/{year_elem.text}"
-
-                    # Get radius
-                    radius_nm = None
-                    if radius_elem is not None and radius_elem.text:
-                        try:
-                            radius_nm = float(radius_elem.text)
-                        except:
-                            pass
-
-                    # Get altitude limits
-                    lower_alt = None
-                    upper_alt = None
-                    if qline_elem is not None:
-                        lower_elem = qline_elem.find('Lower')
-                        upper_elem = qline_elem.find('Upper')
-                        if lower_elem is not None and lower_elem.text:
-                            try:
-                                lower_alt = int(lower_elem.text) * 100  # Convert FL to feet
-                            except:
-                                pass
-                        if upper_elem is not None and upper_elem.text:
-                            try:
-                                upper_alt = int(upper_elem.text) * 100  # Convert FL to feet
-                            except:
-                                pass
+def parse_notam_file():
+    """Parse UK NOTAM PIB.xml file and extract NOTAMs
 
-                    notam = {
-                        'id': notam_id,
-                        'coordinates': [lat, lon],
-                        'radius_nm': radius_nm,
-                        'description': description,
-                        'start_date': start_date.isoformat() if start_date else None,
-                        'end_date': end_date.isoformat() if end_date else None,
-                        'lower_altitude_ft': lower_alt,
-                        'upper_altitude_ft': upper_alt,
-                        'section': section_name
-                    }
+    The file is streamed with iterparse and each <Notam> is cleared once
+    extracted, so the whole PIB DOM is never held in memory. NOTAMs under
+    <Aerodrome|En-route|Warnings>/<NotamList> are tagged with that section;
+    if the file has none, every NOTAM is used with section 'All'. This single
+    pass replaces the old findall('.//Notam') plus per-section find() walks.
+    """
+    current_time = datetime.now()
+    now_key = current_time.strftime('%y%m%d%H%M')
+    by_section = {name: [] for name in NOTAM_SECTIONS}
+    unsectioned = []
+
+    try:
+        path = []  # tags of the currently open elements
+        for event, elem in ET.iterparse(NOTAM_FILE, events=('start', 'end')):
+            if event == 'start':
+                path.append(elem.tag)
+                continue
+            path.pop()
+            if elem.tag != 'Notam':
+                continue
+            try:
+                notam = _parse_notam_element(elem, current_time, now_key)
+            except Exception as e:
+                logger.debug(f"Error parsing NOTAM element: {e}")
+                notam = None
+            if notam is not None:
+                # path now ends with the Notam's parent, e.g. [..., 'Aerodrome', 'NotamList']
+                if len(path) >= 2 and path[-1] == 'NotamList' and path[-2] in by_section:
+                    by_section[path[-2]].append(notam)
+                else:
+                    unsectioned.append(notam)
+            elem.clear()
 
+        # Use section-specific NOTAMs if found, otherwise use all
+        notams = []
+        if any(by_section.values()):
+            for section_name in NOTAM_SECTIONS:
+                for notam in by_section[section_name]:
+                    notam['section'] = section_name
                     notams.append(notam)
-                except Exception as e:
-                    logger.debug(f"Error parsing NOTAM element: {e}")
-                    continue
+        else:
+            # Fallback: use all NOTAMs and assign to a default section
+            for notam in unsectioned:
+                notam['section'] = 'All'
+                notams.append(notam)
 
         logger.info(f"Parsed {len(notams)} active NOTAMs from file")
         return notams
 
+    except FileNotFoundError:
+        logger.warning(f"NOTAM file not found: {NOTAM_FILE}")
+        return []
     except Exception as e:
         logger.error(f"Error parsing NOTAM file: {e}")
         return []
@@ -4617,57 +5035,61 @@ def convert_notams_to_zones(notams, max_altitude_ft=400):
     zones = []
     zone_id_counter = 1
 
+    # First pass: keep drone-relevant NOTAMs and collect their circles so the
+    # polygons can be generated in one batch
+    kept = []
+    circles = []
     for notam in notams:
-        # Check if altitude range is relevant for drones
-        lower_alt = notam.get('lower_altitude_ft')
-        upper_alt = notam.get('upper_altitude_ft')
-
         # Skip if NOTAM is entirely above max drone altitude
+        lower_alt = notam.get('lower_altitude_ft')
         if lower_alt is not None and lower_alt > max_altitude_ft:
             continue
 
         # Get coordinates
         center = notam.get('coordinates')
-        radius_nm = notam.get('radius_nm')
-
         if not center or len(center) < 2:
             continue
 
+        # Circular zone if radius provided, otherwise point
+        radius_nm = notam.get('radius_nm')
+        if radius_nm and radius_nm > 0 and radius_nm < 999:  # 999 often means "all" or "unlimited"
+            circles.append((center[0], center[1], radius_nm))
+        else:
+            # For point NOTAMs or very large radius, create a small circle (1nm)
+            circles.append((center[0], center[1], 1.0))
+        kept.append(notam)
+
+    for notam, coordinates in zip(kept, generate_circle_polygons(circles)):
+        lower_alt = notam.get('lower_altitude_ft')
+        upper_alt = notam.get('upper_altitude_ft')
+        radius_nm = notam.get('radius_nm')
+
         # Determine zone type based on NOTAM section and content
         section = notam.get('section', '')
         description = notam.get('description', '').upper()
 
         # Critical NOTAMs (restrictions, prohibitions, etc.)
-        if any(keyword in description for keyword in ['PROHIBITED', 'RESTRICTED', 'DANGER', 'HAZARD', 'SECURITY', 'MILITARY']):
+        if NOTAM_CRITICAL_RE.search(description):
             zone_type = 'critical'
         else:
             zone_type = 'warning'
 
-        # Create coordinates - circular zone if radius provided, otherwise point
-        coordinates = []
-        if radius_nm and radius_nm > 0 and radius_nm < 999:  # 999 often means "all" or "unlimited"
-            coordinates = generate_circle_polygon(center[0], center[1], radius_nm)
-        else:
-            # For point NOTAMs or very large radius, create a small circle (1nm)
-            coordinates = generate_circle_polygon(center[0], center[1], 1.0)
-
-        if not coordinates or len(coordinates) < 3:
-            continue
-
         # Create zone name
         notam_id = notam.get('id', f'NOTAM-{zone_id_counter}')
-        name = f"NOTAM {notam_id}"
-        if radius_nm and radius_nm < 999:
-            name += f" ({radius_nm}nm)"
+        radius_suffix = f" ({radius_nm}nm)" if radius_nm and radius_nm < 999 else ""
 
         # Add validity info
+        until_suffix = ""
         end_date = notam.get('end_date')
-        if end_date:
+        end_dt = notam.get('end_date_dt')
+        if end_dt is None and end_date:
             try:
                 end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                name += f" until {end_dt.strftime('%Y-%m-%d %H:%M')}"
             except:
                 pass
+        if end_dt is not None:
+            until_suffix = f" until {end_dt.strftime('%Y-%m-%d %H:%M')}"
+        name = f"NOTAM {notam_id}{radius_suffix}{until_suffix}"
 
         # Create zone
         zone = {
@@ -4714,10 +5136,8 @@ def update_zones_from_notam(max_altitude_ft=400, merge_with_existing=True):
 
     # Merge with existing zones or replace
     if merge_with_existing:
-        # Remove old NOTAM zones
-        ZONES = [z for z in ZONES if z.get('source') != 'notam']
-        # Add new NOTAM zones
-        ZONES.extend(notam_zones)
+        # Replace old NOTAM zones with the new ones
+        replace_source_zones('notam', notam_zones)
         logger.info(f"Merged {len(notam_zones)} NOTAM zones with existing zones")
     else:
         ZONES = notam_zones
@@ -4730,51 +5150,89 @@ def update_zones_from_notam(max_altitude_ft=400, merge_with_existing=True):
     if mqtt_publisher.config["enabled"] and mqtt_publisher.config["publish"].get("airspace", False):
         mqtt_publisher.publish_airspace_zones(ZONES)
 
-    # Emit zones update to connected clients
-    try:
-        socketio.emit('zones_updated', {"zones": ZONES, "count": len(ZONES)})
-    except:
-        pass
-
+    # Emit zones update to connected clients
+    emit_zones()
+
     return True
 
 # ----------------------
 # Incident Logging
 # ----------------------
-INCIDENT_LOG = []
+# Incidents are appended to a JSON-lines file as they happen; memory keeps
+# the most recent MAX_INCIDENT_LOG_SIZE. Once the file holds twice that many
+# lines it is rewritten from memory, so trimming stays amortized O(1).
 MAX_INCIDENT_LOG_SIZE = 10000  # Keep last 10k incidents
+INCIDENT_LOG = deque(maxlen=MAX_INCIDENT_LOG_SIZE)
+_incident_log_lock = threading.Lock()
+_incident_log_fp = None     # Line-buffered append handle, opened on first incident
+_incident_log_lines = 0     # Lines currently in INCIDENT_LOG_FILE
 
 def load_incident_log():
-    global INCIDENT_LOG
-    if os.path.exists(INCIDENT_LOG_FILE):
-        try:
-            with open(INCIDENT_LOG_FILE, "r") as f:
-                INCIDENT_LOG = json.load(f)
-        except Exception as e:
-            logger.warning(f"Error loading incident log: {e}")
-            INCIDENT_LOG = []
-
-def save_incident_log():
-    global INCIDENT_LOG
+    global _incident_log_lines
+    INCIDENT_LOG.clear()
     try:
-        # Keep only recent incidents to prevent file from growing too large
-        if len(INCIDENT_LOG) > MAX_INCIDENT_LOG_SIZE:
-            INCIDENT_LOG = INCIDENT_LOG[-MAX_INCIDENT_LOG_SIZE:]
+        with open(INCIDENT_LOG_FILE, "r") as f:
+            for line in f:
+                _incident_log_lines += 1
+                try:
+                    INCIDENT_LOG.append(loads_json(line))
+                except ValueError:
+                    continue  # Skip a torn final line from a crash
+        return
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Error loading incident log: {e}")
+        return
 
-        with open(INCIDENT_LOG_FILE, "w") as f:
-            json.dump(INCIDENT_LOG, f, indent=2)
+    # Migrate the old single-array JSON file
+    try:
+        INCIDENT_LOG.extend(read_json_file(LEGACY_INCIDENT_LOG_FILE))
+        save_incident_log()
+        logger.info(f"Migrated {len(INCIDENT_LOG)} incidents to {INCIDENT_LOG_FILE}")
+    except FileNotFoundError:
+        pass
     except Exception as e:
-        logger.error(f"Error saving incident log: {e}")
+        logger.warning(f"Error loading incident log: {e}")
+        INCIDENT_LOG.clear()
+
+def save_incident_log():
+    """Rewrite the incident log file from memory, dropping incidents beyond MAX_INCIDENT_LOG_SIZE"""
+    global _incident_log_fp, _incident_log_lines
+    with _incident_log_lock:
+        try:
+            if _incident_log_fp is not None:
+                _incident_log_fp.close()
+                _incident_log_fp = None
+            tmp_path = INCIDENT_LOG_FILE + ".tmp"
+            with open(tmp_path, "w") as f:
+                for incident in INCIDENT_LOG:
+                    f.write(dumps_json(incident) + "\n")
+            os.replace(tmp_path, INCIDENT_LOG_FILE)
+            _incident_log_lines = len(INCIDENT_LOG)
+        except Exception as e:
+            logger.error(f"Error saving incident log: {e}")
+
+def _append_incident_line(incident_data):
+    global _incident_log_fp, _incident_log_lines
+    with _incident_log_lock:
+        # Appended under the lock so save_incident_log never sees the deque
+        # change mid-rewrite (the deque drops the oldest beyond MAX_INCIDENT_LOG_SIZE)
+        INCIDENT_LOG.append(incident_data)
+        try:
+            if _incident_log_fp is None:
+                _incident_log_fp = open(INCIDENT_LOG_FILE, "a", buffering=1)
+            _incident_log_fp.write(dumps_json(incident_data) + "\n")
+            _incident_log_lines += 1
+        except Exception as e:
+            logger.error(f"Error appending to incident log: {e}")
 
 def log_incident(incident_data):
     """Log an incident to the incident log"""
-    global INCIDENT_LOG
+    _append_incident_line(incident_data)
 
-    # Add incident
-    INCIDENT_LOG.append(incident_data)
-
-    # Auto-save periodically (every 10 incidents)
-    if len(INCIDENT_LOG) % 10 == 0:
+    # Compact the file once it holds twice the retained history
+    if _incident_log_lines >= 2 * MAX_INCIDENT_LOG_SIZE:
         save_incident_log()
 
     # Emit to connected clients
@@ -4903,7 +5361,7 @@ def log_system_status():
     logger.info(f"Selected ports: {SELECTED_PORTS}")
     logger.info(f"Serial connection status: {serial_connected_status}")
     logger.info(f"Active detections: {len(detection_history)}")
-    logger.info(f"Tracked MACs: {len(set(d.get('mac') for d in detection_history if d.get('mac')))}")
+    logger.info(f"Tracked MACs: {len(detection_history_by_mac)}")
     logger.info(f"Headless mode: {HEADLESS_MODE}")
     logger.info("====================")
 
@@ -4930,7 +5388,7 @@ def start_mqtt_status_publisher():
                     "timestamp": time.time(),
                     "uptime_seconds": round(uptime_seconds, 1),
                     "active_drones": len(detection_history),
-                    "tracked_macs": len(set(d.get('mac') for d in detection_history if d.get('mac'))),
+                    "tracked_macs": len(detection_history_by_mac),
                     "aircraft_count": len(ADSB_AIRCRAFT),
                     "vessel_count": len(AIS_VESSELS),
                     "aprs_station_count": len(APRS_STATIONS),
@@ -4954,6 +5412,9 @@ def start_mqtt_status_publisher():
 def start_websocket_broadcaster():
     """Start background task to broadcast WebSocket updates every 5 seconds (optimized)"""
     def broadcaster():
+        # Count 5-second ticks rather than sampling the wall clock, which could
+        # skip (or double up on) the slower cadences whenever the loop drifted
+        tick = 0
         while not SHUTDOWN_EVENT.is_set():
             try:
                 # Only emit if there are connected clients to reduce CPU usage
@@ -4963,11 +5424,11 @@ def start_websocket_broadcaster():
                     emit_serial_status()
 
                     # Emit less critical data less frequently
-                    if int(time.time()) % 10 == 0:  # Every 10 seconds
+                    if tick % 2 == 0:  # Every 10 seconds
                         emit_paths()
                         emit_aliases()
 
-                    if int(time.time()) % 30 == 0:  # Every 30 seconds
+                    if tick % 6 == 0:  # Every 30 seconds
                         emit_cumulative_log()
                         emit_faa_cache()
                         emit_aprs_stations()
@@ -4975,11 +5436,9 @@ def start_websocket_broadcaster():
                 # Ignore errors if no clients connected
                 pass
 
-            # Wait 5 seconds instead of 2 to reduce CPU usage
-            for _ in range(50):  # 50 * 0.1 = 5 seconds, but check shutdown every 0.1s
-                if SHUTDOWN_EVENT.is_set():
-                    break
-                time.sleep(0.1)
+            tick += 1
+            # Wait 5 seconds instead of 2 to reduce CPU usage; returns at once on shutdown
+            SHUTDOWN_EVENT.wait(5)
 
 
     broadcaster_thread = threading.Thread(target=broadcaster, daemon=True)
@@ -4989,277 +5448,622 @@ def start_websocket_broadcaster():
 # ----------------------
 # FAA Cache Persistence
 # ----------------------
-FAA_CACHE_FILENAME = os.path.join(BASE_DIR, "faa_cache.csv")
-FAA_CACHE = {}
+# The full cache lives in the faa_cache table of DB_FILE, keyed on
+# (mac, remote_id); FAA_CACHE holds the recently used entries (bounded by
+# MAX_FAA_CACHE_SIZE in cleanup) for the hot lookup path and the 'faa_cache'
+# socket emit. Misses fall through to the table, so entries trimmed from
+# memory are not lost.
+FAA_CACHE_FILENAME = os.path.join(BASE_DIR, "faa_cache.csv")  # Legacy format, migrated on first start
+FAA_CACHE = {}  # "mac|remote_id" -> FAA response
+# Secondary indexes over FAA_CACHE so the per-detection and /api/faa fallback
+# lookups are a dict hit instead of a scan of every cached key. Both always
+# point at the most recently stored response for that MAC / remote ID.
+_faa_by_mac = {}  # mac -> FAA response
+_faa_by_rid = {}  # remote_id -> FAA response
+
+
+def faa_cache_key(mac, remote_id):
+    """Build the flat string key used by FAA_CACHE (JSON-serializable as-is)."""
+    return f"{mac}|{remote_id}"
+
+
+def _faa_cache_store(mac, remote_id, faa_data):
+    """Put a response in FAA_CACHE and its MAC / remote ID indexes"""
+    FAA_CACHE[faa_cache_key(mac, remote_id)] = faa_data
+    _faa_by_mac[mac] = faa_data
+    _faa_by_rid[remote_id] = faa_data
+
+
+def trim_faa_cache(count):
+    """Drop the `count` oldest in-memory FAA entries and rebuild the indexes"""
+    # Snapshots: write_to_faa_cache inserts from the serial threads meanwhile
+    for key in list(FAA_CACHE.keys())[:count]:
+        FAA_CACHE.pop(key, None)
+    _faa_by_mac.clear()
+    _faa_by_rid.clear()
+    for key, faa_data in list(FAA_CACHE.items()):
+        mac, _, remote_id = key.partition('|')
+        _faa_by_mac[mac] = faa_data
+        _faa_by_rid[remote_id] = faa_data
+
+
+def _faa_db_fetchone(query, params):
+    """Run one faa_cache SELECT against DB_FILE and return the first row"""
+    with DB_LOCK:
+        conn = get_db_connection(row_factory=None)
+        try:
+            return conn.execute(query, params).fetchone()
+        finally:
+            conn.close()
+
+
+def _faa_db_write(query, rows):
+    """Run an faa_cache INSERT for each of rows against DB_FILE in one transaction"""
+    with DB_LOCK:
+        conn = get_db_connection(row_factory=None)
+        try:
+            # synchronous=NORMAL: in WAL mode a commit is an append to the WAL
+            # with no fsync (durability is only deferred to the next checkpoint,
+            # and losing a cached FAA response just means querying it again)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.executemany(query, rows)
+        finally:
+            conn.close()
+
+
+_FAA_INSERT_SQL = "INSERT OR REPLACE INTO faa_cache (mac, remote_id, faa_response) VALUES (?, ?, ?)"
+
+
+def faa_cache_get(mac, remote_id):
+    """Return the cached FAA response for (mac, remote_id), or None."""
+    key = faa_cache_key(mac, remote_id)
+    faa_data = FAA_CACHE.get(key)
+    if faa_data is not None:
+        return faa_data
+    try:
+        row = _faa_db_fetchone(
+            "SELECT faa_response FROM faa_cache WHERE mac = ? AND remote_id = ?", (mac, remote_id)
+        )
+    except Exception as e:
+        logger.error(f"Error reading FAA cache: {e}")
+        return None
+    if row is None:
+        return None
+    faa_data = loads_json(row[0])
+    _faa_cache_store(mac, remote_id, faa_data)
+    return faa_data
+
+
+def faa_cache_lookup_by_mac(mac):
+    """Return the most recently stored FAA response for a MAC, regardless of remote ID."""
+    faa_data = _faa_by_mac.get(mac)
+    if faa_data is not None:
+        return faa_data
+    try:
+        row = _faa_db_fetchone(
+            "SELECT remote_id, faa_response FROM faa_cache WHERE mac = ? "
+            "ORDER BY rowid DESC LIMIT 1", (mac,)
+        )
+    except Exception as e:
+        logger.error(f"Error reading FAA cache: {e}")
+        return None
+    if row is None:
+        return None
+    faa_data = loads_json(row[1])
+    _faa_cache_store(mac, row[0], faa_data)
+    return faa_data
+
+
+def faa_cache_lookup_by_remote_id(remote_id):
+    """Return the most recently stored FAA response for a remote ID, regardless of MAC."""
+    faa_data = _faa_by_rid.get(remote_id)
+    if faa_data is not None:
+        return faa_data
+    try:
+        row = _faa_db_fetchone(
+            "SELECT mac, faa_response FROM faa_cache WHERE remote_id = ? "
+            "ORDER BY rowid DESC LIMIT 1", (remote_id,)
+        )
+    except Exception as e:
+        logger.error(f"Error reading FAA cache: {e}")
+        return None
+    if row is None:
+        return None
+    faa_data = loads_json(row[1])
+    _faa_cache_store(row[0], remote_id, faa_data)
+    return faa_data
+
 
-# Load FAA cache from disk if it exists
-if os.path.exists(FAA_CACHE_FILENAME):
+def load_faa_cache():
+    """Warm FAA_CACHE with the most recent entries, migrating the legacy CSV once
+
+    Called from startup_auto_connect once init_database has created the table.
+    """
     try:
-        with open(FAA_CACHE_FILENAME, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                key = (row['mac'], row['remote_id'])
-                FAA_CACHE[key] = json.loads(row['faa_response'])
+        if os.path.exists(FAA_CACHE_FILENAME):
+            with open(FAA_CACHE_FILENAME, newline='') as csvfile:
+                rows = [(row['mac'], row['remote_id'], row['faa_response'])
+                        for row in csv.DictReader(csvfile)]
+            _faa_db_write(_FAA_INSERT_SQL, rows)
+            os.replace(FAA_CACHE_FILENAME, FAA_CACHE_FILENAME + ".migrated")
+            logger.info(f"Migrated {len(rows)} FAA cache rows to {DB_FILE}")
+        with DB_LOCK:
+            conn = get_db_connection(row_factory=None)
+            try:
+                recent = conn.execute(
+                    "SELECT mac, remote_id, faa_response FROM faa_cache "
+                    "WHERE faa_response IS NOT NULL ORDER BY rowid DESC LIMIT ?",
+                    (MAX_FAA_CACHE_SIZE,)
+                ).fetchall()
+            finally:
+                conn.close()
+        # Oldest first, so cleanup's trim-from-the-front drops the oldest entries
+        for mac, remote_id, response in reversed(recent):
+            _faa_cache_store(mac, remote_id, loads_json(response))
     except Exception as e:
-        print("Error loading FAA cache:", e)
+        logger.error(f"Error loading FAA cache: {e}")
 
 def write_to_faa_cache(mac, remote_id, faa_data):
-    key = (mac, remote_id)
-    FAA_CACHE[key] = faa_data
-    try:
-        file_exists = os.path.isfile(FAA_CACHE_FILENAME)
-        with open(FAA_CACHE_FILENAME, "a", newline='') as csvfile:
-            fieldnames = ["mac", "remote_id", "faa_response"]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            if not file_exists:
-                writer.writeheader()
-            writer.writerow({
-                "mac": mac,
-                "remote_id": remote_id,
-                "faa_response": json.dumps(faa_data)
-            })
+    key = faa_cache_key(mac, remote_id)
+    previous = FAA_CACHE.get(key)
+    _faa_cache_store(mac, remote_id, faa_data)
+    # Detections re-cache the same response on every update; skip the write then
+    if previous is faa_data or previous == faa_data:
+        return
+    _faa_json_cache.pop((mac, remote_id), None)
+    try:
+        _faa_db_write(_FAA_INSERT_SQL, ((mac, remote_id, dumps_json(faa_data)),))
     except Exception as e:
-        print("Error writing to FAA cache:", e)
+        logger.error(f"Error writing to FAA cache: {e}")
+
+# Encoded faa_data per (mac, basic_id) for the detection CSV rows: every
+# detection of a drone carries the same FAA response, so it is serialized once
+# and reused until write_to_faa_cache stores a different one
+_faa_json_cache = {}
+
+def faa_data_json(mac, basic_id, faa_data):
+    """json.dumps(faa_data), cached per (mac, basic_id)"""
+    key = (mac, basic_id)
+    cached = _faa_json_cache.get(key)
+    if cached is not None and (cached[0] is faa_data or cached[0] == faa_data):
+        return cached[1]
+    text = json.dumps(faa_data)
+    if len(_faa_json_cache) >= MAX_FAA_CACHE_SIZE:
+        _faa_json_cache.clear()
+    _faa_json_cache[key] = (faa_data, text)
+    return text
 
 # ----------------------
 # KML Generation (including FAA data)
 # ----------------------
-def generate_kml():
-    # Build sorted list of all MACs seen so far
-    macs = sorted({d['mac'] for d in detection_history})
-
-    # Use consistent color generation function
-    mac_colors = {}
-    for mac in macs:
-        mac_colors[mac] = get_color_for_mac(mac)
-
-    # Start KML document template
-    kml_lines = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        '<kml xmlns="http://www.opengis.net/kml/2.2" xmlns:gx="http://www.google.com/kml/ext/2.2">',
-        '<Document>',
-        f'<name>Detections {startup_timestamp}</name>'
-    ]
+# Per-flight KML fragments shared by the session and cumulative builders;
+# %-formatting a prebuilt template is cheaper than re-evaluating a long f-string
+_KML_FLIGHT_NAME_TMPL = '<name>Flight %d %s%s (%s)</name>\n'
+_KML_DRONE_PATH_TMPL = ('<Placemark><Style><LineStyle><color>%s</color><width>2</width></LineStyle></Style>'
+                        '<LineString><tessellate>1</tessellate><coordinates>%s</coordinates></LineString></Placemark>\n')
+_KML_DRONE_START_TMPL = ('<Placemark><name>Drone Start %d %s%s</name><Style><IconStyle><color>%s</color><scale>1.2</scale>'
+                         '<Icon><href>http://maps.google.com/mapfiles/kml/shapes/airports.png</href></Icon></IconStyle></Style>'
+                         '<Point><coordinates>%s,%s,0</coordinates></Point></Placemark>\n')
+_KML_DRONE_END_TMPL = ('<Placemark><name>Drone End %d %s%s</name><Style><IconStyle><color>%s</color><scale>1.2</scale>'
+                       '<Icon><href>http://maps.google.com/mapfiles/kml/shapes/heliport.png</href></Icon></IconStyle></Style>'
+                       '<Point><coordinates>%s,%s,0</coordinates></Point></Placemark>\n')
+_KML_PILOT_PATH_TMPL = ('<Placemark><name>Pilot Path %d %s%s</name><Style><LineStyle><color>%s</color><width>2</width><gx:dash/></LineStyle></Style>'
+                        '<LineString><tessellate>1</tessellate><coordinates>%s</coordinates></LineString></Placemark>\n')
+_KML_PILOT_END_TMPL = ('<Placemark><name>Pilot End %d %s%s</name><Style><IconStyle><color>%s</color><scale>1.2</scale>'
+                       '<Icon><href>http://maps.google.com/mapfiles/kml/shapes/man.png</href></Icon></IconStyle></Style>'
+                       '<Point><coordinates>%s,%s,0</coordinates></Point></Placemark>\n')
+
+def _kml_coordinates(flat):
+    """KML coordinate text for a flat [lon, lat, lon, lat, ...] list, built with one % format"""
+    return ("%s,%s,0 " * (len(flat) // 2) % tuple(flat))[:-1]
+
+def _simplify_kml_path(flat, epsilon):
+    """Douglas-Peucker simplification of a flat [lon, lat, ...] path; endpoints are kept"""
+    n = len(flat) // 2
+    if epsilon <= 0 or n < 3:
+        return flat
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    eps2 = epsilon * epsilon
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        x1, y1 = flat[2 * first], flat[2 * first + 1]
+        dx, dy = flat[2 * last] - x1, flat[2 * last + 1] - y1
+        seg2 = dx * dx + dy * dy
+        max_d2 = eps2
+        index = -1
+        for i in range(first + 1, last):
+            px, py = flat[2 * i] - x1, flat[2 * i + 1] - y1
+            # Distance to the segment (not the infinite line), so tracks that
+            # double back are not collapsed
+            t = (px * dx + py * dy) / seg2 if seg2 else 0.0
+            if t > 1.0:
+                t = 1.0
+            elif t < 0.0:
+                t = 0.0
+            ex, ey = px - t * dx, py - t * dy
+            d2 = ex * ex + ey * ey
+            if d2 > max_d2:
+                max_d2 = d2
+                index = i
+        if index >= 0:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    simplified = []
+    for i in range(n):
+        if keep[i]:
+            simplified += (flat[2 * i], flat[2 * i + 1])
+    return simplified
+
+def _segment_kml_flights(detections, stale):
+    """Split one MAC's time-ordered detections into flights at drone-fix gaps over stale
+
+    Yields (start_ts, flight_coords, pilot_coords) per flight, with the drone
+    and pilot paths as flat [lon, lat, lon, lat, ...] lists (see
+    _kml_coordinates). stale must be comparable with the difference of two
+    'last_update' values: seconds for the live history, a timedelta for the
+    cumulative CSV rows. Pilot fixes up to a flight's last drone fix belong to
+    it; later ones wait in pending_pilot until the next drone fix shows
+    whether the flight carries on. A fix repeating the previous point of the
+    same path (a hovering drone, a stationary pilot) is not added again, so
+    either path may come back as a single point.
+    """
+    last_ts = None
+    flight_start = None
+    flight_coords = []
+    pilot_coords = []
+    pending_pilot = []
+    for det in detections:
+        lat, lon = det.get('drone_lat'), det.get('drone_long')
+        ts = det.get('last_update')
+        pilot = (det['pilot_long'], det['pilot_lat']) if det.get('pilot_lat') and det.get('pilot_long') else None
+        if lat and lon:
+            # break flight on time gap
+            if last_ts and (ts - last_ts) > stale:
+                if flight_coords:
+                    yield flight_start, flight_coords, pilot_coords
+                flight_coords = []
+                pilot_coords = []
+            elif flight_coords:
+                pilot_coords += pending_pilot
+            pending_pilot = []
+            if not flight_coords:
+                flight_start = ts
+                flight_coords += (lon, lat)
+            elif flight_coords[-2] != lon or flight_coords[-1] != lat:
+                flight_coords += (lon, lat)
+            if pilot and (not pilot_coords or pilot_coords[-2] != pilot[0] or pilot_coords[-1] != pilot[1]):
+                pilot_coords += pilot
+            last_ts = ts
+        elif pilot and flight_coords:
+            previous = pending_pilot or pilot_coords
+            if not previous or previous[-2] != pilot[0] or previous[-1] != pilot[1]:
+                pending_pilot += pilot
+    # final flight, if any
+    if flight_coords:
+        yield flight_start, flight_coords, pilot_coords
+
+def _kml_epoch_start_text(ts):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))
+
+def _kml_datetime_start_text(dt):
+    return dt.strftime('%Y-%m-%d %H:%M:%S')
+
+def _render_kml_mac_folders(mac, aliasStr, color, detections, stale, start_text, first_index=1,
+                            flight_cache=None):
+    """Render one MAC's flights as KML <Folder> blocks and return the text
+
+    Shared by the session and cumulative builders; start_text formats a
+    flight's first timestamp and first_index numbers the first flight. The
+    alias and MAC are XML-escaped here, since aliases are free user text.
+    When a flight_cache dict is given, a flight with the same number, alias,
+    start and point counts as last time reuses its folder text, and the dict
+    is left holding only this call's flights. Templates and helpers are bound
+    as locals because this runs once per flight of every MAC on each rebuild.
+    """
+    name_tmpl, path_tmpl = _KML_FLIGHT_NAME_TMPL, _KML_DRONE_PATH_TMPL
+    start_tmpl, end_tmpl = _KML_DRONE_START_TMPL, _KML_DRONE_END_TMPL
+    pilot_path_tmpl, pilot_end_tmpl = _KML_PILOT_PATH_TMPL, _KML_PILOT_END_TMPL
+    aliasStr, mac = xml_escape(aliasStr), xml_escape(mac)
+    coordinates = _kml_coordinates
+    simplify = _simplify_kml_path
+    epsilon = KML_SIMPLIFY_EPS
+    previous = {}
+    if flight_cache is not None:
+        previous = dict(flight_cache)
+        flight_cache.clear()
+    parts = []
+    add = parts.append
+    for flight_idx, (flight_start, flight_coords, pilot_coords) in enumerate(_segment_kml_flights(detections, stale), first_index):
+        if flight_cache is not None:
+            key = (flight_idx, aliasStr, flight_start, len(flight_coords), len(pilot_coords))
+            folder = previous.get(key)
+            if folder is not None:
+                flight_cache[key] = folder
+                add(folder)
+                continue
+        first_part = len(parts)
+        add('<Folder>\n')
+        # include start timestamp for this flight
+        add(name_tmpl % (flight_idx, aliasStr, mac, start_text(flight_start)))
+        # drone path, start and end icons; a <LineString> needs two points, so a
+        # drone that never moved only gets its icons
+        if len(flight_coords) >= 4:
+            add(path_tmpl % (color, coordinates(simplify(flight_coords, epsilon))))
+        add(start_tmpl % (flight_idx, aliasStr, mac, color, flight_coords[0], flight_coords[1]))
+        add(end_tmpl % (flight_idx, aliasStr, mac, color, flight_coords[-2], flight_coords[-1]))
+        # pilot path inside same flight
+        if pilot_coords:
+            if len(pilot_coords) >= 4:
+                add(pilot_path_tmpl % (flight_idx, aliasStr, mac, color, coordinates(simplify(pilot_coords, epsilon))))
+            add(pilot_end_tmpl % (flight_idx, aliasStr, mac, color, pilot_coords[-2], pilot_coords[-1]))
+        add('</Folder>\n')
+        if flight_cache is not None:
+            folder = parts[first_part] = "".join(parts[first_part:])
+            del parts[first_part + 1:]
+            flight_cache[key] = folder
+    return "".join(parts)
+
+# Session KML folders are cached per MAC as (aliasStr, rendered text); a rebuild
+# only re-renders MACs in _kml_dirty_macs or whose alias changed. Within such a
+# MAC, folders of flights whose points are unchanged come from
+# _kml_flight_cache, so in steady state only the growing flight is formatted.
+_kml_lock = threading.Lock()
+_kml_folder_cache = {}
+_kml_flight_cache = {}  # mac -> {flight key: rendered folder text}
+_kml_needs_write = True
 
-    for mac in macs:
-        alias = ALIASES.get(mac, "")
-        aliasStr = f"{alias} " if alias else ""
-        color    = mac_colors[mac]
-
-        # --- Flights grouped by staleThreshold, each in its own Folder ---
-        flight_idx = 1
-        last_ts = None
-        current_flight = []
-        for det in detection_history:
-            if det.get('mac') != mac:
+def generate_kml():
+    global _kml_needs_write
+    with _kml_lock:
+        aliases = ALIASES
+        # Sorted list of all MACs seen so far and each MAC's run of detections,
+        # both maintained by append_detection_history
+        with _detection_history_lock:
+            macs = list(detection_history_macs_sorted)
+            stale_macs = set(_kml_dirty_macs)
+            _kml_dirty_macs.clear()
+            for mac in macs:
+                alias = aliases.get(mac, "")
+                cached = _kml_folder_cache.get(mac)
+                if cached is None or cached[0] != (f"{alias} " if alias else ""):
+                    stale_macs.add(mac)
+            by_mac = {mac: list(detection_history_by_mac.get(mac, ())) for mac in stale_macs}
+
+        changed = False
+        live_macs = set(macs)
+        for mac in stale_macs:
+            if mac not in live_macs:
+                _kml_flight_cache.pop(mac, None)
+                if _kml_folder_cache.pop(mac, None) is not None:
+                    changed = True
                 continue
-            lat, lon = det.get('drone_lat'), det.get('drone_long')
-            ts = det.get('last_update')
-            if lat and lon:
-                # break flight on time gap
-                if last_ts and (ts - last_ts) > staleThreshold:
-                    # flush current flight
-                    if len(current_flight) >= 1:
-                        # start folder
-                        kml_lines.append('<Folder>')
-                        # include start timestamp for this flight
-                        start_dt  = datetime.fromtimestamp(current_flight[0][2])
-                        start_str = start_dt.strftime('%Y-%m-%d %H:%M:%S')
-                        kml_lines.append(f'<name>Flight {flight_idx} {aliasStr}{mac} ({start_str})</name>')
-                        # drone path
-                        coords = " ".join(f"{x[0]},{x[1]},0" for x in current_flight)
-                        kml_lines.append(f'<Placemark><Style><LineStyle><color>{color}</color><width>2</width></LineStyle></Style><LineString><tessellate>1</tessellate><coordinates>{coords}</coordinates></LineString></Placemark>')
-                        # drone start icon
-                        start_lon, start_lat, start_ts = current_flight[0]
-                        kml_lines.append(f'<Placemark><name>Drone Start {flight_idx} {aliasStr}{mac}</name><Style><IconStyle><color>{color}</color><scale>1.2</scale><Icon><href>http://maps.google.com/mapfiles/kml/shapes/airports.png</href></IconStyle></Style><Point><coordinates>{start_lon},{start_lat},0</coordinates></Point></Placemark>')
-                        # drone end icon
-                        end_lon, end_lat, end_ts = current_flight[-1]
-                        kml_lines.append(f'<Placemark><name>Drone End {flight_idx} {aliasStr}{mac}</name><Style><IconStyle><color>{color}</color><scale>1.2</scale><Icon><href>http://maps.google.com/mapfiles/kml/shapes/heliport.png</href></IconStyle></Style><Point><coordinates>{end_lon},{end_lat},0</coordinates></Point></Placemark>')
-                        # pilot path inside same flight
-                        start_ts = current_flight[0][2]
-                        pilot_pts = [(d['pilot_long'], d['pilot_lat']) for d in detection_history if d.get('mac')==mac and d.get('pilot_lat') and d.get('pilot_long') and d.get('last_update')>=start_ts and d.get('last_update')<=end_ts]
-                        if len(pilot_pts) >= 1:
-                            pc = " ".join(f"{p[0]},{p[1]},0" for p in pilot_pts)
-                            kml_lines.append(f'<Placemark><name>Pilot Path {flight_idx} {aliasStr}{mac}</name><Style><LineStyle><color>{color}</color><width>2</width><gx:dash/></LineStyle></Style><LineString><tessellate>1</tessellate><coordinates>{pc}</coordinates></LineString></Placemark>')
-                            plon, plat = pilot_pts[-1]
-                            kml_lines.append(f'<Placemark><name>Pilot End {flight_idx} {aliasStr}{mac}</name><Style><IconStyle><color>{color}</color><scale>1.2</scale><Icon><href>http://maps.google.com/mapfiles/kml/shapes/man.png</href></IconStyle></Style><Point><coordinates>{plon},{plat},0</coordinates></Point></Placemark>')
-                        kml_lines.append('</Folder>')
-                        flight_idx += 1
-                    current_flight = []
-                # accumulate this point
-                current_flight.append((lon, lat, ts))
-                last_ts = ts
-        # flush final flight if any
-        if current_flight:
-            kml_lines.append('<Folder>')
-            # include start timestamp for this flight
-            start_dt  = datetime.fromtimestamp(current_flight[0][2])
-            start_str = start_dt.strftime('%Y-%m-%d %H:%M:%S')
-            kml_lines.append(f'<name>Flight {flight_idx} {aliasStr}{mac} ({start_str})</name>')
-            coords = " ".join(f"{x[0]},{x[1]},0" for x in current_flight)
-            kml_lines.append(f'<Placemark><Style><LineStyle><color>{color}</color><width>2</width></LineStyle></Style><LineString><tessellate>1</tessellate><coordinates>{coords}</coordinates></LineString></Placemark>')
-            # drone start icon
-            start_lon, start_lat, start_ts = current_flight[0]
-            kml_lines.append(f'<Placemark><name>Drone Start {flight_idx} {aliasStr}{mac}</name><Style><IconStyle><color>{color}</color><scale>1.2</scale><Icon><href>http://maps.google.com/mapfiles/kml/shapes/airports.png</href></IconStyle></Style><Point><coordinates>{start_lon},{start_lat},0</coordinates></Point></Placemark>')
-            end_lon, end_lat, end_ts = current_flight[-1]
-            kml_lines.append(f'<Placemark><name>Drone End {flight_idx} {aliasStr}{mac}</name><Style><IconStyle><color>{color}</color><scale>1.2</scale><Icon><href>http://maps.google.com/mapfiles/kml/shapes/heliport.png</href></IconStyle></Style><Point><coordinates>{end_lon},{end_lat},0</coordinates></Point></Placemark>')
-            pilot_pts = [(d['pilot_long'], d['pilot_lat']) for d in detection_history if d.get('mac')==mac and d.get('pilot_lat') and d.get('pilot_long') and d.get('last_update')>=current_flight[0][2] and d.get('last_update')<=end_ts]
-            if pilot_pts:
-                pc = " ".join(f"{p[0]},{p[1]},0" for p in pilot_pts)
-                kml_lines.append(f'<Placemark><name>Pilot Path {flight_idx} {aliasStr}{mac}</name><Style><LineStyle><color>{color}</color><width>2</width><gx:dash/></LineStyle></Style><LineString><tessellate>1</tessellate><coordinates>{pc}</coordinates></LineString></Placemark>')
-                plon, plat = pilot_pts[-1]
-                kml_lines.append(f'<Placemark><name>Pilot End {flight_idx} {aliasStr}{mac}</name><Style><IconStyle><color>{color}</color><scale>1.2</scale><Icon><href>http://maps.google.com/mapfiles/kml/shapes/man.png</href></IconStyle></Style><Point><coordinates>{plon},{plat},0</coordinates></Point></Placemark>')
-            kml_lines.append('</Folder>')
-    # Close document
-    kml_lines.append('</Document></kml>')
-
-    # Write only session KML
-    with open(KML_FILENAME, "w") as f:
-        f.write("\n".join(kml_lines))
+            alias = aliases.get(mac, "")
+            aliasStr = f"{alias} " if alias else ""
+            # Use consistent color generation function
+            _kml_folder_cache[mac] = (aliasStr, _render_kml_mac_folders(
+                mac, aliasStr, get_color_for_mac(mac), by_mac.get(mac, ()),
+                staleThreshold, _kml_epoch_start_text,
+                flight_cache=_kml_flight_cache.setdefault(mac, {})))
+            changed = True
+        for mac in set(_kml_folder_cache).difference(live_macs):
+            del _kml_folder_cache[mac]
+            _kml_flight_cache.pop(mac, None)
+            changed = True
+
+        if not changed and not _kml_needs_write:
+            return
+        _kml_needs_write = True
+
+        # Stream the document straight to a temp file and swap it into place, so
+        # the KML is never held in memory whole and readers never see a partial file
+        tmp_path = f"{KML_FILENAME}.tmp"
+        with open(tmp_path, "w", buffering=1 << 20) as f:
+            w = f.write
+            w('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<kml xmlns="http://www.opengis.net/kml/2.2" xmlns:gx="http://www.google.com/kml/ext/2.2">\n'
+              '<Document>\n')
+            w(f'<name>Detections {startup_timestamp}</name>\n')
+            for mac in macs:
+                cached = _kml_folder_cache.get(mac)
+                if cached:
+                    w(cached[1])
+            # Close document
+            w('</Document></kml>\n')
+
+        # Write only session KML
+        os.replace(tmp_path, KML_FILENAME)
+        _kml_needs_write = False
     print("Updated session KML:", KML_FILENAME)
 
-def generate_kml_throttled():
-    """Only regenerate KML if enough time has passed"""
-    global last_kml_generation
-    current_time = time.time()
-
-    if current_time - last_kml_generation > KML_GENERATION_INTERVAL:
-        generate_kml()
-        last_kml_generation = current_time
+# ----------------------
+# Incremental Cumulative KML
+# ----------------------
+# The cumulative CSV is append-only, so the KML builder keeps a cursor into the
+# file and parses only newly appended rows on each rebuild. Appended rows can
+# only extend a MAC's last flight or start a new one, so once a later flight
+# has begun the earlier ones are final: they are rendered once, kept as text,
+# and their rows dropped. Memory therefore holds rows for each MAC's open
+# flight only, not the whole log. Only MACs that gained rows are re-rendered;
+# when nothing changed the file on disk is left as is. An alias change
+# re-reads the log, since the completed flights have to be renamed.
+_cumulative_kml_lock = threading.Lock()
+_cumulative_kml_columns = None  # header positions of the columns the KML needs
+_cumulative_kml_offset = 0   # byte offset of the first CSV row not yet parsed
+_cumulative_kml_rows = {}    # mac -> parsed rows of the MAC's open (last) flight
+_cumulative_kml_done = {}    # mac -> (completed flight count, their rendered KML text)
+_cumulative_kml_chunks = {}  # mac -> (alias, rendered KML text of all flights)
+
+def _reset_cumulative_kml_state():
+    global _cumulative_kml_columns, _cumulative_kml_offset
+    _cumulative_kml_columns = None
+    _cumulative_kml_offset = 0
+    _cumulative_kml_rows.clear()
+    _cumulative_kml_done.clear()
+    _cumulative_kml_chunks.clear()
+
+def _read_new_cumulative_rows():
+    """Parse rows appended to the cumulative CSV since the last call; returns the MACs they belong to"""
+    global _cumulative_kml_columns, _cumulative_kml_offset
+    size = os.path.getsize(CUMULATIVE_CSV_FILENAME)
+    if size < _cumulative_kml_offset:
+        # File was truncated/replaced - start over
+        _reset_cumulative_kml_state()
+    if size == _cumulative_kml_offset:
+        return set()
+    with open(CUMULATIVE_CSV_FILENAME, 'rb') as f:
+        f.seek(_cumulative_kml_offset)
+        chunk = f.read(size - _cumulative_kml_offset)
+    # Only consume complete lines; a row being written right now waits for next time
+    end = chunk.rfind(b'\n') + 1
+    if end == 0:
+        return set()
+    lines = chunk[:end].decode('utf-8', errors='replace').splitlines()
+    if _cumulative_kml_columns is None:
+        header = next(csv.reader(lines[:1]), [])
+        _cumulative_kml_columns = tuple(header.index(name) for name in (
+            'timestamp', 'mac', 'drone_lat', 'drone_long', 'pilot_lat', 'pilot_long'))
+        lines = lines[1:]
+    ts_i, mac_i, dlat_i, dlon_i, plat_i, plon_i = _cumulative_kml_columns
+    min_len = max(_cumulative_kml_columns) + 1
+    fromiso = datetime.fromisoformat
+    rows_by_mac = _cumulative_kml_rows
+    new_macs = set()
+    # Positional reader: only the six columns the KML uses are touched, and each
+    # row keeps just those values instead of a dict of every CSV column
+    for row in csv.reader(lines):
+        if len(row) < min_len:
+            continue
+        drone_lat, drone_long = row[dlat_i], row[dlon_i]
+        pilot_lat, pilot_long = row[plat_i], row[plon_i]
+        mac = row[mac_i]
+        rows = rows_by_mac.get(mac)
+        if rows is None:
+            rows = rows_by_mac[mac] = []
+        new_macs.add(mac)
+        rows.append({
+            'last_update': fromiso(row[ts_i]),
+            'drone_lat': float(drone_lat) if drone_lat else 0.0,
+            'drone_long': float(drone_long) if drone_long else 0.0,
+            'pilot_lat': float(pilot_lat) if pilot_lat else 0.0,
+            'pilot_long': float(pilot_long) if pilot_long else 0.0,
+        })
+    _cumulative_kml_offset += end
+    return new_macs
 
-def generate_cumulative_kml_throttled():
-    """Only regenerate cumulative KML if enough time has passed"""
-    global last_cumulative_kml_generation
-    current_time = time.time()
+def _render_cumulative_mac_kml(mac, alias):
+    """Render one MAC's cumulative history as KML flight folders
 
-    if current_time - last_cumulative_kml_generation > KML_GENERATION_INTERVAL:
-        generate_cumulative_kml()
-        last_cumulative_kml_generation = current_time
+    Flights that ended before the MAC's last flight started are rendered into
+    _cumulative_kml_done and their rows released; only the open flight is
+    re-rendered on each call.
+    """
+    aliasStr = f"{alias} " if alias else ""
+    color = get_color_for_mac(mac)
+    # Cumulative timestamps are datetimes, so the gap threshold is a timedelta
+    stale = timedelta(seconds=staleThreshold)
+    rows = _cumulative_kml_rows[mac]
+    done_count, done_text = _cumulative_kml_done.get(mac, (0, ""))
+
+    # Find where the last flight starts: the last drone fix that follows a gap
+    split = 0
+    completed = 0
+    last_ts = None
+    for i, row in enumerate(rows):
+        if row['drone_lat'] and row['drone_long']:
+            ts = row['last_update']
+            if last_ts and (ts - last_ts) > stale:
+                split = i
+                completed += 1
+            last_ts = ts
+    if split:
+        done_text += _render_kml_mac_folders(mac, aliasStr, color, rows[:split], stale,
+                                             _kml_datetime_start_text, done_count + 1)
+        done_count += completed
+        _cumulative_kml_done[mac] = (done_count, done_text)
+        rows = _cumulative_kml_rows[mac] = rows[split:]
+
+    return done_text + _render_kml_mac_folders(mac, aliasStr, color, rows, stale,
+                                               _kml_datetime_start_text, done_count + 1)
 
-# New generate_cumulative_kml function
 def generate_cumulative_kml():
     """
-    Build cumulative KML by reading the cumulative CSV and grouping detections into flights.
+    Build cumulative KML from the cumulative CSV, grouping detections into flights.
+    Only rows appended since the previous build are parsed (see above).
     """
-    # Check if cumulative CSV exists
-    if not os.path.exists(CUMULATIVE_CSV_FILENAME):
-        print(f"Warning: Cumulative CSV file {CUMULATIVE_CSV_FILENAME} does not exist yet.")
-        return
+    flush_detection_logs()
+    with _cumulative_kml_lock:
+        try:
+            if any(ALIASES.get(mac, "") != cached[0] for mac, cached in _cumulative_kml_chunks.items()):
+                # Completed flights are only kept as rendered text, so renaming
+                # them means reading the log again
+                _reset_cumulative_kml_state()
+            new_macs = _read_new_cumulative_rows()
+        except FileNotFoundError:
+            print(f"Warning: Cumulative CSV file {CUMULATIVE_CSV_FILENAME} does not exist yet.")
+            return
+        except Exception as e:
+            print(f"Error reading cumulative CSV: {e}")
+            _reset_cumulative_kml_state()
+            return
 
-    # Read cumulative CSV history
-    history = []
-    try:
-        with open(CUMULATIVE_CSV_FILENAME, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                # Parse timestamp
-                ts = datetime.fromisoformat(row['timestamp'])
-                row['last_update'] = ts
-                # Convert coordinates
-                row['drone_lat'] = float(row['drone_lat']) if row['drone_lat'] else 0.0
-                row['drone_long'] = float(row['drone_long']) if row['drone_long'] else 0.0
-                row['pilot_lat'] = float(row['pilot_lat']) if row['pilot_lat'] else 0.0
-                row['pilot_long'] = float(row['pilot_long']) if row['pilot_long'] else 0.0
-                history.append(row)
-    except Exception as e:
-        print(f"Error reading cumulative CSV: {e}")
-        return
+        changed = bool(new_macs)
+        for mac in new_macs:
+            alias = ALIASES.get(mac, "")
+            _cumulative_kml_chunks[mac] = (alias, _render_cumulative_mac_kml(mac, alias))
 
-    # Determine unique MACs and assign consistent colors
-    macs = sorted({d['mac'] for d in history})
-    mac_colors = {}
-    for mac in macs:
-        mac_colors[mac] = get_color_for_mac(mac)
-
-    # Start KML
-    kml_lines = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        '<kml xmlns="http://www.opengis.net/kml/2.2" xmlns:gx="http://www.google.com/kml/ext/2.2">',
-        '<Document>',
-        '<name>Cumulative Detections</name>'
-    ]
+        if not changed and os.path.exists(CUMULATIVE_KML_FILENAME):
+            return
+
+        # Stream the cached per-MAC folders to a temp file and swap it into place
+        tmp_path = f"{CUMULATIVE_KML_FILENAME}.tmp"
+        with open(tmp_path, "w", buffering=1 << 20) as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<kml xmlns="http://www.opengis.net/kml/2.2" xmlns:gx="http://www.google.com/kml/ext/2.2">\n'
+                    '<Document>\n'
+                    '<name>Cumulative Detections</name>\n')
+            for mac in sorted(_cumulative_kml_chunks):
+                f.write(_cumulative_kml_chunks[mac][1])
+            # Close document
+            f.write('</Document></kml>\n')
+
+        # Write cumulative KML
+        os.replace(tmp_path, CUMULATIVE_KML_FILENAME)
+    print("Updated cumulative KML:", CUMULATIVE_KML_FILENAME)
 
-    # For each MAC, group history into flights with staleThreshold
-    for mac in macs:
-        alias = ALIASES.get(mac, "")
-        aliasStr = f"{alias} " if alias else ""
-        color = mac_colors[mac]
+# ----------------------
+# Background KML Regeneration
+# ----------------------
+# Detections only flag the KML files as out of date; a worker thread rebuilds
+# them at most once per KML_GENERATION_INTERVAL, so a rebuild never stalls
+# the detection path
+_kml_dirty = threading.Event()
 
-        flight_idx = 1
-        last_ts = None
-        current_flight = []
+def request_kml_regeneration():
+    _kml_dirty.set()
 
-        for det in history:
-            if det.get('mac') != mac:
+def start_kml_worker():
+    """Start the background thread that rebuilds the KML files after new detections"""
+    def kml_worker():
+        while not SHUTDOWN_EVENT.is_set():
+            if not _kml_dirty.wait(1.0):
                 continue
-            lat = det['drone_lat']
-            lon = det['drone_long']
-            ts = det['last_update']
-            if lat and lon:
-                if last_ts and (ts - last_ts).total_seconds() > staleThreshold:
-                    # flush flight
-                    if current_flight:
-                        # open folder
-                        kml_lines.append('<Folder>')
-                        # include start timestamp for this flight
-                        start_dt  = current_flight[0][2]  # already a datetime
-                        start_str = start_dt.strftime('%Y-%m-%d %H:%M:%S')
-                        kml_lines.append(f'<name>Flight {flight_idx} {aliasStr}{mac} ({start_str})</name>')
-                        # drone path
-                        coords = " ".join(f"{lo},{la},0" for lo, la, _ in current_flight)
-                        kml_lines.append(f'<Placemark><Style><LineStyle><color>{color}</color><width>2</width></LineStyle></Style><LineString><tessellate>1</tessellate><coordinates>{coords}</coordinates></LineString></Placemark>')
-                        # drone start icon
-                        start_lo, start_la, start_ts = current_flight[0]
-                        kml_lines.append(f'<Placemark><name>Drone Start {flight_idx} {aliasStr}{mac}</name><Style><IconStyle><color>{color}</color><scale>1.2</scale><Icon><href>http://maps.google.com/mapfiles/kml/shapes/airports.png</href></IconStyle></Style><Point><coordinates>{start_lo},{start_la},0</coordinates></Point></Placemark>')
-                        # drone end icon
-                        end_lo, end_la, end_ts = current_flight[-1]
-                        kml_lines.append(f'<Placemark><name>Drone End {flight_idx} {aliasStr}{mac}</name><Style><IconStyle><color>{color}</color><scale>1.2</scale><Icon><href>http://maps.google.com/mapfiles/kml/shapes/heliport.png</href></IconStyle></Style><Point><coordinates>{end_lo},{end_la},0</coordinates></Point></Placemark>')
-                        # pilot path
-                        start_ts = current_flight[0][2]
-                        pilot_pts = [(d['pilot_long'], d['pilot_lat']) for d in history if d.get('mac')==mac and d.get('pilot_lat') and d.get('pilot_long') and start_ts <= d['last_update'] <= end_ts]
-                        if pilot_pts:
-                            pc = " ".join(f"{plo},{pla},0" for plo, pla in pilot_pts)
-                            kml_lines.append(f'<Placemark><name>Pilot Path {flight_idx} {aliasStr}{mac}</name><Style><LineStyle><color>{color}</color><width>2</width><gx:dash/></LineStyle></Style><LineString><tessellate>1</tessellate><coordinates>{pc}</coordinates></LineString></Placemark>')
-                            plon, plat = pilot_pts[-1]
-                            kml_lines.append(f'<Placemark><name>Pilot End {flight_idx} {aliasStr}{mac}</name><Style><IconStyle><color>{color}</color><scale>1.2</scale><Icon><href>http://maps.google.com/mapfiles/kml/shapes/man.png</href></IconStyle></Style><Point><coordinates>{plon},{plat},0</coordinates></Point></Placemark>')
-                        # close folder
-                        kml_lines.append('</Folder>')
-                        flight_idx += 1
-                    current_flight = []
-                # accumulate
-                current_flight.append((lon, lat, ts))
-                last_ts = ts
-
-        # flush last flight
-        if current_flight:
-            kml_lines.append('<Folder>')
-            # include start timestamp for this flight
-            start_dt  = current_flight[0][2]  # already a datetime
-            start_str = start_dt.strftime('%Y-%m-%d %H:%M:%S')
-            kml_lines.append(f'<name>Flight {flight_idx} {aliasStr}{mac} ({start_str})</name>')
-            coords = " ".join(f"{lo},{la},0" for lo, la, _ in current_flight)
-            kml_lines.append(f'<Placemark><Style><LineStyle><color>{color}</color><width>2</width></LineStyle></Style><LineString><tessellate>1</tessellate><coordinates>{coords}</coordinates></LineString></Placemark>')
-            # drone start icon
-            start_lo, start_la, start_ts = current_flight[0]
-            kml_lines.append(f'<Placemark><name>Drone Start {flight_idx} {aliasStr}{mac}</name><Style><IconStyle><color>{color}</color><scale>1.2</scale><Icon><href>http://maps.google.com/mapfiles/kml/shapes/airports.png</href></IconStyle></Style><Point><coordinates>{start_lo},{start_la},0</coordinates></Point></Placemark>')
-            end_lo, end_la, end_ts = current_flight[-1]
-            kml_lines.append(f'<Placemark><name>Drone End {flight_idx} {aliasStr}{mac}</name><Style><IconStyle><color>{color}</color><scale>1.2</scale><Icon><href>http://maps.google.com/mapfiles/kml/shapes/heliport.png</href></IconStyle></Style><Point><coordinates>{end_lo},{end_la},0</coordinates></Point></Placemark>')
-            start_ts = current_flight[0][2]
-            pilot_pts = [(d['pilot_long'], d['pilot_lat']) for d in history if d.get('mac')==mac and d.get('pilot_lat') and d.get('pilot_long') and start_ts <= d['last_update'] <= end_ts]
-            if pilot_pts:
-                pc = " ".join(f"{plo},{pla},0" for plo, pla in pilot_pts)
-                kml_lines.append(f'<Placemark><name>Pilot Path {flight_idx} {aliasStr}{mac}</name><Style><LineStyle><color>{color}</color><width>2</width><gx:dash/></LineStyle></Style><LineString><tessellate>1</tessellate><coordinates>{pc}</coordinates></LineString></Placemark>')
-                plon, plat = pilot_pts[-1]
-                kml_lines.append(f'<Placemark><name>Pilot End {flight_idx} {aliasStr}{mac}</name><Style><IconStyle><color>{color}</color><scale>1.2</scale><Icon><href>http://maps.google.com/mapfiles/kml/shapes/man.png</href></IconStyle></Style><Point><coordinates>{plon},{plat},0</coordinates></Point></Placemark>')
-            kml_lines.append('</Folder>')
-
-    # Close document
-    kml_lines.append('</Document></kml>')
-
-    # Write cumulative KML
-    with open(CUMULATIVE_KML_FILENAME, "w") as f:
-        f.write("\n".join(kml_lines))
-    print("Updated cumulative KML:", CUMULATIVE_KML_FILENAME)
+            # Let a burst of detections collect into one rebuild; returns at once on shutdown
+            if SHUTDOWN_EVENT.wait(KML_GENERATION_INTERVAL):
+                break
+            _kml_dirty.clear()
+            try:
+                generate_cumulative_kml()
+                generate_kml()
+            except Exception as e:
+                logger.error(f"Error regenerating KML: {e}")
+
+    kml_thread = threading.Thread(target=kml_worker, daemon=True)
+    kml_thread.start()
+    logger.info("KML worker thread started")
 
 
 # Generate initial KML so the file exists from startup
@@ -5333,15 +6137,14 @@ def update_detection(detection):
         if mac:
             # Exact match if basic_id provided
             if remote_id:
-                key = (mac, remote_id)
-                if key in FAA_CACHE:
-                    detection["faa_data"] = FAA_CACHE[key]
+                faa_data = faa_cache_get(mac, remote_id)
+                if faa_data is not None:
+                    detection["faa_data"] = faa_data
             # Fallback: any cached FAA data for this mac (regardless of basic_id)
             if "faa_data" not in detection:
-                for (c_mac, _), faa_data in FAA_CACHE.items():
-                    if c_mac == mac:
-                        detection["faa_data"] = faa_data
-                        break
+                faa_data = faa_cache_lookup_by_mac(mac)
+                if faa_data is not None:
+                    detection["faa_data"] = faa_data
             # Fallback: last known FAA data in tracked_pairs
             if "faa_data" not in detection and mac in tracked_pairs and "faa_data" in tracked_pairs[mac]:
                 detection["faa_data"] = tracked_pairs[mac]["faa_data"]
@@ -5368,55 +6171,30 @@ def update_detection(detection):
             "no_gps": True
         })
 
-        detection_history.append(detection.copy())
+        append_detection_history(detection.copy())
 
         # Backend webhook logic for all detections (GPS and no-GPS) - enabled
-        should_trigger, is_new = should_trigger_webhook_earliest(detection, mac)
-        if should_trigger:
-            trigger_backend_webhook_earliest(detection, is_new)
-
-        # Write to session CSV even for no-GPS
-        with open(CSV_FILENAME, mode='a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=[
-                'timestamp', 'alias', 'mac', 'rssi', 'drone_lat', 'drone_long',
-                'drone_altitude', 'pilot_lat', 'pilot_long', 'basic_id', 'faa_data'
-            ])
-            writer.writerow({
-                'timestamp': datetime.now().isoformat(),
-                'alias': ALIASES.get(mac, ''),
-                'mac': mac,
-                'rssi': detection.get('rssi', ''),
-                'drone_lat': new_drone_lat,
-                'drone_long': new_drone_long,
-                'drone_altitude': detection.get('drone_altitude', ''),
-                'pilot_lat': detection.get('pilot_lat', ''),
-                'pilot_long': detection.get('pilot_long', ''),
-                'basic_id': detection.get('basic_id', ''),
-                'faa_data': json.dumps(detection.get('faa_data', {}))
-            })
-
-        # Append to cumulative CSV for no-GPS
-        with open(CUMULATIVE_CSV_FILENAME, mode='a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=[
-                'timestamp', 'alias', 'mac', 'rssi', 'drone_lat', 'drone_long',
-                'drone_altitude', 'pilot_lat', 'pilot_long', 'basic_id', 'faa_data'
-            ])
-            writer.writerow({
-                'timestamp': datetime.now().isoformat(),
-                'alias': ALIASES.get(mac, ''),
-                'mac': mac,
-                'rssi': detection.get('rssi', ''),
-                'drone_lat': new_drone_lat,
-                'drone_long': new_drone_long,
-                'drone_altitude': detection.get('drone_altitude', ''),
-                'pilot_lat': detection.get('pilot_lat', ''),
-                'pilot_long': detection.get('pilot_long', ''),
-                'basic_id': detection.get('basic_id', ''),
-                'faa_data': json.dumps(detection.get('faa_data', {}))
-            })
-        # Regenerate full cumulative KML
-        generate_cumulative_kml_throttled()
-        generate_kml_throttled()
+        if _WEBHOOK_ENABLED:
+            should_trigger, is_new = should_trigger_webhook_earliest(detection, mac)
+            if should_trigger:
+                trigger_backend_webhook_earliest(detection, is_new)
+
+        # Write to session and cumulative CSVs even for no-GPS
+        log_detection_row((
+            datetime.now().isoformat(),
+            ALIASES.get(mac, ''),
+            mac,
+            detection.get('rssi', ''),
+            new_drone_lat,
+            new_drone_long,
+            detection.get('drone_altitude', ''),
+            detection.get('pilot_lat', ''),
+            detection.get('pilot_long', ''),
+            detection.get('basic_id', ''),
+            faa_data_json(mac, detection.get('basic_id', ''), detection.get('faa_data', {}))
+        ))
+        # Flag the KML files for the background rebuild
+        request_kml_regeneration()
 
         # Reduce WebSocket emissions - only emit detection, not all data types
         try:
@@ -5447,15 +6225,14 @@ def update_detection(detection):
     if mac:
         # Exact match if basic_id provided
         if remote_id:
-            key = (mac, remote_id)
-            if key in FAA_CACHE:
-                detection["faa_data"] = FAA_CACHE[key]
+            faa_data = faa_cache_get(mac, remote_id)
+            if faa_data is not None:
+                detection["faa_data"] = faa_data
         # Fallback: any cached FAA data for this mac
         if "faa_data" not in detection:
-            for (c_mac, _), faa_data in FAA_CACHE.items():
-                if c_mac == mac:
-                    detection["faa_data"] = faa_data
-                    break
+            faa_data = faa_cache_lookup_by_mac(mac)
+            if faa_data is not None:
+                detection["faa_data"] = faa_data
         # Fallback: last known FAA data in tracked_pairs
         if "faa_data" not in detection and mac in tracked_pairs and "faa_data" in tracked_pairs[mac]:
             detection["faa_data"] = tracked_pairs[mac]["faa_data"]
@@ -5524,7 +6301,12 @@ def update_detection(detection):
         })
 
     # Backend webhook logic for GPS detections - enabled
-    should_trigger, is_new = should_trigger_webhook_earliest(detection, mac)
+    # The trigger state also drives the MQTT alert, so only skip it when
+    # neither the webhook nor MQTT is configured
+    if _WEBHOOK_ENABLED or mqtt_publisher.client is not None:
+        should_trigger, is_new = should_trigger_webhook_earliest(detection, mac)
+    else:
+        should_trigger = False
     if should_trigger:
         trigger_backend_webhook_earliest(detection, is_new)
 
@@ -5545,48 +6327,24 @@ def update_detection(detection):
         socketio.emit('detection', detection, )
     except Exception:
         pass
-    detection_history.append(detection.copy())
+    append_detection_history(detection.copy())
     print("Updated tracked_pairs:", tracked_pairs)
-    with open(CSV_FILENAME, mode='a', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=[
-            'timestamp', 'alias', 'mac', 'rssi', 'drone_lat', 'drone_long',
-            'drone_altitude', 'pilot_lat', 'pilot_long', 'basic_id', 'faa_data'
-        ])
-        writer.writerow({
-            'timestamp': datetime.now().isoformat(),
-            'alias': ALIASES.get(mac, ''),
-            'mac': mac,
-            'rssi': detection.get('rssi', ''),
-            'drone_lat': detection.get('drone_lat', ''),
-            'drone_long': detection.get('drone_long', ''),
-            'drone_altitude': detection.get('drone_altitude', ''),
-            'pilot_lat': detection.get('pilot_lat', ''),
-            'pilot_long': detection.get('pilot_long', ''),
-            'basic_id': detection.get('basic_id', ''),
-            'faa_data': json.dumps(detection.get('faa_data', {}))
-        })
-    # Append to cumulative CSV
-    with open(CUMULATIVE_CSV_FILENAME, mode='a', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=[
-            'timestamp', 'alias', 'mac', 'rssi', 'drone_lat', 'drone_long',
-            'drone_altitude', 'pilot_lat', 'pilot_long', 'basic_id', 'faa_data'
-        ])
-        writer.writerow({
-            'timestamp': datetime.now().isoformat(),
-            'alias': ALIASES.get(mac, ''),
-            'mac': mac,
-            'rssi': detection.get('rssi', ''),
-            'drone_lat': detection.get('drone_lat', ''),
-            'drone_long': detection.get('drone_long', ''),
-            'drone_altitude': detection.get('drone_altitude', ''),
-            'pilot_lat': detection.get('pilot_lat', ''),
-            'pilot_long': detection.get('pilot_long', ''),
-            'basic_id': detection.get('basic_id', ''),
-            'faa_data': json.dumps(detection.get('faa_data', {}))
-        })
-    # Regenerate full cumulative KML
-    generate_cumulative_kml_throttled()
-    generate_kml_throttled()
+    # Append to session and cumulative CSVs
+    log_detection_row((
+        datetime.now().isoformat(),
+        ALIASES.get(mac, ''),
+        mac,
+        detection.get('rssi', ''),
+        detection.get('drone_lat', ''),
+        detection.get('drone_long', ''),
+        detection.get('drone_altitude', ''),
+        detection.get('pilot_lat', ''),
+        detection.get('pilot_long', ''),
+        detection.get('basic_id', ''),
+        faa_data_json(mac, detection.get('basic_id', ''), detection.get('faa_data', {}))
+    ))
+    # Flag the KML files for the background rebuild
+    request_kml_regeneration()
 
     # Emit real-time updates via WebSocket (if available in this context)
     try:
@@ -5610,7 +6368,7 @@ colorOverrides = {}
 
 # Backend webhook tracking variables
 backend_seen_drones = set()
-backend_previous_active = {}
+backend_previous_active = set()  # MACs that were active at their last check
 backend_alerted_no_gps = set()
 
 # ----------------------
@@ -5627,12 +6385,12 @@ def should_trigger_webhook_earliest(detection, mac):
     current_time = time.time()
 
     # Debug logging
-    logging.debug(f"Webhook check for {mac}: detection={detection}")
-    logging.debug(f"Webhook check: current_time={current_time}, last_update={detection.get('last_update')}")
+    logging.debug("Webhook check for %s: detection=%s", mac, detection)
+    logging.debug("Webhook check: current_time=%s, last_update=%s", current_time, detection.get('last_update'))
 
     # Check if detection is within stale threshold (30 seconds)
     if not detection.get('last_update') or (current_time - detection['last_update'] > 30):
-        logging.debug(f"Webhook check for {mac}: FAILED stale check - last_update={detection.get('last_update')}")
+        logging.debug("Webhook check for %s: FAILED stale check - last_update=%s", mac, detection.get('last_update'))
         return False, False
 
     # GPS drone logic
@@ -5648,10 +6406,11 @@ def should_trigger_webhook_earliest(detection, mac):
 
     # Calculate state
     active_now = valid_drone and detection.get('last_update') and (current_time - detection['last_update'] <= 30)
-    was_active = backend_previous_active.get(mac, False)
+    was_active = mac in backend_previous_active
     is_new = mac not in backend_seen_drones
 
-    logging.debug(f"Webhook check for {mac}: valid_drone={valid_drone}, active_now={active_now}, was_active={was_active}, is_new={is_new}")
+    logging.debug("Webhook check for %s: valid_drone=%s, active_now=%s, was_active=%s, is_new=%s",
+                  mac, valid_drone, active_now, was_active, is_new)
 
     should_trigger = False
     popup_is_new = False
@@ -5670,42 +6429,120 @@ def should_trigger_webhook_earliest(detection, mac):
         backend_alerted_no_gps.add(mac)
         logging.info(f"Webhook trigger for {mac}: No-GPS drone detected")
 
-    logging.debug(f"Webhook check for {mac}: should_trigger={should_trigger}, popup_is_new={popup_is_new}")
+    logging.debug("Webhook check for %s: should_trigger=%s, popup_is_new=%s", mac, should_trigger, popup_is_new)
 
     # Update tracking state
     if should_trigger:
         backend_seen_drones.add(mac)
-    backend_previous_active[mac] = active_now
-
-    # Clean up no-GPS alerts when transmission stops
-    if not has_recent_transmission:
-        backend_alerted_no_gps.discard(mac)
+    if active_now:
+        backend_previous_active.add(mac)
+    else:
+        backend_previous_active.discard(mac)
 
+    # No-GPS alerts are re-armed by the periodic sweep in cleanup_old_detections
     return should_trigger, popup_is_new
 
+# Webhook HTTP sessions, one per receiving host so repeated POSTs reuse
+# keep-alive connections instead of paying a TCP/TLS handshake each time.
+WEBHOOK_TIMEOUT = (3, 10)  # (connect, read) seconds
+_WEBHOOK_JSON_HEADERS = {'Content-Type': 'application/json'}
+_webhook_sessions = {}
+_webhook_sessions_lock = threading.Lock()
+
+def get_webhook_session(url):
+    """Return the pooled requests.Session for the host of a webhook URL."""
+    netloc = urlparse(url).netloc
+    with _webhook_sessions_lock:
+        session = _webhook_sessions.get(netloc)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=32,
+                max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _webhook_sessions[netloc] = session
+        return session
+
+# Webhook delivery queue: detections only enqueue payloads, worker threads do
+# the HTTP POSTs so a slow receiver never stalls packet processing.
+WEBHOOK_QUEUE_SIZE = 512
+WEBHOOK_WORKERS = 4
+WEBHOOK_DROP_LOG_INTERVAL = 60  # seconds between "queue full" warnings
+_webhook_queue = queue.Queue(maxsize=WEBHOOK_QUEUE_SIZE)
+_webhook_dropped = 0
+_webhook_drop_logged = 0.0
+_webhook_drop_lock = threading.Lock()
+
+def enqueue_webhook(payload):
+    """Queue a webhook payload for delivery, dropping it if the queue is full"""
+    global _webhook_dropped, _webhook_drop_logged
+    try:
+        _webhook_queue.put_nowait(payload)
+    except queue.Full:
+        with _webhook_drop_lock:
+            _webhook_dropped += 1
+            now = time.time()
+            if now - _webhook_drop_logged < WEBHOOK_DROP_LOG_INTERVAL:
+                return
+            dropped, _webhook_dropped = _webhook_dropped, 0
+            _webhook_drop_logged = now
+        logging.warning(f"Backend webhook queue full - dropped {dropped} webhook(s) for {WEBHOOK_URL}")
+
+def start_webhook_workers():
+    """Start the background threads that deliver queued backend webhooks"""
+    def webhook_worker():
+        while not SHUTDOWN_EVENT.is_set():
+            try:
+                payload = _webhook_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            try:
+                _send_webhook_sync(payload)
+            finally:
+                _webhook_queue.task_done()
+
+    for i in range(WEBHOOK_WORKERS):
+        threading.Thread(target=webhook_worker, name=f"webhook-{i}", daemon=True).start()
+    logger.info(f"Started {WEBHOOK_WORKERS} webhook delivery threads")
+
 def trigger_backend_webhook_earliest(detection, is_new_detection):
     """
     Send webhook with same payload format as frontend popups
     """
-    logging.info(f"Backend webhook called for {detection.get('mac')} - WEBHOOK_URL: {WEBHOOK_URL}")
-
-    if not WEBHOOK_URL or not WEBHOOK_URL.startswith("http"):
-        logging.warning(f"Backend webhook skipped - invalid URL: {WEBHOOK_URL}")
+    if not _WEBHOOK_ENABLED:
         return
 
+    logging.debug("Backend webhook called for %s", detection.get('mac'))
+
     try:
         mac = detection.get('mac')
         alias = ALIASES.get(mac) if mac else None
+        # Missing and 0 coordinates both mean "no fix" and are sent as null
+        drone_lat = detection.get('drone_lat') or None
+        drone_long = detection.get('drone_long') or None
+        pilot_lat = detection.get('pilot_lat') or None
+        pilot_long = detection.get('pilot_long') or None
 
         # Determine header message (same logic as frontend)
-        if not detection.get('drone_lat') or not detection.get('drone_long') or detection.get('drone_lat') == 0 or detection.get('drone_long') == 0:
+        if not drone_lat or not drone_long:
             header = 'Drone with no GPS lock detected'
         elif alias:
             header = f'Known drone detected - {alias}'
         else:
             header = 'New drone detected' if is_new_detection else 'Previously seen non-aliased drone detected'
 
-        logging.info(f"Backend webhook for {mac}: {header}")
+        logging.debug("Backend webhook for %s: %s", mac, header)
+
+        # Add FAA data if available
+        faa_item = None
+        faa_data = detection.get('faa_data')
+        if faa_data and isinstance(faa_data, dict) and faa_data.get('data'):
+            items = faa_data['data'].get('items')
+            if isinstance(items, list) and items:
+                faa_item = items[0]
 
         # Build payload (same format as frontend)
         payload = {
@@ -5713,45 +6550,60 @@ def trigger_backend_webhook_earliest(detection, is_new_detection):
             'mac': mac,
             'basic_id': detection.get('basic_id'),
             'alias': alias,
-            'drone_lat': detection.get('drone_lat') if detection.get('drone_lat') != 0 else None,
-            'drone_long': detection.get('drone_long') if detection.get('drone_long') != 0 else None,
-            'pilot_lat': detection.get('pilot_lat') if detection.get('pilot_lat') != 0 else None,
-            'pilot_long': detection.get('pilot_long') if detection.get('pilot_long') != 0 else None,
-            'faa_data': None,  # Will be populated below
-            'drone_gmap': None,
-            'pilot_gmap': None,
+            'drone_lat': drone_lat,
+            'drone_long': drone_long,
+            'pilot_lat': pilot_lat,
+            'pilot_long': pilot_long,
+            'faa_data': faa_item,
+            'drone_gmap': f"https://www.google.com/maps?q={drone_lat},{drone_long}" if drone_lat and drone_long else None,
+            'pilot_gmap': f"https://www.google.com/maps?q={pilot_lat},{pilot_long}" if pilot_lat and pilot_long else None,
             'isNew': is_new_detection
         }
 
-        # Add FAA data if available
-        faa_data = detection.get('faa_data')
-        if faa_data and isinstance(faa_data, dict) and faa_data.get('data') and isinstance(faa_data['data'].get('items'), list) and len(faa_data['data']['items']) > 0:
-            payload['faa_data'] = faa_data['data']['items'][0]
-
-        # Add Google Maps links
-        if payload['drone_lat'] and payload['drone_long']:
-            payload['drone_gmap'] = f"https://www.google.com/maps?q={payload['drone_lat']},{payload['drone_long']}"
-        if payload['pilot_lat'] and payload['pilot_long']:
-            payload['pilot_gmap'] = f"https://www.google.com/maps?q={payload['pilot_lat']},{payload['pilot_long']}"
+        enqueue_webhook(payload)
 
-        # Send webhook
-        logging.info(f"Sending webhook to {WEBHOOK_URL} with payload: {payload}")
-        response = requests.post(WEBHOOK_URL, json=payload, timeout=10)
-        logging.info(f"Backend webhook sent for {mac}: {response.status_code}")
+    except Exception as e:
+        logging.error(f"Backend webhook error for {detection.get('mac', 'unknown')}: {e}")
 
+def _send_webhook_sync(payload):
+    """POST a prepared backend webhook payload; runs on a webhook worker thread"""
+    url = WEBHOOK_URL
+    mac = payload.get('mac') or 'unknown'
+    if not url or not url.startswith("http"):
+        return
+    try:
+        logging.debug("Sending webhook to %s with payload: %s", url, payload)
+        # Serialized up front (with orjson when available) rather than via json=
+        body = dumps_json_bytes(payload)
+        response = get_webhook_session(url).post(url, data=body, headers=_WEBHOOK_JSON_HEADERS, timeout=WEBHOOK_TIMEOUT)
+        logging.debug("Backend webhook sent for %s: %s", mac, response.status_code)
     except requests.exceptions.Timeout:
-        logging.error(f"Backend webhook timeout for {detection.get('mac', 'unknown')}: URL {WEBHOOK_URL} timed out after 10 seconds")
+        logging.error(f"Backend webhook timeout for {mac}: URL {url} timed out after {WEBHOOK_TIMEOUT[1]} seconds")
     except requests.exceptions.ConnectionError as e:
-        logging.error(f"Backend webhook connection error for {detection.get('mac', 'unknown')}: Unable to reach {WEBHOOK_URL} - {e}")
+        logging.error(f"Backend webhook connection error for {mac}: Unable to reach {url} - {e}")
     except requests.exceptions.RequestException as e:
-        logging.error(f"Backend webhook request error for {detection.get('mac', 'unknown')}: {e}")
+        logging.error(f"Backend webhook request error for {mac}: {e}")
     except Exception as e:
-        logging.error(f"Backend webhook error for {detection.get('mac', 'unknown')}: {e}")
+        logging.error(f"Backend webhook error for {mac}: {e}")
 
 
 # ----------------------
 # FAA Query Helper Functions
 # ----------------------
+@lru_cache(maxsize=None)
+def _retry_adapter(retries, backoff_factor, status_forcelist):
+    """Retry policy and connection pool shared by every session built with
+    the same settings, instead of new Retry/HTTPAdapter objects per session"""
+    retry = Retry(
+        total=retries,
+        read=retries,
+        connect=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=status_forcelist,
+        raise_on_status=False
+    )
+    return HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=16)
+
 def create_retry_session(retries=3, backoff_factor=2, status_forcelist=(502, 503, 504)):
     logging.debug("Creating retry-enabled session with custom headers for FAA query.")
     session = requests.Session()
@@ -5762,16 +6614,7 @@ def create_retry_session(retries=3, backoff_factor=2, status_forcelist=(502, 503
         "Referer": "https://uasdoc.faa.gov/listdocs",
         "client": "external"
     })
-    retry = Retry(
-        total=retries,
-        read=retries,
-        connect=retries,
-        backoff_factor=backoff_factor,
-        status_forcelist=status_forcelist,
-        raise_on_status=False
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("https://", adapter)
+    session.mount("https://", _retry_adapter(retries, backoff_factor, tuple(status_forcelist)))
     return session
 
 def refresh_cookie(session):
@@ -5783,6 +6626,30 @@ def refresh_cookie(session):
     except requests.exceptions.RequestException as e:
         logging.exception("Error refreshing FAA cookie: %s", e)
 
+# One long-lived FAA session (with its cookie) shared by all lookups; rebuilt
+# after FAA_SESSION_TTL or as soon as the API rejects it with 401/403
+FAA_SESSION_TTL = 600  # seconds
+_faa_session = None
+_faa_session_born = 0.0
+_faa_session_lock = threading.Lock()
+
+def get_faa_session():
+    """Return the shared FAA session, creating and cookie-priming it if needed"""
+    global _faa_session, _faa_session_born
+    with _faa_session_lock:
+        if _faa_session is None or time.time() - _faa_session_born >= FAA_SESSION_TTL:
+            session = create_retry_session()
+            refresh_cookie(session)
+            _faa_session, _faa_session_born = session, time.time()
+        return _faa_session
+
+def invalidate_faa_session(session):
+    """Force the next get_faa_session() to rebuild, if `session` is still current"""
+    global _faa_session
+    with _faa_session_lock:
+        if _faa_session is session:
+            _faa_session = None
+
 def query_remote_id(session, remote_id):
     endpoint = "https://uasdoc.faa.gov/api/v1/serialNumbers"
     params = {
@@ -5799,37 +6666,98 @@ def query_remote_id(session, remote_id):
         logging.debug("FAA Request URL: %s", response.url)
         if response.status_code != 200:
             logging.error("FAA HTTP error: %s - %s", response.status_code, response.reason)
+            if response.status_code in (401, 403):
+                invalidate_faa_session(session)
             return None
-        return response.json()
+        return loads_json(response.content)
     except Exception as e:
         logging.exception("Error querying FAA API: %s", e)
         return None
 
+# Single-flight FAA lookups: concurrent queries for the same remote ID share
+# one upstream request instead of each hitting the FAA API
+FAA_INFLIGHT_WAIT = 15  # seconds a duplicate query waits for the leader
+_faa_inflight = {}  # remote_id -> [done Event, result]
+_faa_inflight_lock = threading.Lock()
+
+def query_remote_id_shared(remote_id):
+    """query_remote_id on the shared FAA session, coalescing concurrent calls per remote ID"""
+    with _faa_inflight_lock:
+        entry = _faa_inflight.get(remote_id)
+        leader = entry is None
+        if leader:
+            entry = _faa_inflight[remote_id] = [threading.Event(), None]
+    if not leader:
+        entry[0].wait(timeout=FAA_INFLIGHT_WAIT)
+        return entry[1]
+    try:
+        entry[1] = query_remote_id(get_faa_session(), remote_id)
+    finally:
+        with _faa_inflight_lock:
+            _faa_inflight.pop(remote_id, None)
+        entry[0].set()
+    return entry[1]
+
+# FAA registrations rarely change, so answers are kept for an hour per remote
+# ID; a drone that reappears is resolved without any HTTP at all. Answers with
+# no registration items are not kept, so an unregistered or not yet listed
+# remote ID is asked again on the next lookup
+FAA_RESULT_TTL = 3600  # seconds
+FAA_RESULT_CACHE_SIZE = 2048
+_faa_result_cache = {}  # remote_id -> (expires_at, FAA response)
+_faa_result_cache_lock = threading.Lock()
+
+def query_remote_id_cached(remote_id):
+    """Return (FAA response or None, cache_hit) for a remote ID"""
+    now = time.time()
+    with _faa_result_cache_lock:
+        cached = _faa_result_cache.get(remote_id)
+        if cached is not None:
+            if cached[0] > now:
+                return cached[1], True
+            del _faa_result_cache[remote_id]
+    faa_result = query_remote_id_shared(remote_id)
+    if faa_result and faa_result.get("data", {}).get("items"):
+        with _faa_result_cache_lock:
+            if len(_faa_result_cache) >= FAA_RESULT_CACHE_SIZE:
+                # Insertion order: drop the entry that expires soonest
+                _faa_result_cache.pop(next(iter(_faa_result_cache)))
+            _faa_result_cache[remote_id] = (now + FAA_RESULT_TTL, faa_result)
+    return faa_result, False
+
 # ----------------------
 # Webhook popup API Endpoint
 # ----------------------
 @app.route('/api/webhook_popup', methods=['POST'])
 def webhook_popup():
-    data = request.get_json()
+    body = request.get_data(cache=False)
+    if not body:
+        return jsonify({"status": "error", "reason": "Empty request body"}), 400
+    try:
+        data = loads_json(body)
+    except ValueError:
+        return jsonify({"status": "error", "reason": "Invalid JSON body"}), 400
+    if not isinstance(data, dict):
+        return jsonify({"status": "error", "reason": "Invalid JSON body"}), 400
     webhook_url = data.get("webhook_url")
     if not webhook_url:
         return jsonify({"status": "error", "reason": "No webhook URL provided"}), 400
     try:
         clean_data = data.get("payload", {})
-        response = requests.post(webhook_url, json=clean_data, timeout=10)
+        response = get_webhook_session(webhook_url).post(webhook_url, json=clean_data, timeout=WEBHOOK_TIMEOUT)
         return jsonify({"status": "ok", "response": response.status_code}), 200
     except requests.exceptions.Timeout:
         logging.error(f"Webhook timeout for URL: {webhook_url}")
-        return jsonify({"status": "error", "message": "Webhook request timed out after 10 seconds"}), 408
+        return jsonify({"status": "error", "reason": "Webhook request timed out after 10 seconds"}), 408
     except requests.exceptions.ConnectionError as e:
         logging.error(f"Webhook connection error for URL {webhook_url}: {e}")
-        return jsonify({"status": "error", "message": f"Connection error: Unable to reach webhook URL"}), 503
+        return jsonify({"status": "error", "reason": f"Connection error: Unable to reach webhook URL"}), 503
     except requests.exceptions.RequestException as e:
         logging.error(f"Webhook request error for URL {webhook_url}: {e}")
-        return jsonify({"status": "error", "message": f"Request error: {str(e)}"}), 500
+        return jsonify({"status": "error", "reason": f"Request error: {str(e)}"}), 500
     except Exception as e:
         logging.error(f"Webhook send error: {e}")
-        return jsonify({"status": "error", "message": str(e)}), 500
+        return jsonify({"status": "error", "reason": str(e)}), 500
 
 # ----------------------
 # New FAA Query API Endpoint
@@ -5841,15 +6769,12 @@ def api_query_faa():
     remote_id = data.get("remote_id")
     if not mac or not remote_id:
         return jsonify({"status": "error", "message": "Missing mac or remote_id"}), 400
-    session = create_retry_session()
-    refresh_cookie(session)
-    faa_result = query_remote_id(session, remote_id)
+    faa_result, cache_hit = query_remote_id_cached(remote_id)
     # Fallback: if FAA API query failed or returned no records, try cached FAA data by MAC
     if not faa_result or not faa_result.get("data", {}).get("items"):
-        for (c_mac, _), cached_data in FAA_CACHE.items():
-            if c_mac == mac:
-                faa_result = cached_data
-                break
+        cached_data = faa_cache_lookup_by_mac(mac)
+        if cached_data is not None:
+            faa_result = cached_data
     if faa_result is None:
         return jsonify({"status": "error", "message": "FAA query failed"}), 500
     if mac in tracked_pairs:
@@ -5857,21 +6782,13 @@ def api_query_faa():
     else:
         tracked_pairs[mac] = {"basic_id": remote_id, "faa_data": faa_result}
     write_to_faa_cache(mac, remote_id, faa_result)
-    timestamp = datetime.now().isoformat()
+    timestamp = now_iso()
     try:
-        with open(FAA_LOG_FILENAME, "a", newline='') as csvfile:
-            fieldnames = ["timestamp", "mac", "remote_id", "faa_response"]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writerow({
-                "timestamp": timestamp,
-                "mac": mac,
-                "remote_id": remote_id,
-                "faa_response": json.dumps(faa_result)
-            })
+        log_faa_row((timestamp, mac, remote_id, dumps_json(faa_result)))
     except Exception as e:
         print("Error writing to FAA log CSV:", e)
-    generate_kml()
-    return jsonify({"status": "ok", "faa_data": faa_result})
+    request_kml_regeneration()
+    return jsonify({"status": "ok", "faa_data": faa_result}), 200, {"X-FAA-Cache": "HIT" if cache_hit else "MISS"}
 
 # ----------------------
 # FAA Data GET API Endpoint (by MAC or basic_id)
@@ -5890,12 +6807,12 @@ def api_get_faa(identifier):
         if det.get('basic_id') == identifier and 'faa_data' in det:
             return jsonify({'status': 'ok', 'faa_data': det['faa_data']})
     # Fallback: search cached FAA data by remote_id first, then by MAC
-    for (c_mac, c_rid), faa_data in     FAA_CACHE.items():
-        if c_rid == identifier:
-            return jsonify({'status': 'ok', 'faa_data': faa_data})
-    for (c_mac, c_rid), faa_data in FAA_CACHE.items():
-        if c_mac == identifier:
-            return jsonify({'status': 'ok', 'faa_data': faa_data})
+    faa_data = faa_cache_lookup_by_remote_id(identifier)
+    if faa_data is not None:
+        return jsonify({'status': 'ok', 'faa_data': faa_data})
+    faa_data = faa_cache_lookup_by_mac(identifier)
+    if faa_data is not None:
+        return jsonify({'status': 'ok', 'faa_data': faa_data})
     return jsonify({'status': 'error', 'message': 'No FAA data found for this identifier'}), 404
 
 
@@ -6085,29 +7002,20 @@ PORT_SELECTION_PAGE = '''
     <form method="POST" action="/select_ports">
       <div class="form-group">
         <label for="port1">Detection Unit 1</label>
-        <select id="port1" name="port1">
+        <select id="port1" name="port1" data-ports-target>
           <option value="">-- None Selected --</option>
-          {% for port in ports %}
-            <option value="{{ port.device }}">{{ port.device }} - {{ port.description }}</option>
-          {% endfor %}
         </select>
       </div>
       <div class="form-group">
         <label for="port2">Detection Unit 2</label>
-        <select id="port2" name="port2">
+        <select id="port2" name="port2" data-ports-target>
           <option value="">-- None Selected --</option>
-          {% for port in ports %}
-            <option value="{{ port.device }}">{{ port.device }} - {{ port.description }}</option>
-          {% endfor %}
         </select>
       </div>
       <div class="form-group">
         <label for="port3">Detection Unit 3</label>
-        <select id="port3" name="port3">
+        <select id="port3" name="port3" data-ports-target>
           <option value="">-- None Selected --</option>
-          {% for port in ports %}
-            <option value="{{ port.device }}">{{ port.device }} - {{ port.description }}</option>
-          {% endfor %}
         </select>
       </div>
 
@@ -6134,22 +7042,67 @@ PORT_SELECTION_PAGE = '''
     </form>
   </div>
   <script>
+    // Port list polling: conditional GETs against /api/ports, backing off
+    // while the list is unchanged and pausing while the page is hidden
+    const PORT_POLL_MIN_MS = 2000;
+    const PORT_POLL_MAX_MS = 30000;
+    let portsEtag = null;
+    let portPollDelay = PORT_POLL_MIN_MS;
+    let portPollTimer = null;
+    let portPollStopped = false;
+
+    // Resolves to true if the port list changed
     function refreshPortOptions() {
-      fetch('/api/ports')
-        .then(res => res.json())
-        .then(data => {
-          ['port1','port2','port3'].forEach(name => {
-            const select = document.getElementById(name);
-            if (!select) return;
-            const current = select.value;
-            select.innerHTML = '<option value="">--None--</option>' +
-              data.ports.map(p => `<option value="${p.device}">${p.device} - ${p.description}</option>`).join('');
-            select.value = current;
+      const headers = portsEtag ? {'If-None-Match': portsEtag} : {};
+      return fetch('/api/ports', {headers: headers, cache: 'no-store'})
+        .then(res => {
+          if (res.status === 304) return false;
+          portsEtag = res.headers.get('ETag');
+          return res.json().then(data => {
+            // Build the option list once and clone it into each dropdown
+            const options = document.createDocumentFragment();
+            options.appendChild(new Option('-- None Selected --', ''));
+            data.ports.forEach(p => options.appendChild(new Option(`${p.device} - ${p.description}`, p.device)));
+            document.querySelectorAll('select[data-ports-target]').forEach(select => {
+              const current = select.value;
+              select.replaceChildren(options.cloneNode(true));
+              select.value = current;
+            });
+            return true;
           });
         })
-        .catch(err => console.error('Error refreshing ports:', err));
+        .catch(err => {
+          console.error('Error refreshing ports:', err);
+          return false;
+        });
+    }
+
+    function schedulePortPoll() {
+      clearTimeout(portPollTimer);
+      if (portPollStopped || document.visibilityState !== 'visible') return;
+      portPollTimer = setTimeout(() => {
+        refreshPortOptions().then(changed => {
+          portPollDelay = changed ? PORT_POLL_MIN_MS : Math.min(portPollDelay * 2, PORT_POLL_MAX_MS);
+          schedulePortPoll();
+        });
+      }, portPollDelay);
     }
 
+    function stopPortPoll() {
+      portPollStopped = true;
+      clearTimeout(portPollTimer);
+    }
+
+    document.addEventListener('visibilitychange', function() {
+      if (document.visibilityState === 'visible' && !portPollStopped) {
+        // Coming back to the page: check right away, then poll quickly again
+        portPollDelay = PORT_POLL_MIN_MS;
+        refreshPortOptions().then(schedulePortPoll);
+      } else {
+        clearTimeout(portPollTimer);
+      }
+    });
+
     function loadSelectedPorts() {
       fetch('/api/selected_ports')
         .then(res => res.json())
@@ -6166,20 +7119,20 @@ PORT_SELECTION_PAGE = '''
         .catch(err => console.error('Error loading selected ports:', err));
     }
 
-    var refreshInterval = setInterval(refreshPortOptions, 2000);
     ['port1','port2','port3'].forEach(function(name) {
       var select = document.getElementById(name);
       if (select) {
-        ['focus', 'mousedown'].forEach(function(evt) {
-          select.addEventListener(evt, function() { clearInterval(refreshInterval); });
+        ['focus', 'mousedown', 'change'].forEach(function(evt) {
+          select.addEventListener(evt, stopPortPoll);
         });
-        select.addEventListener('change', function() { clearInterval(refreshInterval); });
       }
     });
     window.onload = function() {
-      refreshPortOptions();
-      // Load currently selected ports after refreshing port options
-      setTimeout(loadSelectedPorts, 100);
+      // The dropdowns are filled from /api/ports; apply the saved selection once they are
+      refreshPortOptions().then(() => {
+        loadSelectedPorts();
+        schedulePortPoll();
+      });
     }
     const webhookInput = document.getElementById('webhookUrl');
 
@@ -6238,15 +7191,27 @@ PORT_SELECTION_PAGE = '''
       });
     }
 
+    // One AudioContext for every test press; browsers limit how many can be open
+    let alertAudioContext = null;
+    function getAlertAudioContext() {
+      if (!alertAudioContext) {
+        alertAudioContext = new (window.AudioContext || window.webkitAudioContext)();
+      }
+      if (alertAudioContext.state === 'suspended') {
+        alertAudioContext.resume();
+      }
+      return alertAudioContext;
+    }
+
     function testAudioAlertStyle(style) {
       try {
-        const audioContext = new (window.AudioContext || window.webkitAudioContext)();
+        const audioContext = getAlertAudioContext();
 
         if (style === 'eas') {
-          // EAS Alert System - three-tone pattern
+          // EAS Alert System - three-tone pattern, scheduled on the audio clock
           playEASTone(audioContext, 0);
-          setTimeout(() => playEASTone(audioContext, 0.5), 1000);
-          setTimeout(() => playEASTone(audioContext, 1.0), 2000);
+          playEASTone(audioContext, 1.5);
+          playEASTone(audioContext, 3.0);
         } else if (style === 'siren') {
           // Siren - oscillating frequency
           playSiren(audioContext, 2.0);
@@ -6301,13 +7266,11 @@ PORT_SELECTION_PAGE = '''
 
     function playPulseAlert(audioContext, count) {
       for (let i = 0; i < count; i++) {
-        setTimeout(() => {
-          playSoftTone(audioContext, 1000, 0.15);
-        }, i * 300);
+        playSoftTone(audioContext, 1000, 0.15, i * 0.3);
       }
     }
 
-    function playSoftTone(audioContext, frequency, duration) {
+    function playSoftTone(audioContext, frequency, duration, startTime = 0) {
       const oscillator = audioContext.createOscillator();
       const gainNode = audioContext.createGain();
       oscillator.connect(gainNode);
@@ -6316,12 +7279,13 @@ PORT_SELECTION_PAGE = '''
       oscillator.frequency.value = frequency;
       oscillator.type = 'sine';
 
-      gainNode.gain.setValueAtTime(0, audioContext.currentTime);
-      gainNode.gain.linearRampToValueAtTime(0.3, audioContext.currentTime + 0.01);
-      gainNode.gain.linearRampToValueAtTime(0, audioContext.currentTime + duration);
+      const t = audioContext.currentTime + startTime;
+      gainNode.gain.setValueAtTime(0, t);
+      gainNode.gain.linearRampToValueAtTime(0.3, t + 0.01);
+      gainNode.gain.linearRampToValueAtTime(0, t + duration);
 
-      oscillator.start(audioContext.currentTime);
-      oscillator.stop(audioContext.currentTime + duration);
+      oscillator.start(t);
+      oscillator.stop(t + duration);
     }
 
     document.getElementById('updateWebhookButton').addEventListener('click', async function(e) {
@@ -11242,6 +12206,19 @@ document.addEventListener('DOMContentLoaded', function() {
   }
 });
 
+// Detection alerts share one AudioContext; creating one per alert runs into the
+// browser's limit on open contexts during busy periods
+let alertAudioContext = null;
+function getAlertAudioContext() {
+  if (!alertAudioContext) {
+    alertAudioContext = new (window.AudioContext || window.webkitAudioContext)();
+  }
+  if (alertAudioContext.state === 'suspended') {
+    alertAudioContext.resume();
+  }
+  return alertAudioContext;
+}
+
 // Audio alert function for drone detections
 function playDetectionAlert(isNew, hasGps) {
   // Check if audio alerts are enabled
@@ -11251,14 +12228,14 @@ function playDetectionAlert(isNew, hasGps) {
   const style = localStorage.getItem('audioAlertStyle') || 'soft';
 
   try {
-    const audioContext = new (window.AudioContext || window.webkitAudioContext)();
+    const audioContext = getAlertAudioContext();
 
     if (style === 'eas') {
       // EAS Alert System - three-tone pattern (more urgent for no-GPS or new)
       if (!hasGps || isNew) {
         playEASTone(audioContext, 0);
-        setTimeout(() => playEASTone(audioContext, 0.5), 1000);
-        setTimeout(() => playEASTone(audioContext, 1.0), 2000);
+        playEASTone(audioContext, 1.5);
+        playEASTone(audioContext, 3.0);
       } else {
         // Single tone for known drones
         playEASTone(audioContext, 0);
@@ -11291,9 +12268,7 @@ function playDetectionAlert(isNew, hasGps) {
 
       // For no-GPS or new drones, play a second beep
       if (!hasGps || isNew) {
-        setTimeout(() => {
-          playSoftTone(audioContext, frequency, duration);
-        }, duration * 1000 + 100);
+        playSoftTone(audioContext, frequency, duration, duration + 0.1);
       }
     }
   } catch (e) {
@@ -11349,13 +12324,11 @@ function playSiren(audioContext, duration) {
 
 function playPulseAlert(audioContext, count) {
   for (let i = 0; i < count; i++) {
-    setTimeout(() => {
-      playSoftTone(audioContext, 1000, 0.15);
-    }, i * 300);
+    playSoftTone(audioContext, 1000, 0.15, i * 0.3);
   }
 }
 
-function playSoftTone(audioContext, frequency, duration) {
+function playSoftTone(audioContext, frequency, duration, startTime = 0) {
   const oscillator = audioContext.createOscillator();
   const gainNode = audioContext.createGain();
   oscillator.connect(gainNode);
@@ -11364,12 +12337,13 @@ function playSoftTone(audioContext, frequency, duration) {
   oscillator.frequency.value = frequency;
   oscillator.type = 'sine';
 
-  gainNode.gain.setValueAtTime(0, audioContext.currentTime);
-  gainNode.gain.linearRampToValueAtTime(0.3, audioContext.currentTime + 0.01);
-  gainNode.gain.linearRampToValueAtTime(0, audioContext.currentTime + duration);
+  const t = audioContext.currentTime + startTime;
+  gainNode.gain.setValueAtTime(0, t);
+  gainNode.gain.linearRampToValueAtTime(0.3, t + 0.01);
+  gainNode.gain.linearRampToValueAtTime(0, t + duration);
 
-  oscillator.start(audioContext.currentTime);
-  oscillator.stop(audioContext.currentTime + duration);
+  oscillator.start(t);
+  oscillator.stop(t + duration);
 }
 
 // Transient terminal-style popup for drone events
@@ -12609,10 +13583,16 @@ self.addEventListener('fetch', function(event) {
 # ----------------------
 # New route: USB port selection for multiple ports.
 # ----------------------
+# Compiled once: render_template_string re-parses and compiles the whole page
+# (including its inline CSS/JS) on every request
+_PORT_SELECTION_TEMPLATE = app.jinja_env.from_string(PORT_SELECTION_PAGE)
+
 @app.route('/select_ports', methods=['GET'])
 def select_ports_get():
-    ports = list(serial.tools.list_ports.comports())
-    return render_template_string(PORT_SELECTION_PAGE, ports=ports, logo_ascii=LOGO_ASCII, bottom_ascii=BOTTOM_ASCII)
+    # The port dropdowns are filled client-side from /api/ports
+    context = {'logo_ascii': LOGO_ASCII, 'bottom_ascii': BOTTOM_ASCII}
+    app.update_template_context(context)
+    return _PORT_SELECTION_TEMPLATE.render(context)
 
 
 @app.route('/select_ports', methods=['POST'])
@@ -12766,7 +13746,7 @@ def post_detection():
 @app.route('/api/detections_history', methods=['GET'])
 def api_detections_history():
     features = []
-    for det in detection_history:
+    for det in detection_history_snapshot():
         if det.get("drone_lat", 0) == 0 and det.get("drone_long", 0) == 0:
             continue
         features.append({
@@ -12823,10 +13803,15 @@ def api_clear_alias(mac):
 # Updated status endpoint: returns a dict of statuses for each selected USB.
 @app.route('/api/ports', methods=['GET'])
 def api_ports():
-    ports = list(serial.tools.list_ports.comports())
-    return jsonify({
-        'ports': [{'device': p.device, 'description': p.description} for p in ports]
-    })
+    ports = [{'device': p.device, 'description': p.description}
+             for p in serial.tools.list_ports.comports()]
+    response = jsonify({'ports': ports})
+    # ETag over the port list so the selection page's poll gets a bodyless 304
+    # (and backs off) while nothing is plugged in or removed
+    digest = hashlib.blake2b(repr(ports).encode('utf-8'), digest_size=8).hexdigest()
+    response.set_etag(digest)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
 
 # Updated status endpoint: returns a dict of statuses for each selected USB.
 @app.route('/api/serial_status', methods=['GET'])
@@ -12842,7 +13827,7 @@ def api_selected_ports():
 def api_paths():
     drone_paths = {}
     pilot_paths = {}
-    for det in detection_history:
+    for det in detection_history_snapshot():
         mac = det.get("mac")
         if not mac:
             continue
@@ -12981,7 +13966,7 @@ def api_get_incidents():
     start_date = request.args.get('start_date', type=str)
     end_date = request.args.get('end_date', type=str)
 
-    incidents = INCIDENT_LOG.copy()
+    incidents = list(INCIDENT_LOG)
 
     # Filter by type
     if incident_type:
@@ -13015,7 +14000,7 @@ def api_incident_stats():
     }
 
     now = datetime.now()
-    for incident in INCIDENT_LOG:
+    for incident in list(INCIDENT_LOG):
         # Count by type
         inc_type = incident.get("type", "unknown")
         stats["by_type"][inc_type] = stats["by_type"].get(inc_type, 0) + 1
@@ -13205,6 +14190,7 @@ def start_serial_thread(port):
 # Download endpoints for CSV, KML, and Aliases files
 @app.route('/download/csv')
 def download_csv():
+    flush_detection_logs()
     return send_file(CSV_FILENAME, as_attachment=True)
 
 @app.route('/download/kml')
@@ -13217,12 +14203,14 @@ def download_kml():
 def download_aliases():
     # ensure latest aliases are saved to disk
     save_aliases()
+    flush_debounced_saves()
     return send_file(ALIASES_FILE, as_attachment=True)
 
 
 # --- Cumulative download endpoints ---
 @app.route('/download/cumulative_detections.csv')
 def download_cumulative_csv():
+    flush_detection_logs()
     return send_file(
         CUMULATIVE_CSV_FILENAME,
         mimetype='text/csv',
@@ -13254,6 +14242,7 @@ def startup_auto_connect():
     # Initialize database
     logger.info("Initializing database...")
     init_database()
+    load_faa_cache()
 
     logger.info("Loading previously saved ports...")
     load_selected_ports()
@@ -13357,6 +14346,24 @@ Examples:
 
     return parser.parse_args()
 
+def _download_startup_openair_zones():
+    """Download and parse OpenAir data for startup; returns the zones (may be empty)"""
+    if not download_openair_file():
+        return []
+    airspaces = parse_openair_file()
+    if not airspaces:
+        return []
+    return convert_airspaces_to_zones(airspaces, max_altitude_ft=400)
+
+def _download_startup_notam_zones():
+    """Download and parse NOTAM data for startup; returns the zones (may be empty)"""
+    if not download_notam_file():
+        return []
+    notams = parse_notam_file()
+    if not notams:
+        return []
+    return convert_notams_to_zones(notams, max_altitude_ft=400)
+
 def main():
     """Main function with enhanced startup and configuration"""
     global HEADLESS_MODE, AUTO_START_ENABLED, PORT_MONITOR_INTERVAL
@@ -13442,7 +14449,7 @@ def main():
     backend_previous_active.clear()
     backend_alerted_no_gps.clear()
     tracked_pairs.clear()
-    detection_history.clear()
+    clear_detection_history()
     logger.info("Session state cleared - fresh session initialized")
 
     logger.info(f"Starting Drone Mapper...")
@@ -13456,6 +14463,12 @@ def main():
     # Start cleanup timer to prevent memory leaks
     start_cleanup_timer()
 
+    # Start background KML regeneration
+    start_kml_worker()
+
+    # Start backend webhook delivery
+    start_webhook_workers()
+
     # Start OpenAir airspace data updater
     start_openair_updater()
 
@@ -13522,41 +14535,29 @@ def main():
     # Start MMIP (Mesh Mapper Interchange Protocol)
     start_mmip()
 
-    # Initial download if file doesn't exist
-    if not os.path.exists(OPENAIR_FILE):
-        logger.info("OpenAir file not found, downloading on startup...")
+    # Initial OpenAir/NOTAM download if the files don't exist. The two
+    # download+parse jobs are independent (and mostly network-bound), so they
+    # run side by side; ZONES is only touched here once both have finished.
+    startup_zone_jobs = {}
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="zones-startup") as pool:
+        if not os.path.exists(OPENAIR_FILE):
+            logger.info("OpenAir file not found, downloading on startup...")
+            startup_zone_jobs['openair'] = pool.submit(_download_startup_openair_zones)
+        if not os.path.exists(NOTAM_FILE):
+            logger.info("NOTAM file not found, downloading on startup...")
+            startup_zone_jobs['notam'] = pool.submit(_download_startup_notam_zones)
+
+    for source, job in startup_zone_jobs.items():
+        label = 'OpenAir' if source == 'openair' else 'NOTAM'
         try:
-            if download_openair_file():
-                # Parse and add zones
-                airspaces = parse_openair_file()
-                if airspaces:
-                    openair_zones = convert_airspaces_to_zones(airspaces, max_altitude_ft=400)
-                    if openair_zones:
-                        # Merge with existing zones
-                        ZONES = [z for z in ZONES if z.get('source') != 'openair']
-                        ZONES.extend(openair_zones)
-                        save_zones()
-                        logger.info(f"Added {len(openair_zones)} OpenAir zones on startup")
+            new_zones = job.result()
+            if new_zones:
+                # Merge with existing zones
+                replace_source_zones(source, new_zones)
+                save_zones()
+                logger.info(f"Added {len(new_zones)} {label} zones on startup")
         except Exception as e:
-            logger.warning(f"Failed to download OpenAir data on startup: {e}")
-
-    # Initial NOTAM download if file doesn't exist
-    if not os.path.exists(NOTAM_FILE):
-        logger.info("NOTAM file not found, downloading on startup...")
-        try:
-            if download_notam_file():
-                # Parse and add zones
-                notams = parse_notam_file()
-                if notams:
-                    notam_zones = convert_notams_to_zones(notams, max_altitude_ft=400)
-                    if notam_zones:
-                        # Merge with existing zones
-                        ZONES = [z for z in ZONES if z.get('source') != 'notam']
-                        ZONES.extend(notam_zones)
-                        save_zones()
-                        logger.info(f"Added {len(notam_zones)} NOTAM zones on startup")
-        except Exception as e:
-            logger.warning(f"Failed to download NOTAM data on startup: {e}")
+            logger.warning(f"Failed to download {label} data on startup: {e}")
 
     if HEADLESS_MODE:
         logger.info("Running in headless mode - press Ctrl+C to stop")
@@ -13601,7 +14602,7 @@ def api_diagnostics():
 
     # Add recent detections if any exist
     if detection_history:
-        recent_detections = detection_history[-5:]  # Last 5 detections
+        recent_detections = detection_history_snapshot()[-5:]  # Last 5 detections (deques don't slice)
         diagnostics["recent_detections"] = [
             {
                 "mac": d.get("mac", "N/A"),
@@ -13652,76 +14653,102 @@ def api_send_command():
 
     return jsonify({"command": command, "results": results})
 
+# Channels delivered via per-channel rooms. Clients join all of them on
+# connect (so pages that never subscribe keep working) and can narrow the
+# set with 'unsubscribe' / widen it again with 'subscribe'.
+SUBSCRIBABLE_CHANNELS = frozenset({
+    'detections', 'paths', 'faa_cache', 'cumulative_log', 'serial_status', 'aliases'
+})
+
 # --- SocketIO connection event ---
 @socketio.on('connect')
 def handle_connect():
     logger.debug("Client connected via WebSocket")
+    for channel in SUBSCRIBABLE_CHANNELS:
+        join_room(channel)
     # Send current state to newly connected client
     emit_detections()
     emit_aliases()
     emit_serial_status()
     emit_paths()
-    emit_cumulative_log()
+    # Full log goes to the connecting client only; everyone else gets deltas
+    try:
+        emit('cumulative_log', get_cumulative_log_for_emit())
+    except Exception as e:
+        logger.debug(f"Error emitting cumulative log: {e}")
     emit_faa_cache()
     emit_weather_data()
     emit_webcams_data()
     emit_ais_vessels()
     emit_aprs_stations()
     emit_adsb_aircraft()
-    emit_zones()
+    # Zones can run to thousands of NOTAM/airspace polygons; only the
+    # connecting client needs them, not every client already in sync
+    try:
+        emit('zones_updated', {"zones": ZONES, "count": len(ZONES)})
+    except Exception as e:
+        logger.debug(f"Error emitting zones: {e}")
+
+def _requested_channels(channels):
+    """Filter a client-supplied channel list down to known room names."""
+    if isinstance(channels, str):
+        channels = [channels]
+    if not isinstance(channels, (list, tuple)):
+        return []
+    return [c for c in channels if c in SUBSCRIBABLE_CHANNELS]
+
+@socketio.on('subscribe')
+def handle_subscribe(channels):
+    for channel in _requested_channels(channels):
+        join_room(channel)
+
+@socketio.on('unsubscribe')
+def handle_unsubscribe(channels):
+    for channel in _requested_channels(channels):
+        leave_room(channel)
 
 # Helper functions to emit all real-time data
 
 def emit_serial_status():
     try:
-        socketio.emit('serial_status', serial_connected_status, )
+        socketio.emit('serial_status', serial_connected_status, room='serial_status')
     except Exception as e:
         logger.debug(f"Error emitting serial status: {e}")
         pass  # Ignore if no clients connected or serialization error
 
 def emit_aliases():
     try:
-        socketio.emit('aliases', ALIASES, )
+        socketio.emit('aliases', ALIASES, room='aliases')
     except Exception as e:
         logger.debug(f"Error emitting aliases: {e}")
 
 def emit_detections():
     try:
-        # Convert tracked_pairs to a JSON-serializable format
-        serializable_pairs = {}
-        for key, value in tracked_pairs.items():
-            # Ensure key is a string
-            str_key = str(key)
-            # Ensure value is JSON-serializable
-            if isinstance(value, dict):
-                serializable_pairs[str_key] = value
-            else:
-                serializable_pairs[str_key] = str(value)
-        socketio.emit('detections', serializable_pairs, )
+        # tracked_pairs is only ever written as {mac_str: detection_dict} (update_detection,
+        # api_query_faa), so no per-entry coercion is needed. A shallow copy keeps the
+        # serializer safe from concurrent inserts by the serial threads.
+        socketio.emit('detections', dict(tracked_pairs), room='detections')
     except Exception as e:
         logger.debug(f"Error emitting detections: {e}")
 
 def emit_paths():
     try:
-        socketio.emit('paths', get_paths_for_emit(), )
+        socketio.emit('paths', get_paths_for_emit(), room='paths')
     except Exception as e:
         logger.debug(f"Error emitting paths: {e}")
 
 def emit_cumulative_log():
     try:
-        socketio.emit('cumulative_log', get_cumulative_log_for_emit(), )
+        seq, rows = get_cumulative_log_delta()
+        if rows:
+            socketio.emit('cumulative_log_delta', {'seq': seq, 'entries': rows}, room='cumulative_log')
     except Exception as e:
         logger.debug(f"Error emitting cumulative log: {e}")
 
 def emit_faa_cache():
     try:
-        # Convert FAA_CACHE to JSON-serializable format
-        serializable_cache = {}
-        for key, value in FAA_CACHE.items():
-            # Convert tuple keys to strings
-            str_key = str(key) if isinstance(key, tuple) else key
-            serializable_cache[str_key] = value
-        socketio.emit('faa_cache', serializable_cache, )
+        # FAA_CACHE keys are already "mac|remote_id" strings, so it serializes as-is
+        socketio.emit('faa_cache', FAA_CACHE, room='faa_cache')
     except Exception as e:
         logger.debug(f"Error emitting FAA cache: {e}")
 
@@ -13772,7 +14799,7 @@ def emit_webcams_data():
 def get_paths_for_emit():
     drone_paths = {}
     pilot_paths = {}
-    for det in detection_history:
+    for det in detection_history_snapshot():
         mac = det.get("mac")
         if not mac:
             continue
@@ -13800,6 +14827,7 @@ def get_paths_for_emit():
 
 def get_cumulative_log_for_emit():
     # Read the cumulative CSV and return as a list of dicts
+    flush_detection_logs()
     try:
         if os.path.exists(CUMULATIVE_CSV_FILENAME):
             with open(CUMULATIVE_CSV_FILENAME, 'r', newline='') as csvfile:
@@ -13811,6 +14839,67 @@ def get_cumulative_log_for_emit():
         logger.error(f"Error reading cumulative log: {e}")
         return []
 
+# ----------------------
+# Cumulative Log Delta Emits
+# ----------------------
+# The cumulative CSV only grows, so periodic broadcasts send just the rows
+# appended since the previous emit ('cumulative_log_delta'). The full log is
+# sent once per client on connect ('cumulative_log'). Each delta carries the
+# index of its first row so clients can detect gaps or drop overlap with the
+# snapshot they received on connect (snapshot length == next expected seq).
+_cumulative_log_lock = threading.Lock()
+_cumulative_log_fields = None
+_cumulative_log_offset = 0   # byte offset of the first row not yet emitted
+_cumulative_log_seq = 0      # row index of the first row not yet emitted
+
+def _init_cumulative_log_cursor():
+    """Position the delta cursor at the end of the cumulative CSV."""
+    global _cumulative_log_fields, _cumulative_log_offset, _cumulative_log_seq
+    try:
+        with open(CUMULATIVE_CSV_FILENAME, 'r', newline='') as csvfile:
+            reader = csv.reader(csvfile)
+            _cumulative_log_fields = next(reader, None)
+            _cumulative_log_seq = sum(1 for _ in reader)
+        _cumulative_log_offset = os.path.getsize(CUMULATIVE_CSV_FILENAME)
+    except FileNotFoundError:
+        _cumulative_log_fields, _cumulative_log_offset, _cumulative_log_seq = None, 0, 0
+    except Exception as e:
+        logger.error(f"Error initializing cumulative log cursor: {e}")
+
+_init_cumulative_log_cursor()
+
+def get_cumulative_log_delta():
+    """Return (first_seq, rows) for rows appended since the last call.
+
+    Only rows already flushed to disk are returned; buffered rows show up once
+    the detection log flush timer has written them out.
+    """
+    global _cumulative_log_offset, _cumulative_log_seq
+    with _cumulative_log_lock:
+        try:
+            size = os.path.getsize(CUMULATIVE_CSV_FILENAME)
+        except OSError:
+            return _cumulative_log_seq, []
+        if size < _cumulative_log_offset or _cumulative_log_fields is None:
+            # File was truncated/replaced - re-baseline rather than resend everything
+            _init_cumulative_log_cursor()
+            return _cumulative_log_seq, []
+        if size == _cumulative_log_offset:
+            return _cumulative_log_seq, []
+        with open(CUMULATIVE_CSV_FILENAME, 'rb') as f:
+            f.seek(_cumulative_log_offset)
+            chunk = f.read(size - _cumulative_log_offset)
+        # Only consume complete lines; a row being written right now waits for next time
+        end = chunk.rfind(b'\n') + 1
+        if end == 0:
+            return _cumulative_log_seq, []
+        text = chunk[:end].decode('utf-8', errors='replace')
+        rows = list(csv.DictReader(text.splitlines(), fieldnames=_cumulative_log_fields))
+        first_seq = _cumulative_log_seq
+        _cumulative_log_offset += end
+        _cumulative_log_seq += len(rows)
+        return first_seq, rows
+
 
 @app.route('/api/set_webhook_url', methods=['POST'])
 def api_set_webhook_url():
@@ -14442,7 +15531,7 @@ def get_ais_config():
                         config['aisstream_api_key'] = key[:8] + '...' + key[-4:] if len(key) > 12 else '***'
 
         # Check environment variables
-        env_key = os.environ.get('AISSTREAM_API_KEY') or os.environ.get('AIS_API_KEY')
+        env_key = _ENV_AIS
         return jsonify({
             "status": "ok",
             "config": config,
@@ -14466,8 +15555,8 @@ def set_ais_config():
 
         # Save to config file
         config = {'aisstream_api_key': api_key}
-        with open(AIS_CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=2)
+        _json_cache.pop(AIS_CONFIG_FILE, None)
+        write_json_file(AIS_CONFIG_FILE, config, indent=2)
 
         # Update global variable
         AIS_API_KEY = api_key
@@ -14561,7 +15650,7 @@ def get_aprs_config():
                         config['aprs_api_key'] = key[:8] + '...' + key[-4:] if len(key) > 12 else '***'
 
         # Check environment variables
-        env_key = os.environ.get('APRS_API_KEY')
+        env_key = _ENV_APRS
         return jsonify({
             "status": "ok",
             "config": config,
@@ -14590,17 +15679,17 @@ def set_aprs_config():
             callsigns = [str(c).strip().upper() for c in callsigns if c and str(c).strip()]
 
         # Update global variable (only if not from environment)
-        if not os.environ.get('APRS_API_KEY'):
+        if not _ENV_APRS:
             APRS_API_KEY = api_key
 
         # Save to config file
         config = {
-            "aprs_api_key": api_key if not os.environ.get('APRS_API_KEY') else "",
+            "aprs_api_key": api_key if not _ENV_APRS else "",
             "callsigns": callsigns
         }
 
-        with open(APRS_CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=2)
+        _json_cache.pop(APRS_CONFIG_FILE, None)
+        write_json_file(APRS_CONFIG_FILE, config, indent=2)
 
         save_aprs_config()
 
@@ -14777,7 +15866,7 @@ def get_weather_config():
                         config['windy_api_key'] = key[:8] + '...' + key[-4:] if len(key) > 12 else '***'
 
         # Check environment variables
-        env_key = os.environ.get('WINDY_API_KEY')
+        env_key = _ENV_WINDY
         return jsonify({
             "status": "ok",
             "config": config,
@@ -14799,7 +15888,7 @@ def set_weather_config():
         locations = data.get('locations', [])
 
         # If API key is from environment, use that; otherwise require it in request
-        env_key = os.environ.get('WINDY_API_KEY')
+        env_key = _ENV_WINDY
         if env_key:
             api_key = env_key
         elif not api_key:
@@ -14818,19 +15907,19 @@ def set_weather_config():
             locations = validated_locations
 
         # Update global variables (only if not from environment)
-        if not os.environ.get('WINDY_API_KEY'):
+        if not _ENV_WINDY:
             WEATHER_API_KEY = api_key
 
         WEATHER_LOCATIONS = locations
 
         # Save to config file
         config = {
-            "windy_api_key": api_key if not os.environ.get('WINDY_API_KEY') else "",
+            "windy_api_key": api_key if not _ENV_WINDY else "",
             "locations": locations
         }
 
-        with open(WEATHER_CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=2)
+        _json_cache.pop(WEATHER_CONFIG_FILE, None)
+        write_json_file(WEATHER_CONFIG_FILE, config, indent=2)
 
         save_weather_config()
 
@@ -14913,7 +16002,7 @@ def get_webcams_config():
                         config['windy_webcams_api_key'] = key[:8] + '...' + key[-4:] if len(key) > 12 else '***'
 
         # Check environment variables
-        env_key = os.environ.get('WINDY_WEBCAMS_API_KEY')
+        env_key = _ENV_WEBCAMS
         return jsonify({
             "status": "ok",
             "config": config,
@@ -14936,16 +16025,16 @@ def set_webcams_config():
             return jsonify({"status": "error", "message": "API key is required"}), 400
 
         # Update global variables (only if not from environment)
-        if not os.environ.get('WINDY_WEBCAMS_API_KEY'):
+        if not _ENV_WEBCAMS:
             WEBCAMS_API_KEY = api_key
 
         # Save to config file
         config = {
-            "windy_webcams_api_key": api_key if not os.environ.get('WINDY_WEBCAMS_API_KEY') else ""
+            "windy_webcams_api_key": api_key if not _ENV_WEBCAMS else ""
         }
 
-        with open(WEBCAMS_CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=2)
+        _json_cache.pop(WEBCAMS_CONFIG_FILE, None)
+        write_json_file(WEBCAMS_CONFIG_FILE, config, indent=2)
 
         save_webcams_config()
 
@@ -15971,8 +17060,8 @@ def save_webhook_url():
     """Save the current webhook URL to disk"""
     global WEBHOOK_URL
     try:
-        with open(WEBHOOK_URL_FILE, "w") as f:
-            json.dump({"webhook_url": WEBHOOK_URL}, f)
+        _json_cache.pop(WEBHOOK_URL_FILE, None)
+        write_json_file(WEBHOOK_URL_FILE, {"webhook_url": WEBHOOK_URL})
         logger.debug(f"Webhook URL saved to {WEBHOOK_URL_FILE}")
     except Exception as e:
         logger.error(f"Error saving webhook URL: {e}")
@@ -15980,21 +17069,20 @@ def save_webhook_url():
 def load_webhook_url():
     """Load the webhook URL from disk on startup"""
     global WEBHOOK_URL
-    if os.path.exists(WEBHOOK_URL_FILE):
-        try:
-            with open(WEBHOOK_URL_FILE, "r") as f:
-                data = json.load(f)
-                WEBHOOK_URL = data.get("webhook_url", None)
-                if WEBHOOK_URL:
-                    logger.info(f"Loaded saved webhook URL: {WEBHOOK_URL}")
-                else:
-                    logger.info("No webhook URL found in saved file")
-        except Exception as e:
-            logger.error(f"Error loading webhook URL: {e}")
-            WEBHOOK_URL = None
-    else:
+    try:
+        data = cached_json_load(WEBHOOK_URL_FILE)
+        WEBHOOK_URL = data.get("webhook_url", None)
+        if WEBHOOK_URL:
+            logger.info(f"Loaded saved webhook URL: {WEBHOOK_URL}")
+        else:
+            logger.info("No webhook URL found in saved file")
+    except FileNotFoundError:
         logger.info("No saved webhook URL file found")
         WEBHOOK_URL = None
+    except Exception as e:
+        logger.error(f"Error loading webhook URL: {e}")
+        WEBHOOK_URL = None
+    _refresh_webhook_enabled()
 
 def auto_connect_to_saved_ports():
     """
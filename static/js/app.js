@@ -26,6 +26,8 @@
 
         // 1. Initialize Socket connection
         MeshSocket.init();
+        // No panel here renders the cumulative log; skip its (large) broadcasts
+        MeshSocket.unsubscribe(['cumulative_log']);
 
         // 2. Initialize Map
         var map = MeshMap.init();
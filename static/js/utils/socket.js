@@ -12,6 +12,9 @@ window.MeshSocket = (function() {
     const handlers = {};
     const connectCallbacks = [];
     const disconnectCallbacks = [];
+    // Room channels this page has opted out of; re-applied on every (re)connect
+    // because the server joins each new connection to all channels.
+    const unsubscribed = new Set();
 
     function init() {
         const protocol = window.location.protocol;
@@ -31,6 +34,7 @@ window.MeshSocket = (function() {
             reconnectAttempts = 0;
             console.log('[Socket] Connected:', socket.id);
             updateConnectionUI(true);
+            if (unsubscribed.size) socket.emit('unsubscribe', Array.from(unsubscribed));
             connectCallbacks.forEach(function(cb) { cb(); });
         });
 
@@ -60,7 +64,7 @@ window.MeshSocket = (function() {
     function registerCoreEvents() {
         var events = [
             'connected', 'detection', 'detections', 'aliases',
-            'serial_status', 'paths', 'cumulative_log', 'faa_cache',
+            'serial_status', 'paths', 'cumulative_log', 'cumulative_log_delta', 'faa_cache',
             'adsb_aircraft', 'ais_vessels', 'ais_vessel_update',
             'aprs_stations', 'weather_data', 'webcams_data',
             'metoffice_warnings', 'lightning_strike', 'lightning_alert',
@@ -104,6 +108,16 @@ window.MeshSocket = (function() {
         }
     }
 
+    function subscribe(channels) {
+        channels.forEach(function(c) { unsubscribed.delete(c); });
+        emit('subscribe', channels);
+    }
+
+    function unsubscribe(channels) {
+        channels.forEach(function(c) { unsubscribed.add(c); });
+        emit('unsubscribe', channels);
+    }
+
     function isConnected() { return connected; }
 
     function updateConnectionUI(isConnected, message) {
@@ -136,6 +150,8 @@ window.MeshSocket = (function() {
         on: on,
         off: off,
         emit: emit,
+        subscribe: subscribe,
+        unsubscribe: unsubscribe,
         onConnect: onConnect,
         onDisconnect: onDisconnect,
         isConnected: isConnected